@@ -0,0 +1,101 @@
+"""
+작업당 에이전트 준비 비용 벤치마크 (오프라인)
+- before: 작업마다 load_dotenv → ChatOpenAI 생성 → create_react_agent 컴파일 (기존 run_react_agent 방식)
+- after : 프로세스 공용 AgentFactory에서 모델/컴파일된 그래프 재사용
+- 네트워크 호출은 하지 않으며, API 키가 없으면 더미 키를 씁니다.
+
+사용 예:
+    python -m benchmarks.bench_agent_setup --iterations 50 --tools 11
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Any, Dict, List
+
+from langchain_core.tools import StructuredTool
+
+from .bench_executor import percentile
+
+
+def _make_tools(count: int) -> List[Any]:
+    """MCP 변환 툴과 비슷한 모양(문자열 인자 몇 개)의 더미 툴."""
+
+    def _noop(path: str = ".", content: str = "") -> str:
+        return "ok"
+
+    return [
+        StructuredTool.from_function(_noop, name=f"tool_{i}", description=f"dummy tool {i} for setup benchmark")
+        for i in range(count)
+    ]
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+    }
+
+
+def run(iterations: int, tool_count: int) -> Dict[str, Any]:
+    from dotenv import load_dotenv
+    from langchain_openai import ChatOpenAI
+    from langgraph.prebuilt import create_react_agent
+
+    from langchain_react.agent_factory import AgentFactory
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench-offline")
+    tools = _make_tools(tool_count)
+
+    before: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        load_dotenv()
+        model = ChatOpenAI(model="gpt-4", temperature=0, api_key=os.getenv("OPENAI_API_KEY"))
+        create_react_agent(model, tools)
+        before.append(time.perf_counter() - started)
+
+    factory = AgentFactory()
+    after: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        factory.get_agent(factory.get_model(), tools)
+        after.append(time.perf_counter() - started)
+
+    return {
+        "iterations": iterations,
+        "tools": tool_count,
+        "before": _summary(before),
+        "after": _summary(after),
+        "after_first_ms": round(after[0] * 1000, 3),
+        "speedup_p50": round(percentile(before, 50) / max(percentile(after, 50), 1e-9), 1),
+        "factory": factory.stats(),
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="per-task agent setup benchmark")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--tools", type=int, default=11, help="툴 개수 (코드 인터프리터 9개 + 이미지 2개)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = run(args.iterations, args.tools)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    b, a = result["before"], result["after"]
+    print(
+        f"iterations={result['iterations']} tools={result['tools']}\n"
+        f"before (per task build)  mean={b['mean_ms']}ms p50={b['p50_ms']}ms p95={b['p95_ms']}ms\n"
+        f"after  (shared factory)  mean={a['mean_ms']}ms p50={a['p50_ms']}ms p95={a['p95_ms']}ms "
+        f"(first call {result['after_first_ms']}ms)\n"
+        f"speedup p50 x{result['speedup_p50']}  factory={result['factory']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
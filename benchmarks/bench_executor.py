@@ -0,0 +1,231 @@
+"""
+MCPActionExecutor 처리량 벤치마크 (오프라인)
+- 스크립트된 가짜 채팅 모델, 로컬 스텁 MCP stdio 서버, 메모리 이벤트 큐로 execute()를 반복 실행합니다.
+- tasks/sec, 작업 지연 p50/p95/p99, 최대 RSS(프로세스 트리), 최대 하위 프로세스 수를 보고합니다.
+- 네트워크/API 키가 필요 없습니다.
+
+사용 예:
+    python -m benchmarks.bench_executor --tasks 40 --concurrency 4
+    python -m benchmarks.bench_executor --tasks 100 --concurrency 8 --tool-calls 3 --llm-latency-ms 20 --json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from mcp import StdioServerParameters
+
+from .fakes import InMemoryEventQueue, ScriptedChatModel, make_context
+
+
+STUB_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_mcp_server.py")
+
+
+# ---------- 프로세스 트리 측정 (Linux /proc, 그 외 플랫폼은 0) ----------
+def _children_map() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return children
+    for name in entries:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                stat = f.read().decode(errors="replace")
+        except OSError:
+            continue
+        # comm에 공백/괄호가 있을 수 있으므로 마지막 ')' 뒤에서 필드를 읽음
+        fields = stat[stat.rfind(")") + 2:].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(name))
+    return children
+
+
+def _descendants(pid: int) -> List[int]:
+    tree = _children_map()
+    found: List[int] = []
+    stack = list(tree.get(pid, []))
+    while stack:
+        child = stack.pop()
+        found.append(child)
+        stack.extend(tree.get(child, []))
+    return found
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class ProcessSampler:
+    """주기적으로 하위 프로세스 수와 트리 전체 RSS를 샘플링해 최댓값을 기록합니다."""
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval = interval
+        self.peak_children = 0
+        self.peak_tree_rss = 0
+        self._task: asyncio.Task | None = None
+
+    def sample(self) -> None:
+        pid = os.getpid()
+        children = _descendants(pid)
+        self.peak_children = max(self.peak_children, len(children))
+        self.peak_tree_rss = max(self.peak_tree_rss, _rss_bytes(pid) + sum(_rss_bytes(c) for c in children))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.to_thread(self.sample)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.sample()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    # 서버 모듈은 환경 변수(작업 디렉터리 등)를 설정한 뒤에 불러옴
+    from langchain_react.server import MCPActionExecutor
+    from langchain_react.session_pool import MCPSessionPool
+
+    env = {"BENCH_TOOL_DELAY_MS": str(args.tool_latency_ms)}
+    params = StdioServerParameters(command=sys.executable, args=[STUB_SERVER], env=env)
+    pool = MCPSessionPool(params, size=args.pool_size or args.concurrency)
+    model = ScriptedChatModel(
+        tool_calls=args.tool_calls,
+        calls_per_turn=args.calls_per_turn,
+        latency_ms=args.llm_latency_ms,
+        final_json={"summary": "benchmark result"},
+    )
+    executor = MCPActionExecutor(session_pool=pool, max_concurrency=args.concurrency, model_factory=lambda: model)
+
+    sampler = ProcessSampler()
+    sampler.start()
+    warm_started = time.perf_counter()
+    await executor.start()
+    warmup_s = time.perf_counter() - warm_started
+
+    latencies: List[float] = []
+    failures = 0
+    gate = asyncio.Semaphore(args.concurrency + args.prefetch)
+
+    async def _one(index: int) -> None:
+        nonlocal failures
+        async with gate:
+            queue = InMemoryEventQueue()
+            started = time.perf_counter()
+            try:
+                await executor.execute(make_context(index, proc_count=args.proc_instances), queue)
+            except Exception:
+                failures += 1
+                return
+            latencies.append(time.perf_counter() - started)
+            if "task_completed" not in queue.event_types():
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_one(i) for i in range(args.tasks)))
+    elapsed = time.perf_counter() - started
+
+    await sampler.stop()
+    stats = executor.stats()
+    await executor.close()
+
+    return {
+        "tasks": args.tasks,
+        "concurrency": args.concurrency,
+        "tool_calls_per_task": args.tool_calls * args.calls_per_turn,
+        "failures": failures,
+        "warmup_s": round(warmup_s, 3),
+        "elapsed_s": round(elapsed, 3),
+        "tasks_per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "max": round(max(latencies, default=0.0) * 1000, 1),
+        },
+        # ru_maxrss: Linux는 KB, macOS는 바이트
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1
+        ),
+        "peak_tree_rss_mb": round(sampler.peak_tree_rss / (1024 * 1024), 1),
+        "peak_subprocesses": sampler.peak_children,
+        "mcp_pool": {k: stats["mcp_pool"][k] for k in ("hits", "misses", "spawned", "hit_ratio")},
+    }
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="MCPActionExecutor offline throughput benchmark")
+    parser.add_argument("--tasks", type=int, default=40, help="실행할 작업 수")
+    parser.add_argument("--concurrency", type=int, default=4, help="executor 동시 실행 슬롯 수")
+    parser.add_argument("--prefetch", type=int, default=1, help="슬롯 외에 미리 넣어 둘 작업 수")
+    parser.add_argument("--pool-size", type=int, default=0, help="MCP 세션 풀 크기 (0이면 concurrency)")
+    parser.add_argument("--proc-instances", type=int, default=4, help="작업을 나눠 가질 proc_inst_id 수")
+    parser.add_argument("--tool-calls", type=int, default=2, help="작업당 툴 호출 턴 수")
+    parser.add_argument("--calls-per-turn", type=int, default=1, help="한 턴에 동시에 내는 툴 호출 수")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="가짜 LLM 호출당 지연")
+    parser.add_argument("--tool-latency-ms", type=float, default=0.0, help="스텁 툴 호출당 지연")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    parser.add_argument("--verbose", action="store_true", help="executor 로그 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = _parse_args(argv)
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory(prefix="pgpt-bench-") as work_dir:
+        os.environ["PGPT_WORK_DIR"] = work_dir
+        # executor가 stdout에 찍는 결과 출력은 보고서와 섞이지 않도록 버림
+        sink = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with sink:
+            result = asyncio.run(run_benchmark(args))
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    lat = result["latency_ms"]
+    print(
+        f"tasks={result['tasks']} concurrency={result['concurrency']} failures={result['failures']}\n"
+        f"throughput   {result['tasks_per_sec']} tasks/s ({result['elapsed_s']}s, warmup {result['warmup_s']}s)\n"
+        f"latency ms   p50={lat['p50']} p95={lat['p95']} p99={lat['p99']} max={lat['max']}\n"
+        f"peak rss     self={result['peak_rss_mb']}MB tree={result['peak_tree_rss_mb']}MB\n"
+        f"subprocesses peak={result['peak_subprocesses']}\n"
+        f"mcp pool     {result['mcp_pool']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
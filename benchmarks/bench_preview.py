@@ -0,0 +1,128 @@
+"""
+툴 출력 프리뷰 렌더링 마이크로벤치마크 (오프라인)
+- QueueCallback의 tool_usage_finished 이벤트는 툴 출력을 PREVIEW_MAX자로 잘라 싣습니다.
+- before: 기존 방식(str(value) 전체 변환 후 슬라이스)
+- after : bounded_preview (문자열은 앞부분만, 컨테이너/bytes는 길이 예산이 있는 reprlib 방식)
+- 큰 출력 유형별로 이벤트 1건당 CPU 시간(us)과 tracemalloc 최대 할당량(KB)을 비교합니다.
+
+사용 예:
+    python -m benchmarks.bench_preview
+    python -m benchmarks.bench_preview --size-mb 8 --repeat 20 --json
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+import uuid
+from typing import Any, Callable, Dict, List
+
+from langchain_core.messages import ToolMessage
+
+from langchain_react.callback_lisnter import QueueCallback, bounded_preview
+
+
+def _legacy_preview(value: Any, limit: int = QueueCallback.PREVIEW_MAX) -> str:
+    s = str(value) if value is not None else ""
+    return s if len(s) <= limit else (s[:limit] + "…")
+
+
+def _cases(size_mb: float) -> Dict[str, Any]:
+    """유형별로 문자열 변환 시 대략 size_mb MB가 되는 툴 출력."""
+    chars = int(size_mb * 1024 * 1024)
+    rows = max(chars // 64, 1)
+    line = "2024-01-01,processgpt,0.123456789,OK\n"
+    return {
+        "str (file read)": (line * (chars // len(line) + 1))[:chars],
+        "ToolMessage": ToolMessage(content=line * (chars // len(line) + 1), tool_call_id="call_0", name="read_file"),
+        "list[dict] (rows)": [{"id": i, "name": f"row-{i}", "score": i * 0.5} for i in range(rows)],
+        "dict[list] (columns)": {col: list(range(rows)) for col in ("id", "value", "ts")},
+        "content blocks": [{"type": "text", "text": line * (chars // len(line) // 4 + 1)} for _ in range(4)],
+        "bytes": b"\x89PNG" * (chars // 4),
+    }
+
+
+def _measure(fn: Callable[[Any], str], value: Any, repeat: int) -> Dict[str, float]:
+    fn(value)  # 워밍업
+    started = time.process_time()
+    for _ in range(repeat):
+        fn(value)
+    cpu_us = (time.process_time() - started) / repeat * 1e6
+
+    tracemalloc.start()
+    fn(value)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"cpu_us": round(cpu_us, 1), "peak_kb": round(peak / 1024, 1)}
+
+
+class _NullQueue:
+    def enqueue_event(self, event: Dict[str, Any]) -> None:
+        pass
+
+
+def _measure_event(value: Any, repeat: int) -> Dict[str, float]:
+    """on_tool_start → on_tool_end 이벤트 한 쌍(현재 구현)의 비용."""
+    callback = QueueCallback(_NullQueue(), "bench-job")
+
+    async def _one() -> None:
+        run_id = uuid.uuid4()
+        await callback.on_tool_start({"name": "read_file"}, "{}", run_id=run_id)
+        await callback.on_tool_end(value, run_id=run_id)
+
+    async def _run() -> Dict[str, float]:
+        await _one()
+        started = time.process_time()
+        for _ in range(repeat):
+            await _one()
+        cpu_us = (time.process_time() - started) / repeat * 1e6
+        tracemalloc.start()
+        await _one()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {"cpu_us": round(cpu_us, 1), "peak_kb": round(peak / 1024, 1)}
+
+    return asyncio.run(_run())
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for name, value in _cases(args.size_mb).items():
+        before = _measure(_legacy_preview, value, args.repeat)
+        after = _measure(lambda v: bounded_preview(v, QueueCallback.PREVIEW_MAX), value, args.repeat)
+        results[name] = {
+            "before": before,
+            "after": after,
+            "event": _measure_event(value, args.repeat),
+            "speedup": round(before["cpu_us"] / after["cpu_us"], 1) if after["cpu_us"] else None,
+        }
+    return {"size_mb": args.size_mb, "repeat": args.repeat, "preview_max": QueueCallback.PREVIEW_MAX, "cases": results}
+
+
+def _parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Tool output preview rendering microbenchmark")
+    parser.add_argument("--size-mb", type=float, default=4.0, help="툴 출력 하나의 대략적인 크기(MB)")
+    parser.add_argument("--repeat", type=int, default=10, help="유형별 반복 횟수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 한 줄로 출력")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = _parse_args(argv)
+    result = run_benchmark(args)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    print(f"size={result['size_mb']}MB repeat={result['repeat']} preview_max={result['preview_max']}")
+    print(f"{'case':<22}{'before us':>12}{'before KB':>12}{'after us':>10}{'after KB':>10}{'event us':>10}{'speedup':>9}")
+    for name, r in result["cases"].items():
+        b, a, e = r["before"], r["after"], r["event"]
+        print(
+            f"{name:<22}{b['cpu_us']:>12}{b['peak_kb']:>12}{a['cpu_us']:>10}{a['peak_kb']:>10}"
+            f"{e['cpu_us']:>10}{str(r['speedup']) + 'x':>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
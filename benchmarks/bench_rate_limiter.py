@@ -0,0 +1,180 @@
+"""
+OpenAI 레이트 리미터 벤치마크 (오프라인, 로컬 가짜 OpenAI 서버)
+- 가짜 서버는 모델별로 초당 --server-rps개씩 연속 충전되는 버킷(용량 1초 분량)으로 요청을 받고,
+  넘치면 429 + Retry-After로 거절하며 x-ratelimit-limit/remaining-requests 헤더를 돌려줍니다.
+- before: 리미터 없이 openai SDK 기본 재시도(max_retries=2)로 채팅/이미지 요청을 동시에 보냄
+- after : 채팅(ChatOpenAI, 비동기)과 이미지(openai.OpenAI, 스레드)가 공용 리미터를 공유
+- 서버가 본 429 수, 실패 수, 총 소요 시간과 리미터 stats()를 비교합니다.
+
+사용 예:
+    python -m benchmarks.bench_rate_limiter --chat 60 --images 20 --server-rps 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+class _FakeOpenAI(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, rps: int, retry_after: float) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.rps = rps
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.buckets: Dict[str, List[float]] = {}  # 모델 → [잔량, 마지막 충전 시각]
+        self.counts = {"ok": 0, "429": 0}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _FakeOpenAI
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("content-length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        srv = self.server
+        now = time.monotonic()
+        with srv.lock:
+            bucket = srv.buckets.setdefault(body.get("model", ""), [float(srv.rps), now])
+            bucket[0] = min(float(srv.rps), bucket[0] + (now - bucket[1]) * srv.rps)
+            bucket[1] = now
+            allowed = bucket[0] >= 1
+            if allowed:
+                bucket[0] -= 1
+            srv.counts["ok" if allowed else "429"] += 1
+            remaining = int(bucket[0])
+        headers = {
+            "x-ratelimit-limit-requests": str(srv.rps * 60),
+            "x-ratelimit-remaining-requests": str(remaining),
+        }
+        if not allowed:
+            headers["retry-after"] = str(srv.retry_after)
+            self._send(429, {"error": {"message": "Rate limit reached", "type": "requests"}}, headers)
+            return
+        if self.path.endswith("/images/generations"):
+            payload = {"created": 0, "data": [{"b64_json": ""}]}
+        else:
+            payload = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body.get("model", "gpt-4"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }
+        self._send(200, payload, headers)
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+async def _run_round(base_url: str, chat: int, images: int, limited: bool) -> Dict[str, Any]:
+    import httpx
+    import openai
+    from langchain_openai import ChatOpenAI
+
+    from langchain_react.rate_limiter import OpenAIRateLimiter, RateLimitedAsyncTransport, RateLimitedTransport
+
+    limiter: Optional[OpenAIRateLimiter] = OpenAIRateLimiter() if limited else None
+    if limiter is not None:
+        async_http = httpx.AsyncClient(transport=RateLimitedAsyncTransport(httpx.AsyncHTTPTransport(), limiter))
+        sync_http = httpx.Client(transport=RateLimitedTransport(httpx.HTTPTransport(), limiter))
+        retries = 0
+    else:
+        async_http, sync_http, retries = httpx.AsyncClient(), httpx.Client(), 2
+
+    model = ChatOpenAI(
+        model="gpt-4", api_key="sk-bench", base_url=base_url, http_async_client=async_http, max_retries=retries
+    )
+    images_client = openai.OpenAI(api_key="sk-bench", base_url=base_url, http_client=sync_http, max_retries=retries)
+    failures = {"chat": 0, "images": 0}
+
+    async def _chat(i: int) -> None:
+        try:
+            await model.ainvoke(f"hello {i}")
+        except Exception:
+            failures["chat"] += 1
+
+    def _image(i: int) -> None:
+        try:
+            images_client.images.generate(model="gpt-image-1", prompt=f"cat {i}", n=1)
+        except Exception:
+            failures["images"] += 1
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(images, 8))) as pool:
+        image_futures = [loop.run_in_executor(pool, _image, i) for i in range(images)]
+        await asyncio.gather(*(_chat(i) for i in range(chat)), *image_futures)
+    elapsed = time.perf_counter() - started
+    await async_http.aclose()
+    sync_http.close()
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "failures": failures,
+        "limiter": limiter.stats() if limiter is not None else None,
+    }
+
+
+def run(chat: int, images: int, server_rps: int, retry_after: float) -> Dict[str, Any]:
+    # 가짜 서버 버킷 용량이 1초 분량이므로 클라이언트 버킷도 같게 맞춤
+    os.environ.setdefault("PGPT_OPENAI_BURST_S", "1")
+    os.environ.setdefault("PGPT_OPENAI_LIMITS", f"*={server_rps * 60}")
+    result: Dict[str, Any] = {"chat": chat, "images": images, "server_rps": server_rps}
+    for name, limited in (("before", False), ("after", True)):
+        server = _FakeOpenAI(server_rps, retry_after)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+            round_result = asyncio.run(_run_round(base_url, chat, images, limited))
+        finally:
+            server.shutdown()
+            server.server_close()
+        result[name] = {**round_result, "server_429": server.counts["429"], "server_ok": server.counts["ok"]}
+    return result
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="OpenAI rate limiter benchmark against a local fake server")
+    parser.add_argument("--chat", type=int, default=60, help="동시에 보낼 채팅 요청 수")
+    parser.add_argument("--images", type=int, default=20, help="스레드로 보낼 이미지 요청 수")
+    parser.add_argument("--server-rps", type=int, default=20, help="가짜 서버가 초당 받는 요청 수")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = run(args.chat, args.images, args.server_rps, args.retry_after)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+        return
+    print(f"chat={result['chat']} images={result['images']} server_rps={result['server_rps']}")
+    for name in ("before", "after"):
+        r = result[name]
+        print(
+            f"{name:6s} elapsed={r['elapsed_s']}s server_ok={r['server_ok']} server_429={r['server_429']} "
+            f"failures={r['failures']}"
+        )
+    print(f"limiter={result['after']['limiter']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+벤치마크용 가짜 구성요소
+- ScriptedChatModel: 정해진 횟수만큼 툴을 호출한 뒤 최종 JSON을 스트리밍하는 채팅 모델.
+- InMemoryEventQueue: SDK 이벤트 큐 대신 이벤트를 메모리에 모읍니다.
+- FakeRequestContext: execute()가 읽는 get_user_input/get_context_data만 제공합니다.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+class ScriptedChatModel(BaseChatModel):
+    """tool_calls번 툴 호출 턴(턴마다 calls_per_turn개 동시 호출) 뒤 final_json을 돌려주는 결정적 모델.
+
+    진행 단계는 대화 기록의 ToolMessage 수로 판단하므로 인스턴스를 여러 작업이 공유해도 됩니다.
+    """
+
+    tool_calls: int = 2
+    calls_per_turn: int = 1
+    tool_name: str = "run_python_code"
+    final_json: Dict[str, Any] = {"summary": "done"}
+    latency_ms: float = 0.0
+    chunk_size: int = 8
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _reply(self, messages: List[BaseMessage]) -> AIMessage:
+        step = sum(1 for m in messages if isinstance(m, ToolMessage)) // max(1, self.calls_per_turn)
+        if step < self.tool_calls:
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": self.tool_name,
+                        "args": {"code": f"print({step}, {i})"},
+                        "id": f"call_{uuid.uuid4().hex[:12]}",
+                    }
+                    for i in range(max(1, self.calls_per_turn))
+                ],
+            )
+        return AIMessage(content=json.dumps(self.final_json, ensure_ascii=False))
+
+    def _chunks(self, message: AIMessage) -> Iterator[AIMessageChunk]:
+        text = message.content
+        for i in range(0, len(text), self.chunk_size):
+            yield AIMessageChunk(content=text[i:i + self.chunk_size])
+        for index, call in enumerate(message.tool_calls):
+            yield AIMessageChunk(
+                content="",
+                tool_call_chunks=[{
+                    "name": call["name"],
+                    "args": json.dumps(call["args"]),
+                    "id": call["id"],
+                    "index": index,
+                }],
+            )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._generate(messages, stop=stop, **kwargs)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        for chunk in self._chunks(self._reply(messages)):
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        for chunk in self._chunks(self._reply(messages)):
+            if run_manager and chunk.content:
+                await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+class InMemoryEventQueue:
+    """enqueue_event로 들어온 이벤트를 리스트에 보관합니다."""
+
+    def __init__(self) -> None:
+        self.events: List[Any] = []
+
+    def enqueue_event(self, payload: Any) -> None:
+        self.events.append(payload)
+
+    def event_types(self) -> List[str]:
+        return [
+            str((e.get("data") or {}).get("event_type") or e.get("type"))
+            for e in self.events
+            if isinstance(e, dict)
+        ]
+
+
+class FakeRequestContext:
+    def __init__(self, context_data: Dict[str, Any], user_input: str = "") -> None:
+        self._data = context_data
+        self._user_input = user_input
+
+    def get_user_input(self) -> str:
+        return self._user_input
+
+    def get_context_data(self) -> Dict[str, Any]:
+        return self._data
+
+
+def make_context(index: int, *, proc_count: int = 4, form_id: Optional[str] = "bench_form") -> FakeRequestContext:
+    return FakeRequestContext({
+        "task_id": f"bench-{index}",
+        "proc_inst_id": f"proc-{index % max(1, proc_count)}",
+        "activity_name": "benchmark",
+        "description": "스텁 툴을 호출한 뒤 요약을 JSON으로 반환하세요.",
+        "form_id": form_id,
+        "form_types": [{"key": "summary", "type": "text", "text": "요약"}],
+        "form_html": "<form><text-field name='summary' alias='요약'></text-field></form>",
+    })
@@ -0,0 +1,100 @@
+"""
+기동 시 import 비용 리포트
+- 새 인터프리터에서 `python -X importtime`으로 대상 모듈을 불러와 모듈별 누적 시간을 집계합니다.
+- 기본 대상은 main(/health 응답 전까지 필요한 경로)과 langchain_react.server(지연 로드되는 경로)입니다.
+- 같은 명령을 반복 실행해 기동 시간 회귀를 비교할 수 있습니다.
+
+사용 예:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module main --top 30 --repeat 3 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _measure(module: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """(전체 wall 초, {모듈: (self_us, cumulative_us)})"""
+    env = {**os.environ, "PYTHONPATH": ROOT + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} 실패:\n{proc.stderr[-2000:]}")
+
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return wall, modules
+
+
+def report(module: str, *, top: int, repeat: int) -> Dict[str, Any]:
+    walls: List[float] = []
+    runs: List[Dict[str, Tuple[int, int]]] = []
+    for _ in range(max(1, repeat)):
+        wall, modules = _measure(module)
+        walls.append(wall)
+        runs.append(modules)
+
+    # 실행마다 측정값이 흔들리므로 모듈별 중앙값 사용
+    names = set().union(*runs)
+    cumulative = {n: statistics.median(r.get(n, (0, 0))[1] for r in runs) for n in names}
+    self_time = {n: statistics.median(r.get(n, (0, 0))[0] for r in runs) for n in names}
+    heaviest = sorted(names, key=lambda n: cumulative[n], reverse=True)[:top]
+    return {
+        "module": module,
+        "repeat": len(walls),
+        "wall_ms": round(statistics.median(walls) * 1000, 1),
+        "import_ms": round(cumulative.get(module, 0) / 1000, 1),
+        "modules_loaded": len(names),
+        "top": [
+            {"module": n, "cumulative_ms": round(cumulative[n] / 1000, 1), "self_ms": round(self_time[n] / 1000, 1)}
+            for n in heaviest
+        ],
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="per-module import time report")
+    parser.add_argument("--module", action="append", help="측정할 모듈 (여러 번 지정 가능)")
+    parser.add_argument("--top", type=int, default=15, help="누적 시간 상위 N개 모듈 표시")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    results = [report(m, top=args.top, repeat=args.repeat) for m in (args.module or ["main", "langchain_react.server"])]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False))
+        return
+    for res in results:
+        print(
+            f"== import {res['module']}: {res['import_ms']}ms "
+            f"(process wall {res['wall_ms']}ms, {res['modules_loaded']} modules, median of {res['repeat']})"
+        )
+        for row in res["top"]:
+            print(f"  {row['cumulative_ms']:>9.1f}ms  self {row['self_ms']:>7.1f}ms  {row['module']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+벤치마크용 스텁 MCP 서버 (stdio)
+- mcp-python-code-interpreter와 같은 이름의 툴 일부를 흉내 내며, 네트워크/실제 코드 실행이 없습니다.
+- BENCH_TOOL_DELAY_MS로 툴 호출마다 인위적인 지연을 줄 수 있습니다.
+"""
+
+import asyncio
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+
+TOOL_DELAY = float(os.getenv("BENCH_TOOL_DELAY_MS", "0")) / 1000
+
+mcp = FastMCP("bench-stub", log_level="WARNING")
+
+
+async def _delay() -> None:
+    if TOOL_DELAY > 0:
+        await asyncio.sleep(TOOL_DELAY)
+
+
+@mcp.tool()
+async def list_directory(path: str = ".") -> str:
+    """디렉터리 내용을 나열합니다."""
+    await _delay()
+    return "report.md\ndata.csv"
+
+
+@mcp.tool()
+async def read_file(path: str) -> str:
+    """파일 내용을 읽습니다."""
+    await _delay()
+    return f"contents of {path}"
+
+
+@mcp.tool()
+async def write_file(path: str, content: str) -> str:
+    """파일을 씁니다."""
+    await _delay()
+    return f"wrote {len(content)} chars to {path}"
+
+
+@mcp.tool()
+async def run_python_code(code: str) -> str:
+    """Python 코드를 실행합니다."""
+    await _delay()
+    return f"ok ({len(code)} chars)"
+
+
+if __name__ == "__main__":
+    mcp.run()
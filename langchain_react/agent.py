@@ -1,12 +1,277 @@
-import os
+import asyncio
 import uuid
-from typing import List
+from contextlib import aclosing
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langgraph.prebuilt import create_react_agent
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.callbacks.manager import AsyncCallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langgraph.errors import GraphRecursionError
 
+from .agent_factory import get_agent_factory
+from .context_compactor import ContextStats, compact_messages
 from .callback_lisnter import QueueCallback
+from .checkpoints import get_checkpoint_store
+from .json_stream import JsonObjectExtractor, extract_json
+from .llm_cache import track_pending, write_pending
+from .form_schema import validate_payload
+from .metrics import MetricsCallback
+from .progress import STREAM_PROGRESS, ProgressStreamer
+from .prompt_builder import count_tokens
+from .task_budget import FINALIZE_TIMEOUT, LimitExceeded, TaskBudget
+
+
+def _chunk_text(content: Any) -> str:
+    """AIMessageChunk.content(문자열 또는 블록 리스트)에서 텍스트만 꺼냅니다."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(
+            b if isinstance(b, str) else str(b.get("text", ""))
+            for b in content
+            if isinstance(b, str) or (isinstance(b, dict) and b.get("type") == "text")
+        )
+    return ""
+
+
+async def _stream_agent(
+    agent,
+    agent_input: dict,
+    invoke_kwargs: dict,
+    *,
+    stop_on_json: bool = True,
+    progress: Optional[ProgressStreamer] = None,
+    budget: Optional[TaskBudget] = None,
+    context_stats: Optional[ContextStats] = None,
+    restored: Optional[dict] = None,
+) -> dict:
+    """에이전트를 스트리밍으로 실행합니다.
+
+    progress가 있으면 LLM 텍스트 토큰을 진행 이벤트로 흘려보내고,
+    stop_on_json이면 최종 답변의 첫 JSON 객체를 스트림에서 추출하고, 그 턴이 툴 호출 없이 끝나면
+    그래프 마무리를 기다리지 않고 멈춥니다(응답 캐시 저장과 LLM 호출 종료 기록은 직접 처리).
+    budget의 단계/시간/토큰 한도를 넘으면 그때까지의 state에 response["limit"]을 붙여 돌려줍니다.
+    restored는 체크포인트에서 복원한 state로, 그 메시지는 토큰 예산에 다시 청구하지 않습니다.
+    """
+    state: dict = dict(restored) if restored else {"messages": []}
+    try:
+        return await asyncio.wait_for(
+            _consume_stream(
+                agent, agent_input, invoke_kwargs, state,
+                stop_on_json=stop_on_json, progress=progress, budget=budget, context_stats=context_stats,
+            ),
+            budget.remaining() if budget else None,
+        )
+    except asyncio.TimeoutError:
+        if budget is None or budget.remaining() is None or budget.remaining() > 0:
+            raise
+        budget.reason = "deadline"
+    except GraphRecursionError:
+        if budget is None:
+            raise
+        budget.reason = "max_steps"
+    except LimitExceeded:
+        pass
+    if progress is not None:
+        progress.end_turn(reasoning=True)
+    return {**state, "limit": budget.report()}
+
+
+async def _consume_stream(
+    agent,
+    agent_input: dict,
+    invoke_kwargs: dict,
+    state: dict,
+    *,
+    stop_on_json: bool,
+    progress: Optional[ProgressStreamer],
+    budget: Optional[TaskBudget],
+    context_stats: Optional[ContextStats],
+) -> dict:
+    """_stream_agent 본문. state는 한도 초과 시 호출 측이 쓸 수 있도록 제자리에서 갱신합니다."""
+    extractor = JsonObjectExtractor()
+    message_id = None
+    texts: List[str] = []
+    has_tool_calls = False
+    # 이번 턴에서 닫힌 JSON. OpenAI는 텍스트 뒤에 툴 호출 델타를 보내므로 툴 호출이 없다고 확인될 때까지 보류
+    candidate: Optional[Any] = None
+    stopped_early = False
+    charged = len(state.get("messages") or [])
+    open_runs = _OpenLLMRuns()
+    config = invoke_kwargs.get("config") or {}
+    callbacks = list(config.get("callbacks") or [])
+    stream_kwargs = {**invoke_kwargs, "config": {**config, "callbacks": [*callbacks, open_runs]}}
+    with track_pending() as pending:
+        stream = agent.astream(agent_input, stream_mode=["messages", "values"], **stream_kwargs)
+        async with aclosing(stream):
+            async for mode, chunk in stream:
+                if mode == "values":
+                    state.clear()
+                    state.update(chunk)
+                    if budget is not None:
+                        messages = chunk.get("messages") or []
+                        for msg in messages[charged:]:
+                            if isinstance(msg, AIMessage):
+                                budget.charge(msg, context_stats.last_tokens if context_stats else 0)
+                        charged = len(messages)
+                    continue
+                msg, metadata = chunk
+                # 캐시 적중 응답은 청크 없이 완성된 AIMessage 하나로 옴
+                if not isinstance(msg, AIMessage) or metadata.get("langgraph_node") != "agent":
+                    continue
+                if msg.id != message_id:
+                    # 새 LLM 턴: 이전 턴 마감(툴 호출이 있었으면 중간 추론) 후 추출 상태 초기화
+                    if progress is not None:
+                        progress.end_turn(reasoning=has_tool_calls)
+                    if budget is not None:
+                        budget.start_turn()
+                    message_id = msg.id
+                    extractor.reset()
+                    texts = []
+                    has_tool_calls = False
+                    candidate = None
+                if getattr(msg, "tool_call_chunks", None) or msg.tool_calls:
+                    has_tool_calls = True
+                    candidate = None
+                text = _chunk_text(msg.content)
+                if progress is not None:
+                    progress.feed(text, message_id)
+                if has_tool_calls or not stop_on_json:
+                    continue
+                texts.append(text)
+                if candidate is None and extractor.feed(text) is not None:
+                    candidate = extractor.result
+                if candidate is not None and _turn_finished(msg):
+                    # 툴 호출 없이 끝난 턴의 JSON → 남은 스트림(그래프 마무리)은 읽지 않고 종료
+                    stopped_early = True
+                    break
+        if stopped_early:
+            # 스트림을 닫아 모델 노드가 취소됐으므로 langchain이 하지 못한 캐시 저장/호출 종료 기록을 직접 함
+            final = AIMessage(
+                content="".join(texts),
+                id=message_id,
+                usage_metadata=_estimated_usage(context_stats, texts),
+            )
+            await write_pending(pending, final)
+            await open_runs.finish(callbacks, final)
+            if progress is not None:
+                progress.end_turn(reasoning=False)
+            return {**state, "messages": [*state.get("messages", []), final], "final_json": candidate}
+    if progress is not None:
+        progress.end_turn(reasoning=has_tool_calls)
+    if candidate is not None and not has_tool_calls:
+        return {**state, "final_json": candidate}
+    return state
+
+
+def _turn_finished(msg: AIMessage) -> bool:
+    """LLM 턴의 마지막 청크인지(finish_reason 수신, 마지막 청크 표시, 또는 캐시에서 온 완성 메시지)."""
+    if not isinstance(msg, AIMessageChunk):
+        return True
+    return bool((msg.response_metadata or {}).get("finish_reason")) or getattr(msg, "chunk_position", None) == "last"
+
+
+def _estimated_usage(context_stats: Optional[ContextStats], texts: List[str]) -> dict:
+    """일찍 닫은 호출은 응답 usage 청크를 받지 못하므로 로컬 토큰 수로 추정합니다."""
+    input_tokens = context_stats.last_tokens if context_stats else 0
+    output_tokens = count_tokens("".join(texts))
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+class _OpenLLMRuns(AsyncCallbackHandler):
+    """시작됐지만 on_llm_end/on_llm_error를 받지 못한 채팅 모델 호출의 run_id를 추적합니다."""
+
+    def __init__(self) -> None:
+        self.runs: Dict[UUID, None] = {}
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        self.runs[run_id] = None
+
+    async def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        self.runs.pop(run_id, None)
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        self.runs.pop(run_id, None)
+
+    async def finish(self, callbacks: List[Any], message: AIMessage) -> None:
+        """남은 호출을 message로 끝난 것으로 기록해 다른 콜백(사용량/지연 집계)에 on_llm_end를 전달합니다."""
+        result = LLMResult(generations=[[ChatGeneration(message=message)]])
+        for run_id in list(self.runs):
+            self.runs.pop(run_id, None)
+            await AsyncCallbackManagerForLLMRun(run_id=run_id, handlers=callbacks, inheritable_handlers=[]).on_llm_end(result)
+
+
+def _closed_history(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """응답(ToolMessage)이 모두 오지 않은 툴 호출 턴을 빼서 모델에 다시 보낼 수 있는 대화로 만듭니다."""
+    answered = {m.tool_call_id for m in messages if isinstance(m, ToolMessage)}
+    dropped: set = set()
+    history: List[BaseMessage] = []
+    for msg in messages:
+        if isinstance(msg, AIMessage) and msg.tool_calls and any(c.get("id") not in answered for c in msg.tool_calls):
+            dropped.update(c.get("id") for c in msg.tool_calls)
+            continue
+        if isinstance(msg, ToolMessage) and msg.tool_call_id in dropped:
+            continue
+        history.append(msg)
+    return history
+
+
+async def _finalize_on_limit(model: BaseChatModel, response: dict, schema: dict | None, invoke_kwargs: dict) -> dict:
+    """한도에 걸려 멈춘 실행에서 지금까지의 대화만으로 최종 JSON을 한 번 받아냅니다(툴 없이)."""
+    limit = response.get("limit") or {}
+    history, _ = compact_messages(_closed_history(response.get("messages") or []))
+    instruction = HumanMessage(content=(
+        f"작업 한도({limit.get('reason')})에 도달해 더 이상 툴을 사용할 수 없습니다. "
+        + "지금까지 얻은 결과만으로 form_type의 폼 키에 맞는 최종 JSON만 반환하세요. 알 수 없는 값은 빈 값으로 두세요."
+    ))
+    final: Any = None
+    try:
+        if schema is not None:
+            structured = model.with_structured_output(schema, method="function_calling")
+            final = await asyncio.wait_for(structured.ainvoke([*history, instruction], **invoke_kwargs), FINALIZE_TIMEOUT)
+        else:
+            reply = await asyncio.wait_for(model.ainvoke([*history, instruction], **invoke_kwargs), FINALIZE_TIMEOUT)
+            final = extract_json(_chunk_text(reply.content))
+    except Exception:
+        final = None
+    if final is None:
+        # 마지막 수단: 마지막 AI 메시지 텍스트에서 추출
+        last = next((m for m in reversed(history) if isinstance(m, AIMessage) and not m.tool_calls), None)
+        final = extract_json(_chunk_text(last.content)) if last is not None else {}
+    response = {**response, "final_json": final}
+    if schema is not None:
+        errors = validate_payload(final, schema)
+        response.update({"schema_status": "failed" if errors else "valid", "schema_errors": errors})
+    return response
+
+
+async def _conform_to_schema(model: BaseChatModel, response: dict, schema: dict, invoke_kwargs: dict) -> dict:
+    """최종 JSON을 스키마로 검증하고, 실패하면 구조화 출력(function calling)으로 한 번 보정합니다."""
+    candidate = response.get("final_json")
+    if candidate is None:
+        messages = response.get("messages") or []
+        candidate = extract_json(_chunk_text(getattr(messages[-1], "content", "")) if messages else "")
+    errors = validate_payload(candidate, schema)
+    if not errors:
+        return {**response, "final_json": candidate, "schema_status": "valid"}
+
+    instruction = (
+        "직전 최종 결과가 출력 스키마를 만족하지 않습니다("
+        + "; ".join(errors[:5])
+        + "). 지금까지의 작업 결과를 바탕으로 스키마에 맞는 최종 값을 반환하세요."
+    )
+    fixed: Any = None
+    try:
+        structured = model.with_structured_output(schema, method="function_calling")
+        fixed = await structured.ainvoke([*response.get("messages", []), HumanMessage(content=instruction)], **invoke_kwargs)
+    except Exception:
+        fixed = None
+    if fixed is not None and not validate_payload(fixed, schema):
+        return {**response, "final_json": fixed, "schema_status": "repaired", "schema_errors": errors}
+    return {**response, "final_json": candidate, "schema_status": "failed", "schema_errors": errors}
 
 
 async def run_react_agent(
@@ -18,28 +283,100 @@ async def run_react_agent(
     job_id: str | None = None,
     todo_id: str | None = None,
     proc_inst_id: str | None = None,
+    stop_on_json: bool = False,
+    response_schema: dict | None = None,
+    activity_name: str | None = None,
+    model: BaseChatModel | None = None,
+    stream_progress: bool = STREAM_PROGRESS,
+    budget: TaskBudget | None = None,
 ):
-    """ReAct 에이전트를 실행하고 필요 시 콜백을 연결합니다."""
+    """ReAct 에이전트를 실행하고 필요 시 콜백을 연결합니다.
 
-    load_dotenv()
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set. Please set it using: export OPENAI_API_KEY='your-api-key'")
+    stop_on_json=True면 최종 답변 토큰을 스트리밍으로 받아 첫 JSON 객체가 닫히고 그 턴이 툴 호출 없이
+    끝나는 즉시 실행을 멈추고(남은 usage 청크/그래프 마무리는 기다리지 않음), 파싱된 객체를
+    response["final_json"]에 담아 돌려줍니다.
+    response_schema가 주어지면 최종 JSON을 로컬 검증하고, 실패 시 마지막 단계만
+    구조화 출력으로 다시 받아 response["schema_status"]에 valid/repaired/failed를 기록합니다.
+    model을 넘기면 기본 ChatOpenAI 대신 사용합니다(벤치마크/오프라인 실행용).
+    stream_progress=True이고 event_queue가 있으면 생성 중인 텍스트를 agent_progress 이벤트로 보내고,
+    발행 통계를 response["progress"]에 담습니다. 툴 단계별 벽시계 시간은 response["tool_steps"]에,
+    event_queue가 있으면 툴별 지연 분포를 response["tool_latency"]에,
+    모델 호출 전 컨텍스트 압축 결과(절약 토큰 수)는 response["context"]에 담습니다.
+    budget(기본: 환경 변수 한도)의 단계/마감/토큰 한도에 걸리면 실행을 멈추고 지금까지의 대화로
+    최종 JSON을 만들어 돌려주며, 사용량과 사유를 response["limit"]에 담습니다.
+    체크포인트(PGPT_CHECKPOINT_DB)가 켜져 있고 todo_id가 있으면 thread_id=todo_id로 단계마다 저장하고,
+    같은 todo의 중단된 실행이 있으면 이어서 실행합니다. 재개/쓰기 통계는 response["checkpoint"]에 담습니다.
+    """
 
-    model = ChatOpenAI(
-        model="gpt-4",
-        temperature=0,
-        api_key=openai_api_key,
-    )
-
-    agent = create_react_agent(model, tools)
+    # 모델 클라이언트(HTTP 연결 풀 포함)와 컴파일된 그래프는 프로세스 단위로 재사용
+    factory = get_agent_factory()
+    model = model or factory.get_model()
+    store = get_checkpoint_store() if todo_id is not None else None
+    checkpointer = await store.saver() if store is not None else None
+    agent = factory.get_agent(model, tools, checkpointer=checkpointer)
 
-    invoke_kwargs = {}
+    job_id = job_id or str(uuid.uuid4())
+    metrics = MetricsCallback(activity_name)
+    callbacks = [metrics]
+    progress: Optional[ProgressStreamer] = None
+    queue_callback: Optional[QueueCallback] = None
     if event_queue is not None:
-        handler = QueueCallback(event_queue, job_id or str(uuid.uuid4()), todo_id, proc_inst_id)
-        invoke_kwargs["config"] = {"callbacks": [handler]}
+        queue_callback = QueueCallback(event_queue, job_id, todo_id, proc_inst_id)
+        callbacks.append(queue_callback)
+        if stream_progress:
+            progress = ProgressStreamer(event_queue, job_id, todo_id, proc_inst_id)
+    context_stats = ContextStats()
+    budget = budget or TaskBudget()
+    invoke_kwargs = {"config": {"callbacks": callbacks, "configurable": {"context_stats": context_stats}}}
+    if checkpointer is not None:
+        invoke_kwargs["config"]["configurable"]["thread_id"] = str(todo_id)
+    # 결과 보정/마무리 호출에는 그래프 전용 recursion_limit을 넘기지 않음
+    agent_kwargs = {"config": {**invoke_kwargs["config"]}}
+    if budget.recursion_limit():
+        agent_kwargs["config"]["recursion_limit"] = budget.recursion_limit()
 
-    response = await agent.ainvoke({"messages": [("user", query)]}, **invoke_kwargs)
-    return response
+    agent_input: Optional[dict] = {"messages": [("user", query)]}
+    restored = await store.begin(agent, agent_kwargs["config"], query) if store is not None else None
+    if restored is not None and restored.get("resume"):
+        agent_input = None  # 마지막으로 저장된 단계부터 이어서 실행
 
+    def _run_report() -> dict:
+        report: dict = {"tool_steps": metrics.step_stats(), "context": context_stats.stats()}
+        if queue_callback is not None:
+            report["tool_latency"] = queue_callback.tool_latency()
+        if store is not None:
+            restored_report = {k: v for k, v in (restored or {}).items() if k != "values"}
+            report["checkpoint"] = {**restored_report, **store.finish(str(todo_id))}
+        return report
 
+    if restored is not None and restored.get("finished"):
+        # 그래프는 끝까지 돌았지만 완료 처리 전에 멈춘 경우: 저장된 결과를 그대로 사용(JSON은 호출 측이 추출)
+        response = dict(restored["values"])
+    elif not (stop_on_json or response_schema or progress or budget.limited):
+        response = await agent.ainvoke(agent_input, **invoke_kwargs)
+        response = {**response, **_run_report()}
+        if queue_callback is not None:
+            response["llm_usage"] = queue_callback.llm_usage()
+        return response
+    else:
+        response = await _stream_agent(
+            agent,
+            agent_input,
+            agent_kwargs,
+            stop_on_json=bool(stop_on_json or response_schema),
+            progress=progress,
+            budget=budget,
+            context_stats=context_stats,
+            restored=restored["values"] if restored else None,
+        )
+    response = {**response, **_run_report()}
+    if progress is not None:
+        response = {**response, "progress": progress.stats()}
+    if response.get("limit"):
+        response = await _finalize_on_limit(model, response, response_schema, invoke_kwargs)
+    elif response_schema is not None:
+        response = await _conform_to_schema(model, response, response_schema, invoke_kwargs)
+    if queue_callback is not None:
+        # 마무리/스키마 보정 호출까지 포함한 작업 전체 LLM 사용량
+        response["llm_usage"] = queue_callback.llm_usage()
+    return response
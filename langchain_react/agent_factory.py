@@ -0,0 +1,164 @@
+"""
+프로세스 공용 에이전트 팩토리
+- ChatOpenAI 클라이언트를 모델 설정(모델명/temperature/base_url)별로 한 번만 만들고,
+  keep-alive 연결 풀을 가진 httpx.AsyncClient 하나를 모든 동시 작업이 공유합니다.
+  이 클라이언트는 모델별 RPM/TPM 레이트 리미터(rate_limiter)를 거칩니다.
+- create_react_agent로 컴파일한 그래프를 (모델, 툴 세트 지문)별로 캐시합니다.
+  MCP 툴은 세션 프록시에 묶여 있으므로 같은 그래프를 여러 작업/세션이 재사용해도 됩니다.
+- PGPT_CONTEXT_COMPACTION이 켜져 있으면 모델 호출 전 컨텍스트 압축(pre_model_hook)을 붙입니다.
+- 체크포인터를 넘기면(PGPT_CHECKPOINT_DB) 그 체크포인터로 컴파일한 그래프를 따로 캐시합니다.
+- PGPT_LLM_CACHE가 설정돼 있으면 모델에 SQLite 응답 캐시를 연결합니다.
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langgraph.prebuilt import create_react_agent
+
+from .context_compactor import CONTEXT_COMPACTION, compact_context
+from .llm_cache import response_cache_from_env
+from .rate_limiter import rate_limited_async_client
+
+
+GRAPH_CACHE_SIZE = int(os.getenv("PGPT_AGENT_GRAPH_CACHE", "32"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("PGPT_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("PGPT_HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("PGPT_HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_TIMEOUT = float(os.getenv("PGPT_HTTP_TIMEOUT", "600"))
+
+
+def model_settings() -> Tuple[str, float, Optional[str]]:
+    """환경 변수 기준 모델 설정 (모델명, temperature, base_url)."""
+    return (
+        os.getenv("PGPT_LLM_MODEL", "gpt-4"),
+        float(os.getenv("PGPT_LLM_TEMPERATURE", "0")),
+        os.getenv("OPENAI_BASE_URL") or None,
+    )
+
+
+def tool_fingerprint(tools: List[Any]) -> str:
+    """툴 이름/설명/인자 스키마로 툴 세트 지문을 만듭니다(순서 포함)."""
+    digest = hashlib.sha1()
+    for t in tools:
+        try:
+            args = json.dumps(getattr(t, "args", None), sort_keys=True, ensure_ascii=False, default=str)
+        except Exception:
+            args = ""
+        digest.update(f"{getattr(t, 'name', t)}\x1f{getattr(t, 'description', '')}\x1f{args}\x1e".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class AgentFactory:
+    """모델 클라이언트와 컴파일된 ReAct 그래프를 프로세스 단위로 캐시합니다."""
+
+    def __init__(self, graph_cache_size: int = GRAPH_CACHE_SIZE) -> None:
+        self.graph_cache_size = max(1, graph_cache_size)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._models: Dict[Tuple, BaseChatModel] = {}
+        # (모델 키, 툴 지문, 체크포인터 키) → (모델, 체크포인터, 그래프). 객체를 함께 보관해 id 재사용을 막음
+        self._graphs: "OrderedDict[Tuple, Tuple[BaseChatModel, Any, Any]]" = OrderedDict()
+        self._stats: Dict[str, float] = {
+            "model_builds": 0,
+            "graph_builds": 0,
+            "graph_hits": 0,
+            "graph_evictions": 0,
+            "build_ms_total": 0.0,
+        }
+
+    # ---------- HTTP ----------
+    def http_client(self) -> httpx.AsyncClient:
+        """모든 LLM 호출이 공유하는 keep-alive 비동기 HTTP 클라이언트 (공용 레이트 리미터 경유)."""
+        if self._http is None or self._http.is_closed:
+            self._http = rate_limited_async_client(
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+                timeout=HTTP_TIMEOUT,
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+        self._models.clear()
+        self._graphs.clear()
+
+    # ---------- model ----------
+    def get_model(self) -> BaseChatModel:
+        settings = model_settings()
+        model = self._models.get(settings)
+        if model is not None:
+            return model
+
+        from langchain_openai import ChatOpenAI
+
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+        if not openai_api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is not set. Please set it using: export OPENAI_API_KEY='your-api-key'")
+        name, temperature, base_url = settings
+        model = ChatOpenAI(
+            model=name,
+            temperature=temperature,
+            api_key=openai_api_key,
+            base_url=base_url,
+            http_async_client=self.http_client(),
+            max_retries=0,  # 429 재시도는 레이트 리미터 트랜스포트가 담당
+            stream_usage=True,  # 스트리밍 응답에도 usage_metadata(토큰 수)를 받음
+            cache=response_cache_from_env(),  # PGPT_LLM_CACHE 미설정 시 None(전역 캐시 설정을 따름)
+        )
+        self._models[settings] = model
+        self._stats["model_builds"] += 1
+        return model
+
+    # ---------- graph ----------
+    def get_agent(self, model: BaseChatModel, tools: List[Any], checkpointer: Any = None) -> Any:
+        """(모델, 툴 세트, 체크포인터)에 맞는 컴파일된 그래프를 돌려줍니다. 없으면 컴파일 후 캐시."""
+        key = (id(model), tool_fingerprint(tools), id(checkpointer) if checkpointer is not None else None)
+        cached = self._graphs.get(key)
+        if cached is not None and cached[0] is model and cached[1] is checkpointer:
+            self._graphs.move_to_end(key)
+            self._stats["graph_hits"] += 1
+            return cached[2]
+
+        started = time.perf_counter()
+        graph = create_react_agent(
+            model,
+            tools,
+            pre_model_hook=compact_context if CONTEXT_COMPACTION else None,
+            checkpointer=checkpointer,
+        )
+        self._stats["build_ms_total"] += (time.perf_counter() - started) * 1000
+        self._stats["graph_builds"] += 1
+        self._graphs[key] = (model, checkpointer, graph)
+        while len(self._graphs) > self.graph_cache_size:
+            self._graphs.popitem(last=False)
+            self._stats["graph_evictions"] += 1
+        return graph
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["graph_builds"] + self._stats["graph_hits"]
+        return {
+            **self._stats,
+            "graphs": len(self._graphs),
+            "models": len(self._models),
+            "graph_hit_ratio": (self._stats["graph_hits"] / lookups) if lookups else 0.0,
+        }
+
+
+_factory: Optional[AgentFactory] = None
+
+
+def get_agent_factory() -> AgentFactory:
+    global _factory
+    if _factory is None:
+        _factory = AgentFactory()
+    return _factory
@@ -0,0 +1,190 @@
+"""
+ProcessGPT 동시 실행 서버
+- SDK의 ProcessGPTAgentServer는 가져온 작업을 하나씩 끝까지 기다리므로,
+  폴링 루프만 재정의해 작업을 백그라운드 태스크로 실행합니다.
+- 진행 중(준비/대기/실행) 작업 수가 max_in_flight에 닿으면 새 작업을 가져오지 않습니다.
+  실제 동시 실행 수 제한과 공정성은 Executor의 FairScheduler가 담당합니다.
+- 적응형 폴링: 작업을 가져오면 곧바로 다시 폴링하고, 비어 있으면 지터를 섞어 지수적으로 간격을 늘립니다.
+"""
+
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+from processgpt_agent_sdk.server import ProcessGPTAgentServer
+from processgpt_agent_sdk.core.database import (
+    get_consumer_id,
+    polling_pending_todos,
+    update_task_error,
+)
+from processgpt_agent_sdk.utils.logger import (
+    write_log_message,
+    handle_application_error,
+)
+
+from .metrics import PICKUP_SECONDS, POLLS_TOTAL
+
+
+ADAPTIVE_POLLING = os.getenv("PGPT_ADAPTIVE_POLLING", "1") != "0"
+POLL_MIN_INTERVAL = float(os.getenv("PGPT_POLL_MIN_INTERVAL", "0.25"))
+POLL_MAX_INTERVAL = float(os.getenv("PGPT_POLL_MAX_INTERVAL", "10"))
+POLL_BACKOFF = float(os.getenv("PGPT_POLL_BACKOFF", "2"))
+POLL_JITTER = float(os.getenv("PGPT_POLL_JITTER", "0.2"))
+
+# 픽업 지연 계산에 쓰는 작업 레코드의 생성 시각 컬럼 (앞에서부터 처음 존재하는 값)
+_CREATED_AT_KEYS = ("start_date", "created_at")
+
+
+def _record_created_at(task_record: Dict[str, Any]) -> Optional[float]:
+    for key in _CREATED_AT_KEYS:
+        value = task_record.get(key)
+        if not value:
+            continue
+        try:
+            ts = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts.timestamp()
+    return None
+
+
+class ConcurrentAgentServer(ProcessGPTAgentServer):
+    """작업을 동시에 처리하는 ProcessGPTAgentServer."""
+
+    def __init__(
+        self,
+        executor,
+        polling_interval: int = 5,
+        agent_orch: str = "",
+        max_in_flight: int = 1,
+        *,
+        adaptive: bool = ADAPTIVE_POLLING,
+        min_interval: float = POLL_MIN_INTERVAL,
+        max_interval: float = POLL_MAX_INTERVAL,
+        backoff: float = POLL_BACKOFF,
+        jitter: float = POLL_JITTER,
+    ) -> None:
+        super().__init__(executor=executor, polling_interval=polling_interval, agent_orch=agent_orch)
+        self.max_in_flight = max(1, max_in_flight)
+        self._jobs: Set[asyncio.Task] = set()
+        self.adaptive = adaptive
+        self.min_interval = max(0.0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.backoff = max(1.0, backoff)
+        self.jitter = min(max(0.0, jitter), 1.0)
+        self._idle_streak = 0
+        self._stats: Dict[str, float] = {
+            "polls": 0,
+            "claimed": 0,
+            "empty": 0,
+            "errors": 0,
+            "saturated_waits": 0,
+            "idle_sleep_s_total": 0.0,
+            "pickup_ms_total": 0.0,
+            "pickup_ms_max": 0.0,
+            "pickup_samples": 0,
+        }
+
+    async def run(self) -> None:
+        """폴링 루프: 여유가 있을 때만 작업을 가져와 백그라운드로 실행한다."""
+        self.is_running = True
+        write_log_message(
+            f"ProcessGPT 서버 시작 (max_in_flight={self.max_in_flight} adaptive={self.adaptive} "
+            f"interval={self.min_interval}~{self.max_interval}s)"
+        )
+
+        try:
+            while self.is_running:
+                try:
+                    if len(self._jobs) >= self.max_in_flight:
+                        # 포화 상태: 슬롯이 빌 때까지 새 작업을 가져오지 않음
+                        self._stats["saturated_waits"] += 1
+                        await asyncio.wait(self._jobs, return_when=asyncio.FIRST_COMPLETED)
+                        continue
+
+                    self._stats["polls"] += 1
+                    task_record = await polling_pending_todos(self.agent_orch, get_consumer_id())
+                    if not task_record:
+                        self._stats["empty"] += 1
+                        POLLS_TOTAL.labels(result="empty").inc()
+                        await self._idle_sleep()
+                        continue
+
+                    # 작업이 이어지는 동안에는 기다리지 않고 바로 다시 폴링
+                    self._idle_streak = 0
+                    self._stats["claimed"] += 1
+                    POLLS_TOTAL.labels(result="claimed").inc()
+                    self._record_pickup(task_record)
+
+                    job = asyncio.create_task(self._process_task(task_record))
+                    self._jobs.add(job)
+                    job.add_done_callback(self._jobs.discard)
+
+                except Exception as e:
+                    self._stats["errors"] += 1
+                    POLLS_TOTAL.labels(result="error").inc()
+                    handle_application_error("폴링 루프 오류", e, raise_error=False)
+                    await self._idle_sleep()
+        finally:
+            for job in list(self._jobs):
+                job.cancel()
+            if self._jobs:
+                await asyncio.gather(*self._jobs, return_exceptions=True)
+
+    def next_idle_delay(self) -> float:
+        """빈 폴링 뒤 쉴 시간. 적응형이면 min→max로 지수 증가(+지터), 아니면 고정 간격."""
+        if not self.adaptive:
+            return float(self.polling_interval)
+        base = min(self.max_interval, self.min_interval * (self.backoff ** min(self._idle_streak, 32)))
+        self._idle_streak += 1
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _idle_sleep(self) -> None:
+        delay = self.next_idle_delay()
+        self._stats["idle_sleep_s_total"] += delay
+        await asyncio.sleep(delay)
+
+    def _record_pickup(self, task_record: Dict[str, Any]) -> None:
+        created_at = _record_created_at(task_record)
+        if created_at is None:
+            return
+        pickup = max(0.0, time.time() - created_at)
+        PICKUP_SECONDS.observe(pickup)
+        pickup_ms = pickup * 1000
+        self._stats["pickup_samples"] += 1
+        self._stats["pickup_ms_total"] += pickup_ms
+        self._stats["pickup_ms_max"] = max(self._stats["pickup_ms_max"], pickup_ms)
+        write_log_message(f"[poll] claimed task_id={task_record.get('id')} pickup_ms={pickup_ms:.0f}")
+
+    def stats(self) -> Dict[str, Any]:
+        samples = self._stats["pickup_samples"]
+        return {
+            **self._stats,
+            "in_flight": len(self._jobs),
+            "max_in_flight": self.max_in_flight,
+            "idle_streak": self._idle_streak,
+            "pickup_ms_avg": (self._stats["pickup_ms_total"] / samples) if samples else 0.0,
+        }
+
+    async def _process_task(self, task_record: Dict[str, Any]) -> None:
+        """작업 하나를 준비→실행→취소 감시까지 처리한다(SDK 순차 루프 본문과 동일)."""
+        task_id = task_record["id"]
+        write_log_message(f"[JOB START] task_id={task_id}")
+
+        try:
+            prepared_data = await self._prepare_service_data(task_record)
+            write_log_message(f"[RUN] 서비스 데이터 준비 완료 [task_id={task_id} agent={prepared_data.get('agent_orch','')}]")
+
+            await self._execute_with_cancel_watch(task_record, prepared_data)
+            write_log_message(f"[RUN] 서비스 실행 완료 [task_id={task_id} agent={prepared_data.get('agent_orch','')}]")
+        except Exception as job_err:
+            handle_application_error("작업 처리 오류", job_err, raise_error=False)
+            try:
+                await update_task_error(str(task_id))
+            except Exception as upd_err:
+                handle_application_error("FAILED 상태 업데이트 실패", upd_err, raise_error=False)
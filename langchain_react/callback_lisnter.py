@@ -1,18 +1,152 @@
+import os
+import reprlib
+import time
+from bisect import bisect_left
 from datetime import datetime, timezone
-from typing import Any, Optional, Dict
+from itertools import islice
+from typing import Any, Optional, Dict, Tuple
+from uuid import UUID
 
-from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.callbacks import AsyncCallbackHandler
 
 
-class QueueCallback(BaseCallbackHandler):
+# 툴별 지연 히스토그램 버킷 상한(ms). 마지막 칸은 그 이상
+TOOL_LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+# 모델별 100만 토큰당 USD 단가 "모델 접두어=입력/출력". 가장 긴 접두어가 일치하는 항목을 사용
+LLM_PRICES_SPEC = os.getenv(
+    "PGPT_LLM_PRICES",
+    "gpt-4=30/60,gpt-4-turbo=10/30,gpt-4o=2.5/10,gpt-4o-mini=0.15/0.6,gpt-4.1=2/8,gpt-4.1-mini=0.4/1.6,gpt-3.5-turbo=0.5/1.5",
+)
+
+
+def parse_prices(spec: str) -> Dict[str, Tuple[float, float]]:
+    prices: Dict[str, Tuple[float, float]] = {}
+    for part in (spec or "").split(","):
+        name, sep, value = part.partition("=")
+        prompt, _, completion = value.partition("/")
+        if not sep:
+            continue
+        try:
+            prices[name.strip()] = (float(prompt), float(completion or prompt))
+        except ValueError:
+            continue
+    return prices
+
+
+_PRICES = parse_prices(LLM_PRICES_SPEC)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """단가표 기준 추정 비용(USD). 단가를 모르는 모델이면 None."""
+    match = max((name for name in _PRICES if model.startswith(name)), key=len, default=None)
+    if match is None:
+        return None
+    prompt_price, completion_price = _PRICES[match]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+# 생략 표시. reprlib.Repr.fillvalue는 3.11부터 있고 3.10의 _repr_iterable도 "..."를 씀
+_FILL = "..."
+
+
+class _PreviewRepr(reprlib.Repr):
+    """출력 길이 예산을 넘으면 남은 원소를 렌더링하지 않는 reprlib.Repr.
+
+    reprlib은 컨테이너마다 앞쪽 maxlist개만 보지만 그 원소들은 모두 렌더링하고 dict/set은
+    전체를 정렬하므로, 삽입 순서대로 앞쪽만 보고 말단 값의 출력 길이를 누적해
+    예산을 다 쓰면 이후 원소는 "..."로 대신합니다. 문자열/bytes는 앞부분만 남깁니다.
+    """
+
+    def __init__(self, limit: int) -> None:
+        super().__init__()
+        self.maxlevel = 3
+        self.maxlist = self.maxtuple = self.maxset = self.maxfrozenset = self.maxdeque = self.maxarray = 16
+        self.maxdict = 16
+        self.maxlong = self.maxother = max(limit, 8)
+        self._remaining = limit
+
+    def repr1(self, x: Any, level: int) -> str:
+        if self._remaining <= 0:
+            return _FILL
+        out = super().repr1(x, level)
+        if not isinstance(x, (list, tuple, dict, set, frozenset)):
+            self._remaining -= len(out)
+        return out
+
+    def _head(self, x: Any) -> str:
+        # 이스케이프로 길어질 수 있지만 남은 예산보다 많이 자를 필요는 없음
+        head = repr(x[: self._remaining + 1])
+        return head if len(x) <= self._remaining + 1 else head + _FILL
+
+    def repr_str(self, x: str, level: int) -> str:
+        return self._head(x)
+
+    def repr_bytes(self, x: bytes, level: int) -> str:
+        return self._head(x)
+
+    def repr_bytearray(self, x: bytearray, level: int) -> str:
+        return self._head(bytes(x[: self._remaining + 1]))
+
+    def repr_dict(self, x: Dict[Any, Any], level: int) -> str:
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{" + _FILL + "}"
+        pieces = []
+        for key in islice(x, self.maxdict):
+            pieces.append(f"{self.repr1(key, level - 1)}: {self.repr1(x[key], level - 1)}")
+            if self._remaining <= 0:
+                break
+        if len(x) > len(pieces):
+            pieces.append(_FILL)
+        return "{" + ", ".join(pieces) + "}"
+
+    def repr_set(self, x: Any, level: int) -> str:
+        if not x:
+            return "set()"
+        return self._repr_iterable(x, level, "{", "}", self.maxset)
+
+    def repr_frozenset(self, x: Any, level: int) -> str:
+        if not x:
+            return "frozenset()"
+        return self._repr_iterable(x, level, "frozenset({", "})", self.maxfrozenset)
+
+
+def bounded_preview(value: Any, limit: int) -> str:
+    """값 전체를 문자열로 만들지 않고 최대 limit자(+ "…") 프리뷰를 만듭니다.
+
+    str은 앞부분만 자르고, 메시지 객체(ToolMessage 등)는 content만, 컨테이너와 bytes는
+    길이 예산이 있는 reprlib 방식으로 앞쪽 원소만 렌더링합니다.
     """
-    LangChain/Graph 에이전트의 LLM/툴 사용을 큐에 기록하는 단순 콜백 핸들러.
+    if value is None:
+        return ""
+    content = getattr(value, "content", None)
+    if content is not None and not isinstance(value, (str, bytes, bytearray, dict, list, tuple)):
+        value = content
+    if isinstance(value, str):
+        s = value[: limit + 1]
+    elif isinstance(value, (int, float, bool)):
+        s = str(value)
+    else:
+        s = _PreviewRepr(limit + 1).repr(value)
+    return s if len(s) <= limit else (s[:limit] + "…")
+
+
+class QueueCallback(AsyncCallbackHandler):
+    """
+    LangChain/Graph 에이전트의 LLM/툴 사용을 큐에 기록하는 비동기 콜백 핸들러.
+
+    툴 실행은 run_id별로 시작 시각(monotonic)을 보관하므로 한 턴의 동시 툴 호출이나
+    중첩 호출이 서로 덮어쓰지 않고, 종료/오류 이벤트에 duration_ms를 싣습니다.
+    툴별 지연 분포는 tool_latency()로 돌려줍니다.
+    LLM 호출도 run_id별로 모델명, 첫 토큰까지 시간(TTFT), 전체 지연, 토큰 수, 추정 비용을
+    llm_finished 이벤트로 보내고, 작업(job_id) 단위 합계를 llm_usage()로 돌려줍니다.
 
     이벤트 페이로드 예:
     {
       "type": "event",
       "data": {
-        "event_type": "llm_started | tool_usage_started | tool_usage_finished | tool_usage_error",
+        "event_type": "llm_started | llm_finished | llm_error | tool_usage_started | tool_usage_finished | tool_usage_error",
         "job_id": "…",
         "crew_type": "react",
         "data": { ... },    # 이벤트별 정보 (query, tool_name 등)
@@ -30,7 +164,12 @@ class QueueCallback(BaseCallbackHandler):
         self.job_id = job_id
         self.todo_id = todo_id
         self.proc_inst_id = proc_inst_id
-        self._tool_name: Optional[str] = None
+        # run_id → (툴 이름, 시작 monotonic 시각)
+        self._tool_runs: Dict[UUID, Tuple[str, float]] = {}
+        self._tool_latency: Dict[str, Dict[str, Any]] = {}
+        # run_id → {"model", "started", "first_token"}
+        self._llm_runs: Dict[UUID, Dict[str, Any]] = {}
+        self._llm_usage: Dict[str, Dict[str, Any]] = {}
 
     # ---------- helpers ----------
     @staticmethod
@@ -39,9 +178,8 @@ class QueueCallback(BaseCallbackHandler):
 
     @classmethod
     def _preview(cls, value: Any) -> str:
-        """값을 문자열로 변환 후 길이 제한."""
-        s = str(value) if value is not None else ""
-        return s if len(s) <= cls.PREVIEW_MAX else (s[:cls.PREVIEW_MAX] + "…")
+        """PREVIEW_MAX자까지의 프리뷰. 큰 툴 출력도 전체를 문자열로 만들지 않음."""
+        return bounded_preview(value, cls.PREVIEW_MAX)
 
     def _emit(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
         payload = {
@@ -63,27 +201,185 @@ class QueueCallback(BaseCallbackHandler):
             # 큐 전송 실패는 무시 (흐름 방해 금지)
             pass
 
+    def _finish_tool(self, run_id: UUID, *, error: bool) -> Tuple[str, float]:
+        """run_id의 툴 실행을 추적 맵에서 빼고 (툴 이름, 소요 ms)를 돌려주며 히스토그램에 반영합니다."""
+        name, started = self._tool_runs.pop(run_id, ("unknown", None))
+        duration_ms = (time.monotonic() - started) * 1000 if started is not None else 0.0
+        entry = self._tool_latency.setdefault(
+            name,
+            {"calls": 0, "errors": 0, "ms_total": 0.0, "ms_max": 0.0, "buckets": [0] * (len(TOOL_LATENCY_BUCKETS_MS) + 1)},
+        )
+        entry["calls"] += 1
+        entry["errors"] += int(error)
+        entry["ms_total"] += duration_ms
+        entry["ms_max"] = max(entry["ms_max"], duration_ms)
+        entry["buckets"][bisect_left(TOOL_LATENCY_BUCKETS_MS, duration_ms)] += 1
+        return name, duration_ms
+
+    def tool_latency(self) -> Dict[str, Dict[str, Any]]:
+        """툴별 호출 수/오류 수/평균·최대 ms와 버킷별 분포({"le_50ms": n, ..., "gt_60000ms": n}, 0인 칸 생략)."""
+        labels = [f"le_{b}ms" for b in TOOL_LATENCY_BUCKETS_MS] + [f"gt_{TOOL_LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            name: {
+                "calls": e["calls"],
+                "errors": e["errors"],
+                "ms_avg": round(e["ms_total"] / e["calls"], 1) if e["calls"] else 0.0,
+                "ms_max": round(e["ms_max"], 1),
+                "histogram": {label: n for label, n in zip(labels, e["buckets"]) if n},
+            }
+            for name, e in self._tool_latency.items()
+        }
+
+    # ---------- LLM ----------
+    @staticmethod
+    def _model_name(serialized: Any, kwargs: Dict[str, Any]) -> str:
+        params = kwargs.get("invocation_params") or {}
+        return str(params.get("model") or params.get("model_name") or (serialized or {}).get("name") or "unknown")
+
+    @staticmethod
+    def _token_usage(response: Any) -> Tuple[int, int, bool]:
+        """LLMResult에서 (입력, 출력 토큰 수, 캐시 응답 여부).
+
+        usage_metadata 우선, 없으면 llm_output.token_usage. 캐시 적중 응답은 langchain이 total_cost=0을 넣어 줌.
+        """
+        for generations in getattr(response, "generations", None) or []:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    cached = usage.get("total_cost") == 0
+                    return int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0), cached
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        return int(usage.get("prompt_tokens") or 0), int(usage.get("completion_tokens") or 0), False
+
+    def _usage_entry(self, model: str) -> Dict[str, Any]:
+        entry = self._llm_usage.get(model)
+        if entry is None:
+            entry = self._llm_usage[model] = {
+                "calls": 0, "cached": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "latency_ms_total": 0.0, "ttft_ms_total": 0.0, "ttft_calls": 0, "cost_usd": None,
+            }
+        return entry
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        model = self._model_name(serialized, kwargs)
+        self._llm_runs[run_id] = {"model": model, "started": time.monotonic(), "first_token": None}
+        self._emit("llm_started", {"model": model, "messages": sum(len(batch) for batch in messages or [])})
+
+    async def on_llm_new_token(self, token, *, run_id: UUID, **kwargs):
+        run = self._llm_runs.get(run_id)
+        if run is not None and run["first_token"] is None:
+            run["first_token"] = time.monotonic()
+
+    async def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        run = self._llm_runs.pop(run_id, None)
+        if run is None:
+            return
+        ended = time.monotonic()
+        prompt_tokens, completion_tokens, cached = self._token_usage(response)
+        latency_ms = (ended - run["started"]) * 1000
+        ttft_ms = (run["first_token"] - run["started"]) * 1000 if run["first_token"] is not None else None
+        cost = 0.0 if cached else estimate_cost(run["model"], prompt_tokens, completion_tokens)
+
+        entry = self._usage_entry(run["model"])
+        entry["calls"] += 1
+        entry["cached"] += int(cached)
+        entry["prompt_tokens"] += prompt_tokens
+        entry["completion_tokens"] += completion_tokens
+        entry["latency_ms_total"] += latency_ms
+        if ttft_ms is not None:
+            entry["ttft_ms_total"] += ttft_ms
+            entry["ttft_calls"] += 1
+        if cost is not None:
+            entry["cost_usd"] = (entry["cost_usd"] or 0.0) + cost
+
+        self._emit(
+            "llm_finished",
+            {
+                "model": run["model"],
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "ttft_ms": round(ttft_ms, 1) if ttft_ms is not None else None,
+                "latency_ms": round(latency_ms, 1),
+                "cost_usd": round(cost, 6) if cost is not None else None,
+                "cached": cached,
+            },
+        )
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        run = self._llm_runs.pop(run_id, None)
+        if run is None:
+            return
+        latency_ms = (time.monotonic() - run["started"]) * 1000
+        entry = self._usage_entry(run["model"])
+        entry["errors"] += 1
+        self._emit(
+            "llm_error",
+            {
+                "model": run["model"],
+                "error": self._preview(f"{type(error).__name__}: {error}"),
+                "latency_ms": round(latency_ms, 1),
+            },
+        )
+
+    def llm_usage(self) -> Dict[str, Any]:
+        """작업 전체 LLM 사용량: 합계와 모델별 호출 수/토큰/평균 지연·TTFT/추정 비용."""
+        by_model: Dict[str, Any] = {}
+        total = {"calls": 0, "cached": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_ms": 0.0, "cost_usd": None}
+        for model, e in self._llm_usage.items():
+            by_model[model] = {
+                "calls": e["calls"],
+                "cached": e["cached"],
+                "errors": e["errors"],
+                "prompt_tokens": e["prompt_tokens"],
+                "completion_tokens": e["completion_tokens"],
+                "latency_ms_avg": round(e["latency_ms_total"] / e["calls"], 1) if e["calls"] else 0.0,
+                "ttft_ms_avg": round(e["ttft_ms_total"] / e["ttft_calls"], 1) if e["ttft_calls"] else None,
+                "cost_usd": round(e["cost_usd"], 6) if e["cost_usd"] is not None else None,
+            }
+            for key in ("calls", "cached", "errors", "prompt_tokens", "completion_tokens"):
+                total[key] += e[key]
+            total["latency_ms"] += e["latency_ms_total"]
+            if e["cost_usd"] is not None:
+                total["cost_usd"] = (total["cost_usd"] or 0.0) + e["cost_usd"]
+        total["latency_ms"] = round(total["latency_ms"], 1)
+        if total["cost_usd"] is not None:
+            total["cost_usd"] = round(total["cost_usd"], 6)
+        return {"job_id": self.job_id, **total, "by_model": by_model}
+
     # ---------- TOOL ----------
-    def on_tool_start(self, serialized, input_str, **kwargs):
+    async def on_tool_start(self, serialized, input_str, *, run_id: UUID, **kwargs):
         name = None
         if isinstance(serialized, dict):
             name = serialized.get("name")
-        self._tool_name = name or kwargs.get("name") or "unknown"
+        name = name or kwargs.get("name") or "unknown"
+        self._tool_runs[run_id] = (name, time.monotonic())
 
         self._emit(
             "tool_usage_started",
             {
-                "tool_name": self._tool_name,
+                "tool_name": name,
                 "query": self._preview(input_str),
             },
         )
 
-    def on_tool_end(self, output, **kwargs):
+    async def on_tool_end(self, output, *, run_id: UUID, **kwargs):
+        name, duration_ms = self._finish_tool(run_id, error=False)
         self._emit(
             "tool_usage_finished",
             {
-                "tool_name": self._tool_name,
+                "tool_name": name,
                 "result": self._preview(output),
+                "duration_ms": round(duration_ms, 1),
+            },
+        )
+
+    async def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        name, duration_ms = self._finish_tool(run_id, error=True)
+        self._emit(
+            "tool_usage_error",
+            {
+                "tool_name": name,
+                "error": self._preview(f"{type(error).__name__}: {error}"),
+                "duration_ms": round(duration_ms, 1),
             },
         )
-        self._tool_name = None
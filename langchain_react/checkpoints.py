@@ -0,0 +1,225 @@
+"""
+todo 단위 ReAct 실행 체크포인트 (SQLite, opt-in)
+- PGPT_CHECKPOINT_DB에 경로를 지정하면 create_react_agent 그래프에 AsyncSqliteSaver를 붙이고
+  thread_id=todo_id로 단계마다 상태(대화/툴 결과)를 저장합니다.
+- 워커가 작업 도중 재시작돼 같은 todo가 다시 배달되면 마지막으로 끝난 단계부터 이어서 실행합니다.
+  (이미 끝난 LLM 턴과 툴 호출은 다시 하지 않음. 단, MCP 세션 안의 인터프리터 변수 등은 복원되지 않음)
+- 작업이 완료 이벤트까지 내보내면 체크포인트를 지우고, 끝나지 못한 todo는 PGPT_CHECKPOINT_TTL_H 뒤에 정리합니다.
+- 단계별 체크포인트 쓰기 시간과 재개로 건너뛴 단계/툴 호출 수를 stats()로 보고합니다.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from processgpt_agent_sdk.utils.logger import handle_application_error, write_log_message
+
+
+CHECKPOINT_DB = os.getenv("PGPT_CHECKPOINT_DB", "")
+CHECKPOINT_TTL_HOURS = float(os.getenv("PGPT_CHECKPOINT_TTL_H", "72"))
+
+
+def _make_saver_class():
+    """langgraph-checkpoint-sqlite는 체크포인트를 켤 때만 import 합니다."""
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    class TimedSqliteSaver(AsyncSqliteSaver):
+        """쓰기(aput/aput_writes) 시간을 thread_id별로 누적하는 AsyncSqliteSaver."""
+
+        store: "CheckpointStore"
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            started = time.perf_counter()
+            try:
+                return await super().aput(config, checkpoint, metadata, new_versions)
+            finally:
+                self.store._record_write(config, time.perf_counter() - started, checkpoint=True)
+
+        async def aput_writes(self, config, writes, task_id, task_path=""):
+            started = time.perf_counter()
+            try:
+                return await super().aput_writes(config, writes, task_id, task_path)
+            finally:
+                self.store._record_write(config, time.perf_counter() - started, checkpoint=False)
+
+    return TimedSqliteSaver
+
+
+def _first_human_text(messages: List[BaseMessage]) -> Optional[str]:
+    for msg in messages:
+        if isinstance(msg, HumanMessage):
+            return msg.content if isinstance(msg.content, str) else str(msg.content)
+    return None
+
+
+class CheckpointStore:
+    """프로세스 공용 SQLite 체크포인터와 재개/쓰기 통계."""
+
+    def __init__(self, path: str, ttl_hours: float = CHECKPOINT_TTL_HOURS) -> None:
+        self.path = path
+        self.ttl_hours = ttl_hours
+        self._conn = None
+        self._saver = None
+        self._setup_lock = asyncio.Lock()
+        # thread_id → 이번 실행의 쓰기 집계
+        self._threads: Dict[str, Dict[str, float]] = {}
+        self._stats: Dict[str, float] = {
+            "runs": 0,
+            "resumed": 0,
+            "reused_finished": 0,
+            "discarded_mismatch": 0,
+            "steps_skipped": 0,
+            "tool_calls_skipped": 0,
+            "checkpoints": 0,
+            "writes": 0,
+            "write_ms_total": 0.0,
+            "pruned": 0,
+        }
+
+    async def saver(self):
+        """체크포인터를 돌려줍니다. 처음 호출 때 DB를 열고 테이블 생성/오래된 thread 정리를 합니다.
+
+        첫 작업들이 동시에 호출해도 연결은 하나만 열리도록 잠금 안에서 다시 확인하고,
+        준비가 모두 끝난 뒤에만 공개합니다(실패하면 연결을 닫음).
+        """
+        if self._saver is not None:
+            return self._saver
+        async with self._setup_lock:
+            if self._saver is not None:
+                return self._saver
+            import aiosqlite
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = await aiosqlite.connect(self.path)
+            try:
+                await conn.execute("PRAGMA journal_mode=WAL")
+                await conn.execute(
+                    "CREATE TABLE IF NOT EXISTS pgpt_threads (thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)"
+                )
+                await conn.commit()
+                saver = _make_saver_class()(conn)
+                saver.store = self
+                await saver.setup()
+                await self._prune(conn, saver)
+            except BaseException:
+                await conn.close()
+                raise
+            self._conn, self._saver = conn, saver
+        return self._saver
+
+    async def _prune(self, conn: Any, saver: Any) -> None:
+        if self.ttl_hours <= 0:
+            return
+        cutoff = time.time() - self.ttl_hours * 3600
+        async with saver.lock:
+            async with conn.execute("SELECT thread_id FROM pgpt_threads WHERE updated_at < ?", (cutoff,)) as cur:
+                stale = [row[0] for row in await cur.fetchall()]
+            for thread_id in stale:
+                await conn.execute("DELETE FROM pgpt_threads WHERE thread_id = ?", (thread_id,))
+            await conn.commit()
+        for thread_id in stale:
+            await saver.adelete_thread(thread_id)
+        self._stats["pruned"] += len(stale)
+        if stale:
+            write_log_message(f"[checkpoint] pruned stale threads={len(stale)}")
+
+    async def begin(self, agent: Any, config: Dict[str, Any], query: str) -> Optional[Dict[str, Any]]:
+        """실행 시작 전 저장된 상태를 확인합니다.
+
+        저장된 것이 없으면 None, 같은 질의로 중단된 실행이 있으면 {"resume": True, "values": ...},
+        끝까지 실행됐지만 완료 처리 전에 멈춘 경우 {"finished": True, "values": ...}를 돌려줍니다.
+        """
+        thread_id = str(config["configurable"]["thread_id"])
+        self._stats["runs"] += 1
+        self._threads[thread_id] = {"checkpoints": 0, "writes": 0, "write_ms": 0.0}
+        async with self._saver.lock:  # 체크포인터와 같은 연결을 쓰므로 트랜잭션이 섞이지 않게
+            await self._conn.execute(
+                "INSERT OR REPLACE INTO pgpt_threads (thread_id, updated_at) VALUES (?, ?)", (thread_id, time.time())
+            )
+            await self._conn.commit()
+
+        snapshot = await agent.aget_state(config)
+        messages = (snapshot.values or {}).get("messages") or []
+        if not messages:
+            return None
+        if _first_human_text(messages) != query:
+            # 같은 todo_id에 입력이 바뀌었으면(피드백 재실행 등) 처음부터
+            await self._saver.adelete_thread(thread_id)
+            self._stats["discarded_mismatch"] += 1
+            return None
+
+        steps = sum(1 for m in messages if isinstance(m, AIMessage))
+        tool_calls = sum(1 for m in messages if isinstance(m, ToolMessage))
+        self._stats["steps_skipped"] += steps
+        self._stats["tool_calls_skipped"] += tool_calls
+        report = {
+            "values": snapshot.values,
+            "restored_messages": len(messages),
+            "steps_skipped": steps,
+            "tool_calls_skipped": tool_calls,
+        }
+        if snapshot.next:
+            self._stats["resumed"] += 1
+            return {"resume": True, **report}
+        self._stats["reused_finished"] += 1
+        return {"finished": True, **report}
+
+    def _record_write(self, config: Dict[str, Any], seconds: float, *, checkpoint: bool) -> None:
+        thread_id = str(((config or {}).get("configurable") or {}).get("thread_id"))
+        ms = seconds * 1000
+        self._stats["writes"] += 1
+        self._stats["write_ms_total"] += ms
+        if checkpoint:
+            self._stats["checkpoints"] += 1
+        per_thread = self._threads.get(thread_id)
+        if per_thread is not None:
+            per_thread["writes"] += 1
+            per_thread["write_ms"] += ms
+            if checkpoint:
+                per_thread["checkpoints"] += 1
+
+    def finish(self, thread_id: str) -> Dict[str, float]:
+        """이번 실행의 쓰기 집계를 돌려주고 정리합니다."""
+        per_thread = self._threads.pop(str(thread_id), None) or {"checkpoints": 0, "writes": 0, "write_ms": 0.0}
+        per_thread["write_ms"] = round(per_thread["write_ms"], 2)
+        return per_thread
+
+    async def discard(self, thread_id: str) -> None:
+        """완료된 todo의 체크포인트를 지웁니다."""
+        if self._saver is None:
+            return
+        try:
+            await self._saver.adelete_thread(str(thread_id))
+            async with self._saver.lock:
+                await self._conn.execute("DELETE FROM pgpt_threads WHERE thread_id = ?", (str(thread_id),))
+                await self._conn.commit()
+        except Exception as e:
+            handle_application_error("[checkpoint] 삭제 실패", e, raise_error=False)
+
+    async def aclose(self) -> None:
+        if self._conn is not None:
+            await self._conn.close()
+        self._conn = None
+        self._saver = None
+
+    def stats(self) -> Dict[str, Any]:
+        checkpoints = self._stats["checkpoints"]
+        return {
+            **self._stats,
+            "write_ms_per_checkpoint": (self._stats["write_ms_total"] / checkpoints) if checkpoints else 0.0,
+        }
+
+
+_store: Optional[CheckpointStore] = None
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """PGPT_CHECKPOINT_DB가 설정돼 있으면 프로세스 공용 저장소를, 아니면 None을 돌려줍니다."""
+    global _store
+    path = os.getenv("PGPT_CHECKPOINT_DB", CHECKPOINT_DB)
+    if _store is None and path:
+        _store = CheckpointStore(path)
+    return _store
@@ -0,0 +1,152 @@
+"""
+모델 호출 전 대화 컨텍스트 압축
+- create_react_agent의 pre_model_hook으로 매 LLM 호출 직전에 실행됩니다.
+- 최근 N개 툴 턴(AI 툴 호출 + 그 결과)은 그대로 두고, 그 이전 툴 출력은 앞부분만 남겨 자릅니다.
+- 그래도 컨텍스트 토큰 상한을 넘으면 오래된 툴 출력부터 생략 표시로 바꾸고, 마지막으로 최근 툴 출력까지 줄입니다.
+- 메시지를 지우지 않고 내용만 줄이므로 tool_call ↔ ToolMessage 짝은 유지됩니다.
+- 그래프 state의 messages는 바꾸지 않고 LLM 입력(llm_input_messages)만 압축합니다.
+"""
+
+import os
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+
+from .metrics import CONTEXT_TOKENS_SAVED
+from .prompt_builder import count_tokens, truncate_to_tokens
+
+
+CONTEXT_COMPACTION = os.getenv("PGPT_CONTEXT_COMPACTION", "1") != "0"
+CONTEXT_MAX_TOKENS = int(os.getenv("PGPT_CONTEXT_MAX_TOKENS", "6000"))
+KEEP_RECENT_TURNS = int(os.getenv("PGPT_CONTEXT_KEEP_TURNS", "2"))
+OLD_TOOL_OUTPUT_TOKENS = int(os.getenv("PGPT_CONTEXT_TOOL_OUTPUT_TOKENS", "300"))
+
+# 메시지 구분자/역할 등 내용 외 토큰 근사치
+_MESSAGE_OVERHEAD = 4
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(b if isinstance(b, str) else str(b.get("text", "")) for b in content if isinstance(b, (str, dict)))
+    return str(content or "")
+
+
+def _message_tokens(message: BaseMessage) -> int:
+    tokens = count_tokens(_content_text(message.content)) + _MESSAGE_OVERHEAD
+    for call in getattr(message, "tool_calls", None) or []:
+        tokens += count_tokens(str(call.get("name", ""))) + count_tokens(str(call.get("args", "")))
+    return tokens
+
+
+def _with_content(message: BaseMessage, content: str) -> BaseMessage:
+    return message.model_copy(update={"content": content})
+
+
+def _recent_start(messages: List[BaseMessage], keep_turns: int) -> int:
+    """최근 keep_turns개의 툴 호출 AI 메시지 중 가장 오래된 것의 위치. 그 이후는 보존."""
+    seen = 0
+    for i in range(len(messages) - 1, -1, -1):
+        msg = messages[i]
+        if isinstance(msg, AIMessage) and msg.tool_calls:
+            seen += 1
+            if seen >= keep_turns:
+                return i
+    return 0
+
+
+def compact_messages(
+    messages: List[BaseMessage],
+    *,
+    max_tokens: int = CONTEXT_MAX_TOKENS,
+    keep_turns: int = KEEP_RECENT_TURNS,
+    tool_output_tokens: int = OLD_TOOL_OUTPUT_TOKENS,
+) -> Tuple[List[BaseMessage], Dict[str, int]]:
+    """LLM 입력용으로 압축한 메시지 목록과 {before, after, truncated, elided}를 돌려줍니다."""
+    tokens = [_message_tokens(m) for m in messages]
+    before = sum(tokens)
+    result = list(messages)
+    report = {"before": before, "after": before, "truncated": 0, "elided": 0}
+    if len(messages) < 3:
+        return result, report
+
+    recent = _recent_start(messages, keep_turns) if keep_turns > 0 else len(messages)
+    old_tools = [i for i in range(recent) if isinstance(messages[i], ToolMessage)]
+
+    # 1) 오래된 툴 출력은 앞부분만 유지
+    for i in old_tools:
+        if tokens[i] - _MESSAGE_OVERHEAD > tool_output_tokens:
+            text = truncate_to_tokens(_content_text(result[i].content), tool_output_tokens)
+            result[i] = _with_content(result[i], text)
+            tokens[i] = _message_tokens(result[i])
+            report["truncated"] += 1
+
+    # 2) 상한을 넘으면 오래된 툴 출력부터 생략 표시로 교체
+    total = sum(tokens)
+    for i in old_tools:
+        if max_tokens <= 0 or total <= max_tokens:
+            break
+        original = _message_tokens(messages[i])
+        result[i] = _with_content(result[i], f"[이전 툴 출력 생략: 약 {original} 토큰]")
+        new_tokens = _message_tokens(result[i])
+        total += new_tokens - tokens[i]
+        tokens[i] = new_tokens
+        report["elided"] += 1
+
+    # 3) 최근 턴만으로도 넘치면 최근 툴 출력을 남은 예산에 맞춰 자름
+    recent_tools = [i for i in range(recent, len(result)) if isinstance(result[i], ToolMessage)]
+    if max_tokens > 0 and total > max_tokens and recent_tools:
+        fixed = total - sum(tokens[i] for i in recent_tools)
+        share = max(tool_output_tokens, (max_tokens - fixed) // len(recent_tools) - _MESSAGE_OVERHEAD)
+        for i in recent_tools:
+            if tokens[i] - _MESSAGE_OVERHEAD > share:
+                result[i] = _with_content(result[i], truncate_to_tokens(_content_text(result[i].content), share))
+                tokens[i] = _message_tokens(result[i])
+                report["truncated"] += 1
+
+    report["after"] = sum(tokens)
+    return result, report
+
+
+class ContextStats:
+    """한 작업 동안의 압축 결과 누적."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.peak_before = 0
+        self.last_tokens = 0  # 직전 모델 호출의 입력 토큰(압축 후)
+
+    def record(self, report: Dict[str, int]) -> None:
+        self.calls += 1
+        self.tokens_before += report["before"]
+        self.tokens_after += report["after"]
+        self.peak_before = max(self.peak_before, report["before"])
+        self.last_tokens = report["after"]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "model_calls": self.calls,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved": self.tokens_before - self.tokens_after,
+            "peak_context_tokens": self.peak_before,
+        }
+
+
+def compact_context(state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+    """pre_model_hook: state는 그대로 두고 압축한 메시지를 LLM 입력으로 넘깁니다.
+
+    config["configurable"]["context_stats"]에 ContextStats가 있으면 결과를 누적합니다.
+    """
+    messages, report = compact_messages(state.get("messages") or [])
+    saved = report["before"] - report["after"]
+    if saved > 0:
+        CONTEXT_TOKENS_SAVED.inc(saved)
+    stats = ((config or {}).get("configurable") or {}).get("context_stats")
+    if isinstance(stats, ContextStats):
+        stats.record(report)
+    return {"llm_input_messages": messages}
@@ -0,0 +1,154 @@
+"""
+이벤트 파이프라인
+- 콜백/실행기가 만든 이벤트를 SDK 이벤트 큐로 넘기기 전에 버퍼링합니다.
+- 짧은 구간(flush_ms)만큼 기다렸다가 쌓인 이벤트를 한 번에 최대 batch_size개씩 흘려보내고,
+  각 묶음 사이에는 이벤트 루프에 양보합니다. 이벤트를 하나로 합치지는 않습니다:
+  SDK 큐는 이벤트마다 별도 레코드로 저장하므로 싱크 호출은 여전히 이벤트당 한 번입니다.
+- 저우선순위 이벤트(tool_usage_*, llm_* 등)는 버퍼 상한을 넘으면 가장 오래된 것부터 버립니다.
+  작업 시작/완료/출력 같은 고우선순위 이벤트는 버리지 않습니다.
+- enqueue_event는 동기 O(1)이라 에이전트 루프를 막지 않습니다.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from processgpt_agent_sdk.utils.logger import handle_application_error
+
+from .metrics import EVENT_DELIVERY_SECONDS
+
+
+MAX_LOW_PRIORITY_BUFFER = int(os.getenv("PGPT_EVENT_BUFFER", "500"))
+BATCH_SIZE = int(os.getenv("PGPT_EVENT_BATCH", "50"))
+FLUSH_INTERVAL = float(os.getenv("PGPT_EVENT_FLUSH_MS", "50")) / 1000
+
+LOW_PRIORITY_PREFIXES = ("tool_usage_", "llm_", "agent_")
+
+# 프로세스 전체 누적 지표 (모든 파이프라인 합산)
+PIPELINE_STATS: Dict[str, float] = {
+    "enqueued": 0,
+    "delivered": 0,
+    "dropped": 0,
+    "flushes": 0,  # batch_size개 이하씩 흘려보낸 횟수
+    "delivery_errors": 0,
+    "latency_ms_total": 0.0,
+    "latency_ms_max": 0.0,
+}
+
+_seq = itertools.count()
+
+_Item = Tuple[int, float, Any]  # (순번, enqueue 시각, payload)
+
+
+def is_low_priority(payload: Any) -> bool:
+    if not isinstance(payload, dict) or payload.get("type") != "event":
+        return False
+    event_type = str((payload.get("data") or {}).get("event_type") or "")
+    return event_type.startswith(LOW_PRIORITY_PREFIXES)
+
+
+class EventPipeline:
+    """SDK 이벤트 큐 앞단의 비차단 버퍼. enqueue_event 인터페이스를 그대로 제공합니다."""
+
+    def __init__(
+        self,
+        event_queue,
+        *,
+        max_low_priority: int = MAX_LOW_PRIORITY_BUFFER,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+    ) -> None:
+        self._sink = event_queue
+        self.max_low_priority = max(1, max_low_priority)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._high: Deque[_Item] = deque()
+        self._low: Deque[_Item] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.dropped = 0
+
+    # ---------- producer ----------
+    def enqueue_event(self, payload: Any) -> None:
+        PIPELINE_STATS["enqueued"] += 1
+        item = (next(_seq), time.monotonic(), payload)
+        if self._closed or self._task is None:
+            # 시작 전/종료 후에는 버퍼 없이 바로 전달
+            self._deliver(item)
+            return
+        if is_low_priority(payload):
+            if len(self._low) >= self.max_low_priority:
+                self._low.popleft()
+                self.dropped += 1
+                PIPELINE_STATS["dropped"] += 1
+            self._low.append(item)
+        else:
+            self._high.append(item)
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    # ---------- lifecycle ----------
+    def start(self) -> "EventPipeline":
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def close(self) -> None:
+        """플러시 태스크를 멈추고 남은 이벤트를 순서대로 모두 전달합니다."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        while self._high or self._low:
+            self._deliver(self._pop())
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # 짧게 기다려 폭주 구간의 이벤트를 버퍼에 모은 뒤 묶음 단위로 흘려보냄
+            if self.flush_interval > 0:
+                await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            while self._high or self._low:
+                for _ in range(min(self.batch_size, len(self._high) + len(self._low))):
+                    self._deliver(self._pop())
+                PIPELINE_STATS["flushes"] += 1
+                await asyncio.sleep(0)
+
+    # ---------- internals ----------
+    def _pop(self) -> _Item:
+        """두 대기열 중 먼저 들어온 이벤트를 꺼내 원래 순서를 유지합니다."""
+        if self._high and (not self._low or self._high[0][0] < self._low[0][0]):
+            return self._high.popleft()
+        return self._low.popleft()
+
+    def _deliver(self, item: _Item) -> None:
+        _, enqueued_at, payload = item
+        try:
+            self._sink.enqueue_event(payload)
+        except Exception as e:
+            PIPELINE_STATS["delivery_errors"] += 1
+            handle_application_error("이벤트 전달 실패", e, raise_error=False)
+            return
+        latency = time.monotonic() - enqueued_at
+        EVENT_DELIVERY_SECONDS.observe(latency)
+        latency_ms = latency * 1000
+        PIPELINE_STATS["delivered"] += 1
+        PIPELINE_STATS["latency_ms_total"] += latency_ms
+        PIPELINE_STATS["latency_ms_max"] = max(PIPELINE_STATS["latency_ms_max"], latency_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"buffered": len(self._high) + len(self._low), "dropped": self.dropped}
+
+
+def pipeline_stats() -> Dict[str, Any]:
+    delivered = PIPELINE_STATS["delivered"]
+    return {
+        **PIPELINE_STATS,
+        "latency_ms_avg": (PIPELINE_STATS["latency_ms_total"] / delivered) if delivered else 0.0,
+    }
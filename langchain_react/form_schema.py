@@ -0,0 +1,139 @@
+"""
+form_types → JSON Schema 변환 및 로컬 검증
+- ProcessGPT form_types(필드 목록: key/type/text)를 JSON Schema로 컴파일하고 form_id별로 캐시합니다.
+- 폼에서 필수로 표시한 필드(required/is_required)만 required로 두어, 선택 필드를 빠뜨린 출력은 보정하지 않습니다.
+- 최종 JSON을 로컬에서 검증하고, 첫 시도 성공/보정 성공/실패 횟수를 집계합니다.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# form 필드 type → JSON Schema 조각. 목록에 없는 타입(default/file 등)은 제약 없이 둡니다.
+_FIELD_TYPE_SCHEMAS: Dict[str, Dict[str, Any]] = {
+    "text": {"type": "string"},
+    "textarea": {"type": "string"},
+    "string": {"type": "string"},
+    "email": {"type": "string"},
+    "date": {"type": "string"},
+    "datetime": {"type": "string"},
+    "time": {"type": "string"},
+    "select": {"type": "string"},
+    "radio": {"type": "string"},
+    "report": {"type": "string"},
+    "slide": {"type": "string"},
+    "number": {"type": "number"},
+    "integer": {"type": "integer"},
+    "boolean": {"type": "boolean"},
+    "checkbox": {"type": "array", "items": {"type": "string"}},
+}
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "integer": int,
+    "number": (int, float),
+}
+
+
+def _is_required(spec: Dict[str, Any]) -> bool:
+    flag = spec.get("required", spec.get("is_required"))
+    if isinstance(flag, str):
+        return flag.strip().lower() in ("true", "1", "yes", "required")
+    return bool(flag)
+
+
+def compile_form_schema(form_types: Any) -> Optional[Dict[str, Any]]:
+    """form_types(리스트 또는 {key: type} dict)를 JSON Schema로 변환합니다. 필드가 없으면 None."""
+    fields: List[Tuple[str, str, str, bool]] = []
+    if isinstance(form_types, dict):
+        for key, spec in form_types.items():
+            if isinstance(spec, dict):
+                fields.append((str(key), str(spec.get("type") or ""), str(spec.get("text") or ""), _is_required(spec)))
+            else:
+                fields.append((str(key), str(spec or ""), "", False))
+    elif isinstance(form_types, list):
+        for spec in form_types:
+            if not isinstance(spec, dict):
+                continue
+            key = spec.get("key") or spec.get("name") or spec.get("id")
+            if key:
+                text = str(spec.get("text") or spec.get("alias") or "")
+                fields.append((str(key), str(spec.get("type") or ""), text, _is_required(spec)))
+    # 폼 정의가 없을 때 SDK가 채우는 기본 필드({"type": "default"})만 있으면 스키마 없음
+    if not fields or all(ftype == "default" for _, ftype, _, _ in fields):
+        return None
+
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+    for key, ftype, text, is_required in fields:
+        prop = dict(_FIELD_TYPE_SCHEMAS.get(ftype.lower(), {}))
+        if text:
+            prop["description"] = text
+        properties[key] = prop
+        if is_required:
+            required.append(key)
+    return {
+        "title": "form_result",
+        "description": "form_type의 폼 키별 최종 결과 값",
+        "type": "object",
+        "properties": properties,
+        "required": required,
+    }
+
+
+def validate_payload(value: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """type/properties/required/items만 지원하는 최소 JSON Schema 검증. 오류 메시지 목록을 돌려줍니다."""
+    errors: List[str] = []
+    expected = schema.get("type")
+    if expected:
+        py_type = _JSON_TYPES.get(expected)
+        ok = py_type is not None and isinstance(value, py_type)
+        if expected in ("integer", "number") and isinstance(value, bool):
+            ok = False
+        if not ok:
+            return [f"{path}: expected {expected}, got {type(value).__name__}"]
+
+    if isinstance(value, dict):
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}.{key}: required")
+        for key, sub in (schema.get("properties") or {}).items():
+            if key in value:
+                errors.extend(validate_payload(value[key], sub, f"{path}.{key}"))
+    elif isinstance(value, list) and isinstance(schema.get("items"), dict):
+        for i, item in enumerate(value):
+            errors.extend(validate_payload(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+
+class FormSchemaCache:
+    """form_id별 컴파일된 스키마 캐시와 검증 결과 집계."""
+
+    def __init__(self) -> None:
+        self._cache: Dict[str, Tuple[Any, Optional[Dict[str, Any]]]] = {}
+        self._stats: Dict[str, int] = {"valid": 0, "repaired": 0, "failed": 0}
+
+    def get(self, form_id: Any, form_types: Any) -> Optional[Dict[str, Any]]:
+        key = str(form_id)
+        cached = self._cache.get(key)
+        # 같은 form_id라도 정의가 바뀌었으면 다시 컴파일
+        if cached is not None and cached[0] == form_types:
+            return cached[1]
+        schema = compile_form_schema(form_types)
+        self._cache[key] = (form_types, schema)
+        return schema
+
+    def record(self, status: str) -> None:
+        if status in self._stats:
+            self._stats[status] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = sum(self._stats.values())
+        return {
+            **self._stats,
+            "forms": len(self._cache),
+            "first_pass_failure_rate": ((self._stats["repaired"] + self._stats["failed"]) / total) if total else 0.0,
+            "final_failure_rate": (self._stats["failed"] / total) if total else 0.0,
+        }
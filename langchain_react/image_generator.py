@@ -14,6 +14,8 @@ import openai
 from PIL import Image
 from supabase import create_client
 
+from .rate_limiter import rate_limited_client
+
 
 class ImageGenerator:
     """GPT Image 생성 후 Supabase Storage에 저장"""
@@ -23,7 +25,8 @@ class ImageGenerator:
         self.openai_api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
-        self.client = openai.OpenAI(api_key=self.openai_api_key)
+        # 채팅 호출과 같은 레이트 리미터를 공유 (429 재시도도 리미터가 담당)
+        self.client = openai.OpenAI(api_key=self.openai_api_key, http_client=rate_limited_client(), max_retries=0)
 
         # Supabase
         supabase_url = os.getenv("SUPABASE_URL")
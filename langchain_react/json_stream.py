@@ -0,0 +1,121 @@
+"""
+점진적 JSON 추출기
+- LLM 최종 답변 토큰 스트림을 받아 첫 번째 최상위 JSON 객체가 닫히는 즉시 돌려줍니다.
+- 문자열/이스케이프 안의 괄호는 무시하고, 프롬프트 예시처럼 끝에 붙은 쉼표(`,}`)도 허용합니다.
+"""
+
+import json
+import re
+from typing import Any, List, Optional
+
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```", re.IGNORECASE)
+
+
+def strip_trailing_commas(text: str) -> str:
+    """문자열 밖에서 `}` 또는 `]` 바로 앞(공백 무시)에 오는 쉼표를 제거합니다."""
+    out: List[str] = []
+    in_str = False
+    escape = False
+    pending_comma = -1  # out 안에서 아직 확정되지 않은 쉼표 위치
+    for ch in text:
+        if in_str:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch in "}]" and pending_comma != -1:
+            del out[pending_comma]
+            pending_comma = -1
+        elif not ch.isspace():
+            pending_comma = -1
+        if ch == ",":
+            pending_comma = len(out)
+        elif ch == '"':
+            in_str = True
+        out.append(ch)
+    return "".join(out)
+
+
+def loads_lenient(text: str) -> Optional[Any]:
+    """json.loads 후 실패하면 끝 쉼표를 제거해 한 번 더 시도합니다."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return json.loads(strip_trailing_commas(text))
+    except ValueError:
+        return None
+
+
+class JsonObjectExtractor:
+    """청크를 받으며 첫 번째 최상위 `{...}` 객체를 찾는 점진적 파서."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._buf: List[str] = []
+        self._depth = 0
+        self._in_str = False
+        self._escape = False
+        self.result: Optional[Any] = None
+        self.done = False
+
+    def feed(self, chunk: str) -> Optional[Any]:
+        """객체가 완성되어 파싱에 성공하면 그 값을, 아니면 None을 돌려줍니다."""
+        if self.done:
+            return self.result
+        for ch in chunk:
+            if self._depth == 0:
+                if ch == "{":
+                    self._buf = [ch]
+                    self._depth = 1
+                continue
+
+            self._buf.append(ch)
+            if self._in_str:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_str = False
+                continue
+
+            if ch == '"':
+                self._in_str = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = loads_lenient("".join(self._buf))
+                    if isinstance(obj, dict):
+                        self.result = obj
+                        self.done = True
+                        return obj
+                    # 객체가 아니면(예: 설명문 속 중괄호) 다음 후보를 계속 찾음
+                    self._buf = []
+        return None
+
+
+def extract_json(text: str) -> Any:
+    """완성된 텍스트에서 JSON을 추출합니다(코드펜스 우선, 실패 시 {"result": text})."""
+    s = (text or "").strip()
+    if not s:
+        return {}
+    fence_match = _FENCE_RE.search(s)
+    if fence_match:
+        candidate = loads_lenient(fence_match.group(1).strip())
+        if candidate is not None:
+            return candidate
+    obj = JsonObjectExtractor().feed(s)
+    if obj is not None:
+        return obj
+    return {"result": s}
@@ -0,0 +1,249 @@
+"""
+LLM 응답 캐시 (SQLite, opt-in)
+- LangChain BaseCache 구현이라 채팅 모델에 cache=로 꽂아 씁니다(서버 AgentFactory.get_model,
+  langchain_react가 함께 설치된 mcp_react_client CLI).
+- 키: 정규화한 메시지 목록 + llm_string(모델명/temperature/바인딩된 툴 스키마 등 호출 파라미터).
+  메시지 id, response/usage 메타데이터는 빼고, 실행마다 달라지는 tool_call id는 등장 순서 번호로 바꿉니다.
+- TTL 만료 + 최근 사용 순(LRU) 제거로 항목 수/용량 상한을 지킵니다.
+- 적중/미스와 적중으로 아낀 생성 시간(ms)을 stats()로 보고합니다.
+- track_pending() 안에서는 마지막 미스의 키를 기억해, 호출 측이 스트림을 일찍 닫아 생성이
+  끝나지 않은 최종 응답도 write_pending()으로 저장할 수 있습니다.
+
+PGPT_LLM_CACHE에 SQLite 파일 경로를 지정하면 켜집니다(비어 있으면 끔).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+
+LLM_CACHE_PATH = os.getenv("PGPT_LLM_CACHE", "")
+LLM_CACHE_TTL = float(os.getenv("PGPT_LLM_CACHE_TTL", str(7 * 24 * 3600)))  # 초, 0이면 만료 없음
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("PGPT_LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_MAX_MB = float(os.getenv("PGPT_LLM_CACHE_MAX_MB", "200"))
+
+# 메시지 직렬화(kwargs)에서 실행마다 달라지는 필드
+_VOLATILE_KEYS = ("id", "response_metadata", "usage_metadata")
+_PENDING_LIMIT = 1024
+
+# 현재 작업(asyncio 컨텍스트)에서 아직 저장되지 않은 마지막 미스: {"cache", "prompt", "llm_string"}
+_pending: ContextVar[Optional[Dict[str, Any]]] = ContextVar("llm_cache_pending", default=None)
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """langchain dumps() 형식의 메시지 목록에서 실행별로 달라지는 값을 제거합니다."""
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+
+    tool_ids: Dict[str, str] = {}
+
+    def _collect(kwargs: Dict[str, Any]) -> None:
+        for call in kwargs.get("tool_calls") or []:
+            if isinstance(call, dict) and isinstance(call.get("id"), str):
+                tool_ids.setdefault(call["id"], f"tc{len(tool_ids)}")
+        for call in (kwargs.get("additional_kwargs") or {}).get("tool_calls") or []:
+            if isinstance(call, dict) and isinstance(call.get("id"), str):
+                tool_ids.setdefault(call["id"], f"tc{len(tool_ids)}")
+
+    def _rewrite(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {k: _rewrite(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [_rewrite(v) for v in value]
+        if isinstance(value, str):
+            return tool_ids.get(value, value)
+        return value
+
+    normalized = []
+    for msg in messages:
+        if isinstance(msg, dict) and isinstance(msg.get("kwargs"), dict):
+            kwargs = {k: v for k, v in msg["kwargs"].items() if k not in _VOLATILE_KEYS}
+            _collect(kwargs)
+            msg = {**msg, "kwargs": kwargs}
+        normalized.append(msg)
+    return json.dumps(_rewrite(normalized), sort_keys=True, ensure_ascii=False)
+
+
+class SQLiteResponseCache(BaseCache):
+    """LRU/TTL/용량 상한을 가진 SQLite 기반 LangChain 캐시."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        ttl: float = LLM_CACHE_TTL,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        max_bytes: int = int(LLM_CACHE_MAX_MB * 1024 * 1024),
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL, gen_ms REAL NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+        # 미스 시각 → update 때 생성 시간(ms)을 계산해 적중 시 아낀 시간으로 보고
+        self._misses_at: Dict[str, float] = {}
+        self._stats: Dict[str, float] = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "errors": 0,
+            "saved_ms_total": 0.0,
+        }
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(_normalize_prompt(prompt).encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(llm_string.encode("utf-8"))
+        return digest.hexdigest()
+
+    # ---------- BaseCache ----------
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        slot = _pending.get()
+        if slot is not None:
+            slot.clear()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, created_at, gen_ms FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and self.ttl > 0 and now - row[1] > self.ttl:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._stats["evictions"] += 1
+                    row = None
+                if row is not None:
+                    self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            if row is None:
+                self._stats["misses"] += 1
+                if len(self._misses_at) >= _PENDING_LIMIT:  # 오류로 update가 안 온 미스가 쌓이지 않게
+                    self._misses_at.clear()
+                self._misses_at[key] = time.monotonic()
+                if slot is not None:
+                    slot.update(cache=self, prompt=prompt, llm_string=llm_string)
+                return None
+            generations = loads(row[0], allowed_objects="all")
+        except Exception:
+            self._stats["errors"] += 1
+            return None
+        self._stats["hits"] += 1
+        self._stats["saved_ms_total"] += row[2]
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        slot = _pending.get()
+        if slot is not None and slot.get("prompt") == prompt and slot.get("llm_string") == llm_string:
+            slot.clear()  # 생성이 끝까지 돌아 langchain이 직접 저장함
+        started = self._misses_at.pop(key, None)
+        gen_ms = (time.monotonic() - started) * 1000 if started is not None else 0.0
+        now = time.time()
+        try:
+            value = dumps(list(return_val))
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at, gen_ms)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, value, len(value.encode("utf-8")), now, now, gen_ms),
+                )
+                self._evict(now)
+            self._stats["writes"] += 1
+        except Exception:
+            self._stats["errors"] += 1
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    # ---------- internals ----------
+    def _evict(self, now: float) -> None:
+        """만료 항목을 지운 뒤 항목 수/용량 상한을 넘으면 오래 안 쓴 것부터 지웁니다. (lock 보유 상태에서 호출)"""
+        removed = 0
+        if self.ttl > 0:
+            removed += self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,)).rowcount
+        count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        while (self.max_entries > 0 and count > self.max_entries) or (self.max_bytes > 0 and total > self.max_bytes):
+            row = self._conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at LIMIT 1").fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (row[0],))
+            count -= 1
+            total -= row[1]
+            removed += 1
+        self._stats["evictions"] += removed
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._stats["hits"] + self._stats["misses"]
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        return {
+            **self._stats,
+            "entries": count,
+            "bytes": total,
+            "hit_ratio": (self._stats["hits"] / lookups) if lookups else 0.0,
+        }
+
+
+@contextmanager
+def track_pending() -> Iterator[Dict[str, Any]]:
+    """이 컨텍스트(와 그 안에서 만든 태스크)의 캐시 미스 중 아직 저장되지 않은 마지막 것을 담는 슬롯."""
+    slot: Dict[str, Any] = {}
+    token = _pending.set(slot)
+    try:
+        yield slot
+    finally:
+        _pending.reset(token)
+
+
+async def write_pending(slot: Dict[str, Any], message: AIMessage) -> bool:
+    """스트림을 일찍 닫아 langchain이 저장하지 못한 응답을 마지막 미스의 키로 저장합니다."""
+    cache = slot.get("cache")
+    if cache is None:
+        return False
+    prompt, llm_string = slot["prompt"], slot["llm_string"]
+    slot.clear()
+    await cache.aupdate(prompt, llm_string, [ChatGeneration(message=message)])
+    return True
+
+
+_cache: Optional[SQLiteResponseCache] = None
+
+
+def response_cache_from_env() -> Optional[SQLiteResponseCache]:
+    """PGPT_LLM_CACHE가 설정돼 있으면 프로세스 공용 캐시를, 아니면 None을 돌려줍니다.
+
+    load_dotenv() 이후에 호출돼도 반영되도록 경로는 호출 시점에 다시 읽습니다.
+    """
+    global _cache
+    path = os.getenv("PGPT_LLM_CACHE", LLM_CACHE_PATH)
+    if _cache is None and path:
+        _cache = SQLiteResponseCache(path)
+    return _cache
@@ -0,0 +1,247 @@
+"""
+Prometheus 지표
+- 작업 폴링 횟수와 픽업 지연, _run_task 단계별(세션 기동/초기화, 툴 로드, LLM 호출, 툴 호출, JSON 추출, 이미지 인라인, 이벤트 전달) 지연 시간 히스토그램.
+- 각 컴포넌트의 stats() dict를 게이지로 노출하는 수집기. 모델/툴 이름별 항목은 지표 이름이 아닌 라벨로 붙입니다.
+- FastAPI 앱의 /metrics 엔드포인트는 render_metrics() 결과를 그대로 반환합니다.
+"""
+
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+PHASE_SECONDS = Histogram(
+    "react_phase_seconds",
+    "작업 단계별 소요 시간(초)",
+    ["phase", "activity"],
+    buckets=_BUCKETS,
+)
+LLM_CALL_SECONDS = Histogram(
+    "react_llm_call_seconds",
+    "LLM 호출 1회 소요 시간(초)",
+    ["activity", "model"],
+    buckets=_BUCKETS,
+)
+TOOL_CALL_SECONDS = Histogram(
+    "react_tool_call_seconds",
+    "툴 호출 1회 소요 시간(초)",
+    ["activity", "tool", "status"],
+    buckets=_BUCKETS,
+)
+TOOL_STEP_SECONDS = Histogram(
+    "react_tool_step_seconds",
+    "한 턴의 툴 호출들(동시 실행)이 모두 끝날 때까지의 벽시계 시간(초)",
+    ["activity"],
+    buckets=_BUCKETS,
+)
+CONTEXT_TOKENS_SAVED = Counter(
+    "react_context_tokens_saved_total",
+    "모델 호출 전 컨텍스트 압축으로 줄인 입력 토큰 수",
+)
+EVENT_DELIVERY_SECONDS = Histogram(
+    "react_event_delivery_seconds",
+    "이벤트 enqueue부터 SDK 큐 전달까지 걸린 시간(초)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+POLLS_TOTAL = Counter(
+    "react_polls_total",
+    "작업 폴링 횟수(결과별: claimed/empty/error)",
+    ["result"],
+)
+PICKUP_SECONDS = Histogram(
+    "react_pickup_seconds",
+    "작업 생성 시각부터 이 워커가 가져갈 때까지 걸린 시간(초)",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 300),
+)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+
+def observe_phase(phase: str, activity: Optional[str], seconds: float) -> None:
+    PHASE_SECONDS.labels(phase=phase, activity=activity or "").observe(seconds)
+
+
+@contextmanager
+def phase_timer(phase: str, activity: Optional[str] = None) -> Iterator[None]:
+    """블록 실행 시간을 react_phase_seconds{phase, activity}에 기록합니다(예외 시에도 기록)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_phase(phase, activity, time.perf_counter() - started)
+
+
+class MetricsCallback(BaseCallbackHandler):
+    """LLM/툴 호출 시간을 run_id 기준으로 측정해 히스토그램에 기록하는 콜백.
+
+    툴 단계(한 턴에 나온 툴 호출 묶음)의 벽시계 시간과 개별 툴 시간 합을 함께 집계해
+    동시 실행으로 절약된 시간을 step_stats()로 보고합니다.
+    """
+
+    run_inline = True  # 측정 오차를 줄이기 위해 스레드 풀을 거치지 않음
+
+    def __init__(self, activity: Optional[str] = None) -> None:
+        self.activity = activity or ""
+        self._llm: Dict[UUID, tuple[float, str]] = {}
+        self._tools: Dict[UUID, tuple[float, str]] = {}
+        self._step_started: Optional[float] = None
+        self._step_ended = 0.0
+        self._step_calls = 0
+        self._step_tool_s = 0.0
+        self._steps: Dict[str, float] = {
+            "steps": 0,
+            "parallel_steps": 0,
+            "tool_calls": 0,
+            "step_wall_ms_total": 0.0,
+            "tool_ms_total": 0.0,
+        }
+
+    # ---------- LLM ----------
+    def _llm_started(self, serialized: Any, run_id: UUID, kwargs: Dict[str, Any]) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or (serialized or {}).get("name") or "unknown"
+        self._llm[run_id] = (time.perf_counter(), str(model))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        self._llm_started(serialized, run_id, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs):
+        self._llm_started(serialized, run_id, kwargs)
+
+    def _llm_finished(self, run_id: UUID) -> None:
+        started = self._llm.pop(run_id, None)
+        if started is not None:
+            LLM_CALL_SECONDS.labels(activity=self.activity, model=started[1]).observe(time.perf_counter() - started[0])
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        self._llm_finished(run_id)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self._llm_finished(run_id)
+
+    # ---------- TOOL ----------
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, **kwargs):
+        name = (serialized or {}).get("name") if isinstance(serialized, dict) else None
+        now = time.perf_counter()
+        if self._step_started is None:
+            self._step_started = now
+        self._tools[run_id] = (now, name or kwargs.get("name") or "unknown")
+
+    def _tool_finished(self, run_id: UUID, status: str) -> None:
+        started = self._tools.pop(run_id, None)
+        if started is not None:
+            now = time.perf_counter()
+            TOOL_CALL_SECONDS.labels(activity=self.activity, tool=started[1], status=status).observe(now - started[0])
+            self._step_calls += 1
+            self._step_tool_s += now - started[0]
+            self._step_ended = now
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs):
+        self._tool_finished(run_id, "ok")
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs):
+        self._tool_finished(run_id, "error")
+
+    # ---------- 툴 단계 ----------
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, metadata=None, **kwargs):
+        # 다음 agent 노드가 시작되면 직전 툴 단계가 끝난 것
+        if (metadata or {}).get("langgraph_node") == "agent":
+            self.finish_step()
+
+    def finish_step(self) -> None:
+        if self._step_started is None or self._tools:
+            return
+        wall = max(0.0, self._step_ended - self._step_started)
+        TOOL_STEP_SECONDS.labels(activity=self.activity).observe(wall)
+        self._steps["steps"] += 1
+        self._steps["parallel_steps"] += 1 if self._step_calls > 1 else 0
+        self._steps["tool_calls"] += self._step_calls
+        self._steps["step_wall_ms_total"] += wall * 1000
+        self._steps["tool_ms_total"] += self._step_tool_s * 1000
+        self._step_started = None
+        self._step_calls = 0
+        self._step_tool_s = 0.0
+
+    def step_stats(self) -> Dict[str, float]:
+        """툴 단계 집계. saved_ms = 개별 툴 시간 합 - 단계 벽시계 시간."""
+        self.finish_step()
+        return {
+            **{k: round(v, 1) for k, v in self._steps.items()},
+            "saved_ms": round(self._steps["tool_ms_total"] - self._steps["step_wall_ms_total"], 1),
+        }
+
+
+# ---------- stats() → 게이지 ----------
+# 소스 이름 → (stats 함수, {항목별 dict 키: 라벨 이름})
+_stats_sources: Dict[str, Tuple[Callable[[], Dict[str, Any]], Dict[str, str]]] = {}
+_NAME_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+# 지표 이름 → (라벨 이름들, {라벨 값들: 값})
+_Samples = Dict[str, Tuple[Tuple[str, ...], Dict[Tuple[str, ...], float]]]
+
+
+def register_stats_source(name: str, fn: Callable[[], Dict[str, Any]], labelled: Optional[Dict[str, str]] = None) -> None:
+    """stats() 형태의 dict를 react_<name>_<key> 게이지로 노출하도록 등록합니다.
+
+    labelled의 키(예: "openai_rate_limits")는 모델/툴 이름별 dict로 보고, 그 이름을 지표 이름 대신
+    라벨(예: model="gpt-4o")로 붙여 지표 종류 수가 고정되게 합니다.
+    """
+    _stats_sources[name] = (fn, dict(labelled or {}))
+
+
+def _flatten(
+    prefix: str,
+    value: Any,
+    labelled: Dict[str, str],
+    out: _Samples,
+    labels: Tuple[Tuple[str, str], ...] = (),
+) -> None:
+    if isinstance(value, dict):
+        for k, v in value.items():
+            key = str(k)
+            name = f"{prefix}_{_NAME_INVALID.sub('_', key)}"
+            label = labelled.get(key)
+            if label is not None and isinstance(v, dict):
+                for entry, sub in v.items():
+                    _flatten(name, sub, labelled, out, labels + ((label, str(entry)),))
+            else:
+                _flatten(name, v, labelled, out, labels)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        names = tuple(n for n, _ in labels)
+        family = out.setdefault(prefix, (names, {}))
+        if family[0] == names:
+            family[1][tuple(v for _, v in labels)] = float(value)
+
+
+class _StatsCollector:
+    def collect(self):
+        samples: _Samples = {}
+        docs: Dict[str, str] = {}
+        for name, (fn, labelled) in list(_stats_sources.items()):
+            try:
+                stats = fn()
+            except Exception:
+                continue
+            before = set(samples)
+            _flatten(f"react_{name}", stats, labelled, samples)
+            docs.update({metric_name: f"{name} stats" for metric_name in set(samples) - before})
+        for metric_name, (label_names, values) in samples.items():
+            family = GaugeMetricFamily(metric_name, docs.get(metric_name, ""), labels=list(label_names))
+            for label_values, val in values.items():
+                family.add_metric(list(label_values), val)
+            yield family
+
+
+REGISTRY.register(_StatsCollector())
+
+
+def render_metrics() -> bytes:
+    return generate_latest(REGISTRY)
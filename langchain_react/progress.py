@@ -0,0 +1,118 @@
+"""
+에이전트 진행 상황 스트리밍
+- LLM이 생성 중인 텍스트를 모아 agent_progress 이벤트로 이벤트 큐에 보냅니다.
+- 이벤트 간 최소 간격(interval)과 이벤트당 최소/최대 글자 수로 발행 빈도를 제한합니다.
+- 한 LLM 턴이 끝나면 final 이벤트로 그 턴이 중간 추론(툴 호출 전)인지 최종 답변인지 알립니다.
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+
+STREAM_PROGRESS = os.getenv("PGPT_STREAM_PROGRESS", "1") != "0"
+PROGRESS_INTERVAL = float(os.getenv("PGPT_PROGRESS_INTERVAL_MS", "250")) / 1000
+PROGRESS_MIN_CHARS = int(os.getenv("PGPT_PROGRESS_MIN_CHARS", "16"))
+PROGRESS_MAX_CHARS = int(os.getenv("PGPT_PROGRESS_MAX_CHARS", "2000"))
+
+
+class ProgressStreamer:
+    """부분 텍스트를 버퍼링했다가 제한된 빈도로 agent_progress 이벤트를 발행합니다."""
+
+    def __init__(
+        self,
+        event_queue,
+        job_id: str,
+        todo_id: Optional[str] = None,
+        proc_inst_id: Optional[str] = None,
+        *,
+        interval: float = PROGRESS_INTERVAL,
+        min_chars: int = PROGRESS_MIN_CHARS,
+        max_chars: int = PROGRESS_MAX_CHARS,
+    ) -> None:
+        self.q = event_queue
+        self.job_id = job_id
+        self.todo_id = todo_id
+        self.proc_inst_id = proc_inst_id
+        self.interval = max(0.0, interval)
+        self.min_chars = max(1, min_chars)
+        self.max_chars = max(self.min_chars, max_chars)
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._message_id: Optional[str] = None
+        self._last_emit: Optional[float] = None
+        self._seq = 0
+        self.events = 0
+        self.chars = 0
+        self.first_output_at: Optional[float] = None
+        self._started = time.monotonic()
+
+    # ---------- producer ----------
+    def feed(self, text: str, message_id: Optional[str]) -> None:
+        if message_id != self._message_id:
+            self.end_turn(reasoning=False)
+            self._message_id = message_id
+        if not text:
+            return
+        self._buffer.append(text)
+        self._buffered += len(text)
+        now = time.monotonic()
+        if self._buffered >= self.max_chars:
+            self._flush(now)
+        elif self._buffered >= self.min_chars and (
+            self._last_emit is None or now - self._last_emit >= self.interval
+        ):
+            self._flush(now)
+
+    def end_turn(self, *, reasoning: bool) -> None:
+        """현재 턴의 남은 텍스트를 보내고 턴 종류(reasoning/answer)를 알립니다."""
+        if self._message_id is None:
+            return
+        now = time.monotonic()
+        self._flush(now)
+        self._emit({"message_id": self._message_id, "final": True, "kind": "reasoning" if reasoning else "answer"}, now)
+        self._message_id = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "chars": self.chars,
+            "first_output_ms": (
+                round((self.first_output_at - self._started) * 1000, 1) if self.first_output_at is not None else None
+            ),
+        }
+
+    # ---------- internals ----------
+    def _flush(self, now: float) -> None:
+        if not self._buffer:
+            return
+        delta = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered = 0
+        self.chars += len(delta)
+        if self.first_output_at is None:
+            self.first_output_at = now
+        self._emit({"message_id": self._message_id, "delta": delta, "final": False}, now)
+
+    def _emit(self, data: Dict[str, Any], now: float) -> None:
+        self._seq += 1
+        self._last_emit = now
+        self.events += 1
+        payload = {
+            "type": "event",
+            "data": {
+                "event_type": "agent_progress",
+                "job_id": self.job_id,
+                "crew_type": "react",
+                "data": {**data, "seq": self._seq},
+                "todo_id": self.todo_id,
+                "proc_inst_id": self.proc_inst_id,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        }
+        try:
+            self.q.enqueue_event(payload)
+        except Exception:
+            # 진행 이벤트 실패는 실행 흐름을 막지 않음
+            pass
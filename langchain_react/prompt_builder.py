@@ -0,0 +1,210 @@
+"""
+토큰 예산 기반 프롬프트 조립기
+- composite_query의 각 섹션(피드백/지시사항/이전결과물/form_type/form_html)을 로컬에서 토큰 수로 세고,
+  섹션별 예산을 넘으면 잘라내거나 압축합니다.
+- form_html은 마크업을 걷어내고 필드 구조(태그/이름/라벨/타입/선택지)만 남깁니다.
+- form_type은 잘라내지 않습니다. 예산을 넘으면 설명/선택지 등 부가 속성을 단계적으로 빼서
+  모든 폼 키가 유효한 JSON으로 남게 합니다(최종 출력 스키마가 이 키들을 요구하므로).
+- 섹션별 토큰 기여도를 돌려주어 작업마다 로그로 남길 수 있게 합니다.
+"""
+
+import json
+import os
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# 섹션별 토큰 예산 (환경 변수로 조정)
+SECTION_BUDGETS: Dict[str, int] = {
+    "feedback": int(os.getenv("PGPT_PROMPT_BUDGET_FEEDBACK", "1500")),
+    "activity": int(os.getenv("PGPT_PROMPT_BUDGET_ACTIVITY", "100")),
+    "description": int(os.getenv("PGPT_PROMPT_BUDGET_DESCRIPTION", "2000")),
+    "previous_result": int(os.getenv("PGPT_PROMPT_BUDGET_PREVIOUS", "2000")),
+    "form_types": int(os.getenv("PGPT_PROMPT_BUDGET_FORM_TYPES", "1500")),  # 넘으면 속성만 줄이고 자르지 않음
+    "form_html": int(os.getenv("PGPT_PROMPT_BUDGET_FORM_HTML", "1000")),
+}
+
+TRUNCATION_MARK = "\n…(이하 생략)"
+
+# form_html에서 필드 구조로 남길 속성
+_FIELD_ATTRS = ("name", "alias", "label", "type", "items", "options", "placeholder", "is_multiple", "disabled")
+
+# form_type 필드 압축 단계별로 남길 속성 (form_schema가 읽는 키/타입/라벨/필수 표시)
+_FORM_TYPE_KEEP: Tuple[Tuple[str, ...], ...] = (
+    ("key", "name", "id", "type", "text", "alias", "required", "is_required"),
+    ("key", "name", "id", "type", "required", "is_required"),
+)
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """tiktoken 인코딩을 한 번만 로드합니다(설치/다운로드 불가 시 None)."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = None
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """로컬 토큰 수 계산. tiktoken이 없으면 UTF-8 바이트 기준 근사치를 씁니다."""
+    if not text:
+        return 0
+    enc = _get_encoding()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """앞부분을 유지하고 예산을 넘는 뒷부분을 잘라냅니다."""
+    tokens = count_tokens(text)
+    if budget <= 0 or tokens <= budget:
+        return text
+    enc = _get_encoding()
+    if enc is not None:
+        return enc.decode(enc.encode(text, disallowed_special=())[:budget]) + TRUNCATION_MARK
+    # 근사 모드: 비율로 자른 뒤 예산 안에 들 때까지 줄임
+    cut = int(len(text) * budget / tokens)
+    while cut > 0 and count_tokens(text[:cut]) > budget:
+        cut = int(cut * 0.9)
+    return text[:cut] + TRUNCATION_MARK
+
+
+class _FieldStructureParser(HTMLParser):
+    """name 속성이 있는 폼 요소만 골라 한 줄 요약으로 모읍니다."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.fields: List[str] = []
+        self.texts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attr_map = {k: v for k, v in attrs if v is not None}
+        if "name" not in attr_map:
+            return
+        parts = [f"{k}={attr_map[k]}" for k in _FIELD_ATTRS if k in attr_map]
+        self.fields.append(f"- {tag} " + " ".join(parts))
+
+    def handle_data(self, data):
+        data = data.strip()
+        if data:
+            self.texts.append(data)
+
+
+def compress_form_html(form_html: Any) -> str:
+    """form_html을 필드 구조 목록으로 압축합니다. 필드가 없으면 텍스트만 남깁니다."""
+    html = form_html if isinstance(form_html, str) else _to_json_str(form_html)
+    parser = _FieldStructureParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        return html
+    if parser.fields:
+        return "\n".join(parser.fields)
+    return " ".join(parser.texts) or html
+
+
+def compress_form_types(form_types: Any, budget: int) -> str:
+    """form_types를 compact JSON으로 만들되, 예산을 넘으면 필드의 부가 속성부터 뺍니다.
+
+    텍스트를 자르지 않으므로 폼 키는 항상 모두 남고, 마지막 단계도 넘치면 그대로 씁니다.
+    """
+    text = _to_json_str(form_types, compact=True)
+    if budget <= 0 or count_tokens(text) <= budget:
+        return text
+
+    def _strip(spec: Any, keep: Tuple[str, ...]) -> Any:
+        return {k: v for k, v in spec.items() if k in keep} if isinstance(spec, dict) else spec
+
+    for keep in _FORM_TYPE_KEEP:
+        if isinstance(form_types, dict):
+            reduced: Any = {key: _strip(spec, keep) for key, spec in form_types.items()}
+        elif isinstance(form_types, list):
+            reduced = [_strip(spec, keep) for spec in form_types]
+        else:
+            return text
+        text = _to_json_str(reduced, compact=True)
+        if count_tokens(text) <= budget:
+            break
+    return text
+
+
+def _to_json_str(obj: Any, compact: bool = False) -> str:
+    try:
+        if compact:
+            return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        return json.dumps(obj, ensure_ascii=False)
+    except Exception:
+        return str(obj) if obj is not None else ""
+
+
+def _text(val: Any) -> str:
+    return (val or "").strip() if isinstance(val, str) or val is None else str(val).strip()
+
+
+def build_composite_query(
+    *,
+    feedback_summary: Any = None,
+    activity_name: Any = None,
+    description: Any = None,
+    previous_result: Any = None,
+    form_types: Any = None,
+    form_html: Any = None,
+    work_dir: Optional[str] = None,
+    budgets: Optional[Dict[str, int]] = None,
+) -> Tuple[str, Dict[str, int]]:
+    """작업 프롬프트를 조립하고 (프롬프트, 섹션별 토큰 수)를 돌려줍니다.
+
+    값이 없는 섹션(이전결과물/피드백 등)은 생략합니다.
+    """
+    limits = {**SECTION_BUDGETS, **(budgets or {})}
+    report: Dict[str, int] = {}
+
+    def _sec(key: str, title: str, body: str, truncate: bool = True) -> str:
+        if not body:
+            return ""
+        if truncate:
+            body = truncate_to_tokens(body, limits.get(key, 0))
+        text = f"[{title}]\n{body}\n\n"
+        report[key] = count_tokens(text)
+        return text
+
+    form_types_text = compress_form_types(form_types, limits.get("form_types", 0)) if form_types else ""
+    form_html_text = compress_form_html(form_html) if form_html else ""
+
+    header = "다음 입력을 바탕으로 작업을 수행하세요. 최종 출력은 반드시 JSON 하나만 반환하세요(코드블록/설명 금지).\n\n"
+    instructions = (
+        "[결과형식 요구]\n"
+        + "- 피드백 내용이 제공된 경우, 피드백을 최우선 기준으로 반영하세요.\n"
+        + "- 결과는 form_type의 폼 키에 맞는 JSON 객체여야 합니다. (폼키: 값)\n"
+        + "- 각 폼키의 타입(수치/문자/배열/객체 등)을 준수하세요.\n"
+        + "- form_html은 form_type을 해석하는 힌트입니다. 구조(예: items 배열 등)를 파악해 값 형식을 맞추세요.\n"
+        + "- 추가 설명 문장 없이 JSON만 반환하세요.\n\n"
+        + "[출력 JSON 예시]\n"
+        + "{\n  \"폼키예시_숫자\": 123,\n  \"폼키예시_문자\": \"텍스트\",\n}\n\n"
+        + "주의: 위 예시는 형식 안내용으로, 최종 출력에서는 form_type에 정의된 실제 폼 키만 포함하고, 각 키의 타입과 이름에 맞는 값을 반환하세요. 추가 텍스트/설명/코드블록 없이 JSON만 반환하세요.\n"
+    )
+
+    query = (
+        header
+        # 피드백이 있으면 최우선으로 반영하도록 최상단에 배치
+        + _sec("feedback", "피드백 내용", _text(feedback_summary))
+        + _sec("activity", "워크아이템 이름", _text(activity_name))
+        + _sec("description", "지시사항", _text(description))
+        + _sec("previous_result", "이전결과물", _text(previous_result))
+        + _sec("form_types", "form_type", form_types_text, truncate=False)
+        + _sec("form_html", "form_html", form_html_text)
+        + _sec("work_dir", "작업 폴더", f"이번 작업에서 만드는 파일(이미지 등)은 이 폴더 아래에 저장하세요: {work_dir}" if work_dir else "")
+        + instructions
+    )
+    report["instructions"] = count_tokens(header) + count_tokens(instructions)
+    report["total"] = sum(report.values())
+    return query, report
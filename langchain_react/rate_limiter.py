@@ -0,0 +1,337 @@
+"""
+OpenAI 호출 공용 레이트 리미터 (httpx 트랜스포트 계층)
+- 모델별로 분당 요청 수(RPM)·분당 토큰 수(TPM) 토큰 버킷을 두고, 채팅(비동기)과 이미지(동기) 클라이언트가
+  같은 버킷을 공유합니다. 요청 본문의 "model" 값으로 버킷을 고르고, 토큰은 본문 크기와 max_tokens로 추정합니다.
+  PGPT_OPENAI_LIMITS="*=3500/300000,gpt-image-1=50" 형식 (모델=RPM/TPM, *는 기본값, 0 또는 생략은 무제한).
+- 응답의 x-ratelimit-* 헤더로 실제 한도/잔량을 받아 버킷을 맞춥니다.
+- 429는 Retry-After(또는 retry-after-ms)를 존중해 지터를 더한 지수 백오프로 재시도하고,
+  그동안 같은 모델의 다른 요청도 함께 멈춰 재시도 폭주를 막습니다.
+  5xx와 연결 오류도 같은 백오프로 재시도합니다(다른 요청은 멈추지 않음).
+- 재시도는 여기서 하므로 이 트랜스포트를 쓰는 OpenAI 클라이언트는 max_retries=0으로 만듭니다.
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import httpx
+
+
+OPENAI_LIMITS_SPEC = os.getenv("PGPT_OPENAI_LIMITS", "*=3500/300000,gpt-image-1=50")
+# 버킷 용량(초 단위 분량). 분당 한도를 한 번에 몰아 쓰지 않게 폭주 크기를 제한
+OPENAI_BURST_SECONDS = float(os.getenv("PGPT_OPENAI_BURST_S", "10"))
+OPENAI_MAX_RETRIES = int(os.getenv("PGPT_OPENAI_MAX_RETRIES", "5"))
+OPENAI_BACKOFF_BASE = float(os.getenv("PGPT_OPENAI_BACKOFF_BASE", "0.5"))
+OPENAI_BACKOFF_MAX = float(os.getenv("PGPT_OPENAI_BACKOFF_MAX", "60"))
+OPENAI_BACKOFF_JITTER = float(os.getenv("PGPT_OPENAI_BACKOFF_JITTER", "0.25"))
+
+_RETRY_STATUS = (429, 500, 502, 503, 504)
+_WINDOW_SECONDS = 60.0
+# max_tokens가 없을 때 응답 몫으로 잡는 토큰 수
+_DEFAULT_COMPLETION_TOKENS = 512
+
+
+def parse_model_limits(spec: str) -> Dict[str, Tuple[int, int]]:
+    limits: Dict[str, Tuple[int, int]] = {}
+    for part in (spec or "").split(","):
+        name, sep, value = part.partition("=")
+        if not sep:
+            continue
+        rpm, _, tpm = value.partition("/")
+        try:
+            limits[name.strip()] = (int(rpm or 0), int(tpm or 0))
+        except ValueError:
+            continue
+    return limits
+
+
+def _request_cost(request: httpx.Request) -> Tuple[str, int]:
+    """요청 본문에서 (모델명, 추정 토큰 수)를 구합니다. JSON이 아니면 ("*", 0)."""
+    content = request.content
+    try:
+        body = json.loads(content) if content else {}
+    except ValueError:
+        return "*", 0
+    if not isinstance(body, dict):
+        return "*", 0
+    model = str(body.get("model") or "*")
+    if "messages" not in body and "input" not in body:
+        return model, 0  # 이미지 등 토큰 과금이 아닌 요청은 RPM만 적용
+    completion = body.get("max_completion_tokens") or body.get("max_tokens") or _DEFAULT_COMPLETION_TOKENS
+    return model, len(content) // 4 + int(completion)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After(초 또는 HTTP 날짜)/retry-after-ms 헤더를 초 단위로 돌려줍니다."""
+    value = response.headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    """분당 한도를 가진 토큰 버킷. 순간 폭주는 BURST_SECONDS 분량까지만 허용합니다. limit가 0이면 무제한."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = 0
+        self.capacity = 0.0
+        self._set_limit(limit)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _set_limit(self, limit: int) -> None:
+        self.limit = limit
+        self.capacity = max(1.0, limit * OPENAI_BURST_SECONDS / _WINDOW_SECONDS) if limit > 0 else 0.0
+
+    def refill(self, now: float) -> None:
+        if self.limit > 0:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.limit / _WINDOW_SECONDS)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        if self.limit <= 0 or amount <= 0:
+            return 0.0
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) * _WINDOW_SECONDS / self.limit)
+
+    def take(self, amount: float) -> None:
+        if self.limit > 0:
+            self.level -= min(amount, self.capacity)
+
+    def sync(self, limit: Optional[int], remaining: Optional[int]) -> None:
+        """서버가 알려준 한도/잔량으로 보정합니다. 잔량은 더 적을 때만 반영."""
+        if limit and limit != self.limit:
+            ratio = self.level / self.capacity if self.capacity else 1.0
+            self._set_limit(limit)
+            self.level = self.capacity * ratio
+        if remaining is not None and self.limit > 0 and remaining < self.level:
+            self.level = float(remaining)
+
+
+class _ModelState:
+    def __init__(self, rpm: int, tpm: int) -> None:
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm)
+        self.paused_until = 0.0
+        self.window: Deque[Tuple[float, int]] = deque()
+        self.stats: Dict[str, float] = {
+            "requests": 0,
+            "tokens_estimated": 0,
+            "throttled": 0,
+            "retries": 0,
+            "waits": 0,
+            "wait_ms_total": 0.0,
+        }
+
+
+class OpenAIRateLimiter:
+    """모델별 RPM/TPM 버킷. 스레드(동기 이미지 클라이언트)와 이벤트 루프 양쪽에서 씁니다."""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, int]]] = None) -> None:
+        self.limits = dict(limits if limits is not None else parse_model_limits(OPENAI_LIMITS_SPEC))
+        self._default = self.limits.pop("*", (0, 0))
+        self._models: Dict[str, _ModelState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, model: str) -> _ModelState:
+        state = self._models.get(model)
+        if state is None:
+            state = self._models[model] = _ModelState(*self.limits.get(model, self._default))
+        return state
+
+    def reserve(self, model: str, tokens: int) -> float:
+        """여유가 있으면 차감하고 0을, 없으면 기다려야 할 시간(초)을 돌려줍니다."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(model)
+            state.requests.refill(now)
+            state.tokens.refill(now)
+            wait = max(state.paused_until - now, state.requests.wait_for(1), state.tokens.wait_for(tokens))
+            if wait > 0:
+                return wait
+            state.requests.take(1)
+            state.tokens.take(tokens)
+            state.window.append((now, tokens))
+            state.stats["requests"] += 1
+            state.stats["tokens_estimated"] += tokens
+            return 0.0
+
+    def record_wait(self, model: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._state(model).stats
+            stats["waits"] += 1
+            stats["wait_ms_total"] += seconds * 1000
+
+    def observe(self, model: str, response: httpx.Response) -> None:
+        """x-ratelimit-* 헤더로 버킷을 보정합니다."""
+        headers = response.headers
+
+        def _int(name: str) -> Optional[int]:
+            try:
+                return int(headers[name])
+            except (KeyError, ValueError):
+                return None
+
+        with self._lock:
+            state = self._state(model)
+            state.requests.sync(_int("x-ratelimit-limit-requests"), _int("x-ratelimit-remaining-requests"))
+            state.tokens.sync(_int("x-ratelimit-limit-tokens"), _int("x-ratelimit-remaining-tokens"))
+
+    def backoff(self, model: str, attempt: int, response: Optional[httpx.Response]) -> float:
+        """재시도 전 대기 시간(초). 429면 같은 모델의 다른 요청도 그때까지 멈춥니다."""
+        delay = min(OPENAI_BACKOFF_MAX, OPENAI_BACKOFF_BASE * (2 ** attempt))
+        retry_after = _retry_after(response) if response is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, OPENAI_BACKOFF_MAX))
+        delay *= 1 + random.uniform(0, OPENAI_BACKOFF_JITTER)
+        with self._lock:
+            state = self._state(model)
+            state.stats["retries"] += 1
+            if response is not None and response.status_code == 429:
+                state.paused_until = max(state.paused_until, time.monotonic() + delay)
+                state.stats["throttled"] += 1
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        result: Dict[str, Any] = {}
+        with self._lock:
+            for model, state in self._models.items():
+                while state.window and now - state.window[0][0] > _WINDOW_SECONDS:
+                    state.window.popleft()
+                rpm = len(state.window)
+                tpm = sum(t for _, t in state.window)
+                result[model] = {
+                    **state.stats,
+                    "rpm_limit": state.requests.limit,
+                    "tpm_limit": state.tokens.limit,
+                    "rpm_current": rpm,
+                    "tpm_current": tpm,
+                    "rpm_utilization": rpm / state.requests.limit if state.requests.limit else 0.0,
+                    "tpm_utilization": tpm / state.tokens.limit if state.tokens.limit else 0.0,
+                    "paused_s": max(0.0, state.paused_until - now),
+                }
+        return result
+
+
+class RateLimitedAsyncTransport(httpx.AsyncBaseTransport):
+    """비동기 트랜스포트 래퍼: 버킷 대기 → 전송 → 429/5xx/연결 오류면 백오프 후 재시도."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, limiter: "OpenAIRateLimiter") -> None:
+        self._inner = inner
+        self._limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        model, tokens = _request_cost(request)
+        attempt = 0
+        while True:
+            waited = 0.0
+            while (wait := self._limiter.reserve(model, tokens)) > 0:
+                waited += wait
+                await asyncio.sleep(wait)
+            if waited:
+                self._limiter.record_wait(model, waited)
+            try:
+                response = await self._inner.handle_async_request(request)
+            except httpx.TransportError:
+                if attempt >= OPENAI_MAX_RETRIES:
+                    raise
+                response = None
+            if response is not None:
+                self._limiter.observe(model, response)
+                if response.status_code not in _RETRY_STATUS or attempt >= OPENAI_MAX_RETRIES:
+                    return response
+                await response.aread()
+                await response.aclose()
+            delay = self._limiter.backoff(model, attempt, response)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """동기 트랜스포트 래퍼 (이미지 생성처럼 스레드에서 도는 openai.OpenAI 클라이언트용)."""
+
+    def __init__(self, inner: httpx.BaseTransport, limiter: "OpenAIRateLimiter") -> None:
+        self._inner = inner
+        self._limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        model, tokens = _request_cost(request)
+        attempt = 0
+        while True:
+            waited = 0.0
+            while (wait := self._limiter.reserve(model, tokens)) > 0:
+                waited += wait
+                time.sleep(wait)
+            if waited:
+                self._limiter.record_wait(model, waited)
+            try:
+                response = self._inner.handle_request(request)
+            except httpx.TransportError:
+                if attempt >= OPENAI_MAX_RETRIES:
+                    raise
+                response = None
+            if response is not None:
+                self._limiter.observe(model, response)
+                if response.status_code not in _RETRY_STATUS or attempt >= OPENAI_MAX_RETRIES:
+                    return response
+                response.read()
+                response.close()
+            delay = self._limiter.backoff(model, attempt, response)
+            attempt += 1
+            time.sleep(delay)
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+_limiter: Optional[OpenAIRateLimiter] = None
+_sync_client: Optional[httpx.Client] = None
+
+
+def get_rate_limiter() -> OpenAIRateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = OpenAIRateLimiter()
+    return _limiter
+
+
+def rate_limited_async_client(*, limits: Optional[httpx.Limits] = None, timeout: float = 600) -> httpx.AsyncClient:
+    """공용 리미터를 거치는 비동기 HTTP 클라이언트 (ChatOpenAI http_async_client용)."""
+    inner = httpx.AsyncHTTPTransport(limits=limits or httpx.Limits())
+    return httpx.AsyncClient(transport=RateLimitedAsyncTransport(inner, get_rate_limiter()), timeout=timeout)
+
+
+def rate_limited_client() -> httpx.Client:
+    """공용 리미터를 거치는 프로세스 공용 동기 HTTP 클라이언트 (openai.OpenAI http_client용)."""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        _sync_client = httpx.Client(
+            transport=RateLimitedTransport(httpx.HTTPTransport(), get_rate_limiter()),
+            timeout=600,
+        )
+    return _sync_client
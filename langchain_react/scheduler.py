@@ -0,0 +1,107 @@
+"""
+공정 동시 실행 스케줄러
+- 동시에 실행되는 작업 수를 limit으로 제한합니다(세마포어 방식).
+- 슬롯이 모자라면 proc_inst_id별 대기열을 라운드로빈으로 돌며 슬롯을 넘겨,
+  한 프로세스 인스턴스의 todo가 몰려도 다른 인스턴스가 굶지 않게 합니다.
+- 대기열 깊이와 대기 시간을 stats()로 보고합니다.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+
+class FairScheduler:
+    """키(proc_inst_id)별 라운드로빈으로 슬롯을 배분하는 세마포어."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, limit)
+        self._active = 0
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._stats: Dict[str, float] = {
+            "granted": 0,
+            "queued": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self._waiters.values())
+
+    @asynccontextmanager
+    async def slot(self, key: Optional[str] = None) -> AsyncIterator[float]:
+        """슬롯을 얻을 때까지 기다린 뒤 대기 시간(ms)을 돌려줍니다."""
+        started = time.monotonic()
+        await self._acquire(str(key or ""))
+        wait_ms = (time.monotonic() - started) * 1000
+        self._stats["granted"] += 1
+        self._stats["wait_ms_total"] += wait_ms
+        self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], wait_ms)
+        try:
+            yield wait_ms
+        finally:
+            self._release()
+
+    async def _acquire(self, key: str) -> None:
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            return
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(fut)
+        self._stats["queued"] += 1
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # 슬롯을 넘겨받은 직후 취소됨 → 다음 대기자에게 양보
+                self._release()
+            else:
+                self._drop(key, fut)
+            raise
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._grant_next()
+
+    def _grant_next(self) -> None:
+        while self._active < self.limit and self._waiters:
+            key, queue = next(iter(self._waiters.items()))
+            fut = queue.popleft()
+            if queue:
+                self._waiters.move_to_end(key)  # 다음 차례는 다른 키
+            else:
+                del self._waiters[key]
+            if fut.done():
+                continue
+            self._active += 1
+            fut.set_result(None)
+
+    def _drop(self, key: str, fut: asyncio.Future) -> None:
+        queue = self._waiters.get(key)
+        if queue is None:
+            return
+        try:
+            queue.remove(fut)
+        except ValueError:
+            pass
+        if not queue:
+            del self._waiters[key]
+
+    def stats(self) -> Dict[str, Any]:
+        granted = self._stats["granted"]
+        return {
+            **self._stats,
+            "limit": self.limit,
+            "active": self._active,
+            "queue_depth": self.queue_depth,
+            "queued_keys": len(self._waiters),
+            "wait_ms_avg": (self._stats["wait_ms_total"] / granted) if granted else 0.0,
+        }
@@ -8,38 +8,126 @@ import asyncio
 import json
 import io
 import sys
-import re
 import os
+import time
 import uuid
 from datetime import datetime, timezone
-import base64
-import mimetypes
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+if __name__ == "__main__":
+    # python -m langchain_react.server: 아래 모듈들이 import 시점에 PGPT_* 설정을 읽으므로 먼저 .env 로드
+    load_dotenv()
 
-from processgpt_agent_sdk.server import ProcessGPTAgentServer
 from processgpt_agent_sdk.utils.logger import (
     write_log_message,
     handle_application_error,
 )
-from mcp import ClientSession, StdioServerParameters, stdio_client
+from mcp import StdioServerParameters
 from .tool_loader import load_all_tools
 from .agent import run_react_agent
-
-
+from .agent_factory import get_agent_factory
+from .checkpoints import get_checkpoint_store
+from .llm_cache import response_cache_from_env
+from .rate_limiter import get_rate_limiter
+from .tool_limits import get_tool_limiter
+from .session_pool import MCPSessionPool
+from .tool_registry import ToolRegistry
+from .scheduler import FairScheduler
+from .agent_server import ConcurrentAgentServer
+from .workspace import WorkspaceTracker, remove_task_dir, task_dir
+from .json_stream import extract_json
+from .prompt_builder import build_composite_query
+from .form_schema import FormSchemaCache
+from .event_pipeline import EventPipeline, pipeline_stats
+from .metrics import observe_phase, phase_timer, register_stats_source
+
+
+# 고정 폴링 간격(초). 적응형 폴링(PGPT_ADAPTIVE_POLLING=1, 기본)에서는 PGPT_POLL_MIN/MAX_INTERVAL을 씁니다.
 DEFAULT_POLLING_INTERVAL = 5
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("PGPT_MAX_CONCURRENCY", "4"))
+# 슬롯이 빌 때를 대비해 미리 가져와 대기시킬 작업 수
+DEFAULT_PREFETCH = int(os.getenv("PGPT_PREFETCH", "1"))
+# 취소 요청 후 실행 태스크가 정리될 때까지 기다리는 최대 시간(초)
+CANCEL_TIMEOUT = float(os.getenv("PGPT_CANCEL_TIMEOUT", "10"))
+
+
+def code_interpreter_work_dir() -> str:
+    return os.getenv("PGPT_WORK_DIR", "C:/uEngine/temp")
+
+
+def build_code_interpreter_params() -> StdioServerParameters:
+    """환경 변수로 mcp-python-code-interpreter 실행 파라미터를 구성합니다."""
+    work_dir = code_interpreter_work_dir()
+    python_path = os.getenv("PGPT_PYTHON_PATH", os.getenv("PYTHON", "python"))
+    return StdioServerParameters(
+        command="uvx",
+        args=[
+            "mcp-python-code-interpreter",
+            "--dir",
+            work_dir,
+            "--python-path",
+            python_path
+        ],
+        env={
+            "MCP_ALLOW_SYSTEM_ACCESS": "0",
+            "PYTHONIOENCODING": os.getenv("PYTHONIOENCODING", "utf-8")
+        }
+    )
 
 
 class MCPActionExecutor:
     """ProcessGPT 서버용 Executor (동일 프로세스 실행)."""
 
-    def __init__(self) -> None:
-        self._running: bool = False
+    def __init__(
+        self,
+        session_pool: Optional[MCPSessionPool] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        model_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self._scheduler = FairScheduler(self.max_concurrency)
+        # todo_id → (실행 태스크, 입력, 이벤트 파이프라인) : cancel()에서 중단 대상 식별
+        self._running: Dict[str, tuple[asyncio.Task, Dict[str, Any], EventPipeline]] = {}
+        self._tools = ToolRegistry()
+        self._schemas = FormSchemaCache()
+        # 작업마다 채팅 모델을 만드는 함수 (None이면 기본 ChatOpenAI)
+        self._model_factory = model_factory
+        self._pool = session_pool or MCPSessionPool(
+            build_code_interpreter_params(),
+            size=int(os.getenv("PGPT_MCP_POOL_SIZE") or self.max_concurrency),
+            message_handler=self._tools.message_handler,
+        )
+
+    async def start(self) -> None:
+        """MCP 세션 풀을 미리 데워 첫 작업의 기동 비용을 없앱니다."""
+        await self._pool.start()
+
+    async def close(self) -> None:
+        await self._pool.close()
+        await get_agent_factory().aclose()
+        if (store := get_checkpoint_store()) is not None:
+            await store.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scheduler": self._scheduler.stats(),
+            "mcp_pool": self._pool.stats(),
+            "tool_registry": self._tools.stats(),
+            "form_schema": self._schemas.stats(),
+            "agent_factory": get_agent_factory().stats(),
+            "tool_limits": get_tool_limiter().stats(),
+            "llm_cache": cache.stats() if (cache := response_cache_from_env()) else {},
+            "openai_rate_limits": get_rate_limiter().stats(),
+            "checkpoints": store.stats() if (store := get_checkpoint_store()) else {},
+            "events": pipeline_stats(),
+        }
 
     async def execute(self, context, event_queue) -> None:
         """컨텍스트에서 입력을 모아 작업을 실행하고 이벤트를 발행합니다."""
+        events: Optional[EventPipeline] = None
         try:
-            self._running = True
-
             user_message: str = (getattr(context, "get_user_input", lambda: "")() or "").strip()
             context_data: Dict[str, Any] = getattr(context, "get_context_data", lambda: {})() or {}
 
@@ -61,10 +149,28 @@ class MCPActionExecutor:
                 "output_summary": context_data.get("output_summary", ""),
                 "feedback_summary": context_data.get("feedback_summary", ""),
                 "human_users": context_data.get("human_users"),
+                "job_id": str(uuid.uuid4()),
             }
 
-            # 실제 실행 로직 호출 (main.py 흐름 재사용)
-            await self._run_task(inputs, event_queue)
+            # 이벤트는 버퍼 파이프라인을 거쳐 배치로 SDK 큐에 전달
+            events = EventPipeline(event_queue).start()
+
+            # 슬롯 대기 + 실행을 하나의 태스크로 추적해 cancel()이 중단할 수 있게 함
+            todo_key = str(inputs.get("todo_id"))
+            task = asyncio.create_task(self._run_with_slot(inputs, events))
+            self._running[todo_key] = (task, inputs, events)
+            try:
+                await task
+            except asyncio.CancelledError:
+                if not task.done():
+                    # SDK가 execute 자체를 취소한 경우: 내부 실행도 함께 중단
+                    task.cancel()
+                    raise
+                write_log_message(f"[mcp-action] cancelled todo_id={todo_key}")
+                return
+            finally:
+                if self._running.get(todo_key, (None,))[0] is task:
+                    del self._running[todo_key]
 
             # 완료 이벤트 발행
             done_payload = {
@@ -79,16 +185,75 @@ class MCPActionExecutor:
                     "timestamp": datetime.now(timezone.utc).isoformat(),
                 },
             }
-            event_queue.enqueue_event(done_payload)
+            events.enqueue_event(done_payload)
 
         except Exception as e:
             handle_application_error("Executor 실행 오류", e, raise_error=True)
         finally:
-            self._running = False
+            if events is not None:
+                events.close()
+                ev_stats = pipeline_stats()
+                write_log_message(
+                    f"[events] todo_id={context_data.get('task_id')} dropped={events.dropped} "
+                    f"delivered_total={ev_stats['delivered']} latency_avg_ms={ev_stats['latency_ms_avg']:.1f}"
+                )
 
     async def cancel(self, context, event_queue) -> None:
-        """취소 요청: 중단 없음 가정, 로그만 남김."""
-        write_log_message("[mcp-action] cancel requested - no-op (no interruption)")
+        """취소 요청: 실행 중인 ReAct 실행을 중단하고 슬롯/MCP 세션을 반환합니다.
+
+        실행 태스크를 cancel하면 LangGraph 실행(LLM 호출/툴 호출)이 중단되고,
+        예외로 끝난 임대 세션은 풀에서 폐기되어 서브프로세스가 종료됩니다.
+        """
+        context_data: Dict[str, Any] = getattr(context, "get_context_data", lambda: {})() or {}
+        todo_key = str(context_data.get("task_id"))
+        running = self._running.get(todo_key)
+        if running is None:
+            write_log_message(f"[mcp-action] cancel requested - no running task todo_id={todo_key}")
+            return
+
+        task, inputs, events = running
+        started = time.monotonic()
+        task.cancel()
+        done, _ = await asyncio.wait({task}, timeout=CANCEL_TIMEOUT)
+        freed_ms = (time.monotonic() - started) * 1000
+        if not done:
+            write_log_message(f"[mcp-action] cancel timeout todo_id={todo_key} waited_ms={freed_ms:.0f}")
+
+        todo_id = inputs.get("todo_id")
+        proc_inst_id = inputs.get("proc_inst_id")
+        # 실행 중 버퍼링된 이벤트 뒤에 오도록 같은 파이프라인으로 발행(종료됐으면 즉시 전달)
+        events.enqueue_event({
+            "type": "event",
+            "data": {
+                "event_type": "task_cancelled",
+                "data": {"freed": bool(done), "freed_ms": round(freed_ms, 1)},
+                "job_id": inputs.get("job_id"),
+                "crew_type": "react",
+                "todo_id": str(todo_id) if todo_id is not None else None,
+                "proc_inst_id": str(proc_inst_id) if proc_inst_id is not None else None,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+        })
+        write_log_message(f"[mcp-action] cancel done todo_id={todo_key} freed_ms={freed_ms:.1f}")
+
+    async def _run_with_slot(self, inputs: Dict[str, Any], event_queue) -> None:
+        """동시 실행 슬롯을 확보한 뒤 작업을 실행합니다(proc_inst_id별 라운드로빈)."""
+        async with self._scheduler.slot(inputs.get("proc_inst_id")) as wait_ms:
+            sched = self._scheduler.stats()
+            write_log_message(
+                f"[mcp-action] slot acquired todo_id={inputs.get('todo_id')} wait_ms={wait_ms:.1f} "
+                f"active={sched['active']}/{sched['limit']} queue_depth={sched['queue_depth']}"
+            )
+            observe_phase("slot_wait", inputs.get("current_activity_name"), wait_ms / 1000)
+            # 실제 실행 로직 호출 (main.py 흐름 재사용)
+            todo_id = inputs.get("todo_id")
+            try:
+                with phase_timer("task_total", inputs.get("current_activity_name")):
+                    await self._run_task(inputs, event_queue)
+            finally:
+                # 완료/실패/취소 모두 작업 전용 폴더 정리(_run_task와 같은 키)
+                key = todo_id if todo_id is not None else inputs.get("job_id")
+                await asyncio.shield(asyncio.to_thread(remove_task_dir, code_interpreter_work_dir(), key))
 
     async def _run_task(self, inputs: Dict[str, Any], event_queue) -> None:
         """ReAct 클라이언트 흐름을 그대로 재사용하여 실행."""
@@ -103,7 +268,7 @@ class MCPActionExecutor:
         form_types = inputs.get("form_types")
 
         # 작업 시작 이벤트 저장
-        job_id = str(uuid.uuid4())
+        job_id = inputs.get("job_id") or str(uuid.uuid4())
         event_queue.enqueue_event({
             "type": "event",
             "data": {
@@ -125,64 +290,46 @@ class MCPActionExecutor:
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
         })
-        # 이 실행에서 생성된 파일만 식별하기 위한 기준 시간
-        start_ts = datetime.now(timezone.utc).timestamp()
+        # 이 실행에서 생성된 파일만 식별하기 위한 작업 전용 폴더 스냅샷(동시 실행 작업과 분리)
+        work_dir = code_interpreter_work_dir()
+        own_dir = await asyncio.to_thread(task_dir, work_dir, todo_id if todo_id is not None else job_id)
+        workspace = WorkspaceTracker(own_dir, base_dir=work_dir)
+        with phase_timer("workspace_scan", activity_name):
+            await asyncio.to_thread(workspace.start)
 
         raw_result: Dict[str, Any] = {}
-
-        work_dir = os.getenv("PGPT_WORK_DIR", "C:/uEngine/temp")
-        python_path = os.getenv("PGPT_PYTHON_PATH", os.getenv("PYTHON", "python"))
-        server_params = StdioServerParameters(
-            command="uvx",
-            args=[
-                "mcp-python-code-interpreter",
-                "--dir",
-                work_dir,
-                "--python-path",
-                python_path
-            ],
-            env={
-                "MCP_ALLOW_SYSTEM_ACCESS": "0",
-                "PYTHONIOENCODING": os.getenv("PYTHONIOENCODING", "utf-8")
-            }
+        llm_usage: Optional[Dict[str, Any]] = None
+
+        # 섹션별 토큰 예산을 적용해 프롬프트 구성 (값이 없는 섹션은 생략)
+        with phase_timer("prompt_build", activity_name):
+            composite_query, prompt_tokens = build_composite_query(
+                feedback_summary=feedback_summary,
+                activity_name=activity_name,
+                description=description,
+                previous_result=previous_result,
+                form_types=form_types,
+                form_html=form_html,
+                work_dir=own_dir,
+            )
+        write_log_message(
+            f"[prompt] todo_id={todo_id} tokens "
+            + " ".join(f"{k}={v}" for k, v in prompt_tokens.items())
         )
 
-        def _to_json_str(obj: Any) -> str:
-            try:
-                return json.dumps(obj, ensure_ascii=False)
-            except Exception:
-                return str(obj) if obj is not None else ""
-
-        # 프롬프트를 동적으로 구성: 값이 없는 섹션(이전결과물/피드백)은 생략
-        def _sec(title: str, val: Any) -> str:
-            s = (val or "").strip()
-            return f"[{title}]\n{s}\n\n" if s else ""
-
-        composite_query = (
-            "다음 입력을 바탕으로 작업을 수행하세요. 최종 출력은 반드시 JSON 하나만 반환하세요(코드블록/설명 금지).\n\n"
-            # 피드백이 있으면 최우선으로 반영하도록 최상단에 배치
-            f"{_sec('피드백 내용', feedback_summary)}"
-            f"{_sec('워크아이템 이름', activity_name)}"
-            f"{_sec('지시사항', description)}"
-            f"{_sec('이전결과물', previous_result)}"
-            + (f"[form_type]\n{_to_json_str(form_types)}\n\n" if form_types else "")
-            + (f"[form_html]\n{_to_json_str(form_html)}\n\n" if form_html else "")
-            + "[결과형식 요구]\n"
-            + "- 피드백 내용이 제공된 경우, 피드백을 최우선 기준으로 반영하세요.\n"
-            + "- 결과는 form_type의 폼 키에 맞는 JSON 객체여야 합니다. (폼키: 값)\n"
-            + "- 각 폼키의 타입(수치/문자/배열/객체 등)을 준수하세요.\n"
-            + "- form_html은 form_type을 해석하는 힌트입니다. 구조(예: items 배열 등)를 파악해 값 형식을 맞추세요.\n"
-            + "- 추가 설명 문장 없이 JSON만 반환하세요.\n\n"
-            + "[출력 JSON 예시]\n"
-            + "{\n  \"폼키예시_숫자\": 123,\n  \"폼키예시_문자\": \"텍스트\",\n}\n\n"
-            + "주의: 위 예시는 형식 안내용으로, 최종 출력에서는 form_type에 정의된 실제 폼 키만 포함하고, 각 키의 타입과 이름에 맞는 값을 반환하세요. 추가 텍스트/설명/코드블록 없이 JSON만 반환하세요.\n"
-        )
-        
+        # form_types를 JSON Schema로 컴파일(form_id별 캐시) → 최종 단계 구조화 출력/검증에 사용
+        response_schema = self._schemas.get(form_id, form_types)
+
         try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools = await load_all_tools(session)
+            # 풀에서 초기화가 끝난 세션을 임대 (기동/핸드셰이크 비용 제거)
+            lease_started = time.perf_counter()
+            async with self._pool.lease() as pooled:
+                observe_phase("lease_wait", activity_name, time.perf_counter() - lease_started)
+                session = pooled.session
+                server_key = ToolRegistry.server_key(self._pool.server_params, pooled.server_info)
+                with phase_timer("load_tools", activity_name):
+                    tools = await load_all_tools(session, self._tools, server_key)
+                write_log_message(f"[tool-registry] tools={len(tools)} load_ms={self._tools.last_load_ms:.1f}")
+                with self._tools.bind(session) as tool_memo, phase_timer("agent_run", activity_name):
                     response = await run_react_agent(
                         tools,
                         composite_query,
@@ -191,100 +338,116 @@ class MCPActionExecutor:
                         job_id=job_id,
                         todo_id=todo_id,
                         proc_inst_id=proc_inst_id,
+                        stop_on_json=True,
+                        response_schema=response_schema,
+                        activity_name=activity_name,
+                        model=self._model_factory() if self._model_factory else None,
                     )
 
-                    final_text = ""
-                    try:
-                        if response and "messages" in response:
-                            msg = response["messages"][-1]
-                            final_text = getattr(msg, "content", str(msg))
-                        else:
-                            final_text = str(response)
-                    except Exception:
+                final_text = ""
+                try:
+                    if response and "messages" in response:
+                        msg = response["messages"][-1]
+                        final_text = getattr(msg, "content", str(msg))
+                    else:
                         final_text = str(response)
-
-                    raw_result = {
-                        "operation": "react",
-                        "status": "succeeded",
-                        "result": final_text,
-                    }
+                except Exception:
+                    final_text = str(response)
+
+                raw_result = {
+                    "operation": "react",
+                    "status": "succeeded",
+                    "result": final_text,
+                }
+                if isinstance(response, dict) and response.get("final_json") is not None:
+                    raw_result["json"] = response["final_json"]
+                limit = response.get("limit") if isinstance(response, dict) else None
+                if limit:
+                    # 한도 초과: 별도 이벤트로 알리고 최선의 결과로 계속 완료 처리
+                    write_log_message(f"[mcp-action] limit reached todo_id={todo_id} {limit}")
+                    event_queue.enqueue_event({
+                        "type": "event",
+                        "data": {
+                            "event_type": "task_timeout",
+                            "data": limit,
+                            "job_id": job_id,
+                            "crew_type": "react",
+                            "todo_id": str(todo_id) if todo_id is not None else None,
+                            "proc_inst_id": str(proc_inst_id) if proc_inst_id is not None else None,
+                            "timestamp": datetime.now(timezone.utc).isoformat(),
+                        }
+                    })
+                    if limit.get("reason") == "deadline":
+                        # 중단된 툴 실행이 인터프리터에 남아 있을 수 있으므로 세션 교체
+                        pooled.retire()
+                if isinstance(response, dict) and response.get("context"):
+                    write_log_message(f"[context] todo_id={todo_id} {response['context']}")
+                if isinstance(response, dict) and response.get("tool_steps"):
+                    write_log_message(f"[tool-steps] todo_id={todo_id} {response['tool_steps']}")
+                if isinstance(response, dict) and response.get("tool_latency"):
+                    write_log_message(f"[tool-latency] todo_id={todo_id} {response['tool_latency']}")
+                if isinstance(response, dict) and response.get("progress"):
+                    write_log_message(f"[progress] todo_id={todo_id} {response['progress']}")
+                if isinstance(response, dict) and response.get("checkpoint"):
+                    write_log_message(f"[checkpoint] todo_id={todo_id} {response['checkpoint']}")
+                if isinstance(response, dict) and response.get("llm_usage"):
+                    llm_usage = response["llm_usage"]
+                    write_log_message(f"[llm-usage] todo_id={todo_id} {llm_usage}")
+                if tool_memo is not None:
+                    write_log_message(f"[tool-memo] todo_id={todo_id} {tool_memo.stats()}")
+                if isinstance(response, dict) and response.get("schema_status"):
+                    self._schemas.record(response["schema_status"])
+                    schema_stats = self._schemas.stats()
+                    write_log_message(
+                        f"[form-schema] form_id={form_id} status={response['schema_status']} "
+                        f"errors={response.get('schema_errors', [])[:5]} "
+                        f"first_pass_failure_rate={schema_stats['first_pass_failure_rate']:.3f} "
+                        f"final_failure_rate={schema_stats['final_failure_rate']:.3f}"
+                    )
 
         except Exception as e:
             handle_application_error("[mcp-action] 실행 오류", e, raise_error=False)
 
+        pool_stats = self._pool.stats()
+        write_log_message(
+            f"[mcp-pool] hits={pool_stats['hits']} misses={pool_stats['misses']} "
+            f"idle={pool_stats['idle']} lease_wait_avg_ms={pool_stats['lease_wait_ms_avg']:.1f}"
+        )
 
-        def _extract_json(text: str) -> Any:
-            s = (text or "").strip()
-            if not s:
-                return {}
-            fence_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", s, re.IGNORECASE)
-            if fence_match:
-                candidate = fence_match.group(1).strip()
-                try:
-                    return json.loads(candidate)
-                except Exception:
-                    pass
-            start = s.find("{")
-            end = s.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                candidate = s[start:end+1]
-                try:
-                    return json.loads(candidate)
-                except Exception:
-                    pass
-            return {"result": s}
 
         if raw_result.get("status") == "succeeded":
             text = raw_result.get("result", "")
-            data_payload: Any = _extract_json(text)
+            # 스트리밍 중 이미 추출된 JSON이 있으면 그대로 사용
+            with phase_timer("json_extract", activity_name):
+                data_payload: Any = raw_result["json"] if "json" in raw_result else extract_json(text)
         else:
             data_payload = raw_result
         
         # 최종 결과 중 이번 실행에서 생성된 로컬 이미지 파일만 Base64(Data URI)로 인라인
-        def _is_generated_local_image(value: Any) -> tuple[bool, str]:
-            if not isinstance(value, str):
-                return False, ""
-            try:
-                path = value
-                if not os.path.isfile(path):
-                    return False, ""
-                # 생성 시점 필터: 이번 작업 시작 이후 생성/수정된 파일만 허용
-                if os.path.getmtime(path) < start_ts:
-                    return False, ""
-                ext = os.path.splitext(path)[1].lower()
-                if ext not in [".png", ".jpg", ".jpeg", ".webp", ".gif"]:
-                    return False, ""
-                mime, _ = mimetypes.guess_type(path)
-                return True, (mime or "image/png")
-            except Exception:
-                return False, ""
-
-        def _file_to_markdown_image(path: str, mime: str) -> str:
-            with open(path, "rb") as f:
-                b64 = base64.b64encode(f.read()).decode("ascii")
-            return f"![Generated Image](data:{mime};base64,{b64})"
+        with phase_timer("workspace_scan", activity_name):
+            await asyncio.to_thread(workspace.finish)
 
         def _inline_images(obj: Any) -> Any:
             if isinstance(obj, dict):
                 return {k: _inline_images(v) for k, v in obj.items()}
             if isinstance(obj, list):
                 return [_inline_images(v) for v in obj]
-            is_img, mime = _is_generated_local_image(obj)
-            if is_img:
-                try:
-                    return _file_to_markdown_image(obj, mime)
-                except Exception:
-                    return obj
+            if isinstance(obj, str):
+                return workspace.inline_image(obj) or obj
             return obj
 
-        final_payload = _inline_images(data_payload)
+        with phase_timer("image_inline", activity_name):
+            final_payload = await asyncio.to_thread(_inline_images, data_payload)
 
-        # 작업 완료 이벤트 저장
+        # 작업 완료 이벤트 저장 (LLM 사용량은 이벤트 data 안에 함께 기록, output 이벤트에는 넣지 않음)
+        completed_data = final_payload
+        if llm_usage is not None and isinstance(final_payload, dict):
+            completed_data = {**final_payload, "llm_usage": llm_usage}
         event_queue.enqueue_event({
             "type": "event",
             "data": {
                 "event_type": "task_completed",
-                "data": final_payload,
+                "data": completed_data,
                 "job_id": job_id,
                 "crew_type": "react",
                 "todo_id": str(todo_id) if todo_id is not None else None,
@@ -301,20 +464,40 @@ class MCPActionExecutor:
             }
         })
 
+        # 완료 이벤트까지 냈으면 재개용 체크포인트는 더 이상 필요 없음
+        if todo_id is not None and (store := get_checkpoint_store()) is not None:
+            await store.discard(str(todo_id))
+
         print(data_payload)
 
 
-async def run_mcp_action_server(polling_interval: Optional[int] = None) -> None:
+async def run_mcp_action_server(polling_interval: Optional[int] = None, ready: Optional[asyncio.Event] = None) -> None:
+    """Executor를 준비하고 폴링 서버를 실행합니다. 세션 풀이 데워지면 ready를 set합니다."""
     interval = polling_interval or DEFAULT_POLLING_INTERVAL
-    server = ProcessGPTAgentServer(
-        executor=MCPActionExecutor(),
+    executor = MCPActionExecutor()
+    register_stats_source("executor", executor.stats, labelled={"tool_limits": "tool", "openai_rate_limits": "model"})
+    server = ConcurrentAgentServer(
+        executor=executor,
         polling_interval=interval,
         agent_orch="langchain-react",
+        max_in_flight=executor.max_concurrency + DEFAULT_PREFETCH,
     )
-    await server.run()
+    register_stats_source("poller", server.stats)
+    try:
+        await executor.start()
+        if ready is not None:
+            ready.set()
+    except Exception as e:
+        handle_application_error("[mcp-action] 세션 풀 준비 실패", e, raise_error=False)
+    try:
+        await server.run()
+    finally:
+        await executor.close()
 
 
 def main() -> None:
+    # main.py를 거치지 않는 진입점에서도 OPENAI_API_KEY/PGPT_* 설정을 .env에서 받음(이미 설정된 값은 유지)
+    load_dotenv()
     asyncio.run(run_mcp_action_server())
 
 
@@ -0,0 +1,330 @@
+"""
+MCP 코드 인터프리터 세션 풀
+- 초기화가 끝난 ClientSession을 N개 미리 띄워 두고 작업마다 하나씩 임대(lease)합니다.
+- 임대 직전에 ping으로 상태를 확인하고, 최대 작업 수/최대 수명을 넘긴 세션은 재생성합니다.
+- 적중(hit)/미스(miss)와 임대 대기 시간을 stats()로 보고합니다.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+from mcp import ClientSession, StdioServerParameters, stdio_client
+from processgpt_agent_sdk.utils.logger import (
+    write_log_message,
+    handle_application_error,
+)
+
+from .metrics import observe_phase
+
+
+DEFAULT_POOL_SIZE = int(os.getenv("PGPT_MCP_POOL_SIZE", "2"))
+DEFAULT_MAX_TASKS = int(os.getenv("PGPT_MCP_POOL_MAX_TASKS", "50"))
+DEFAULT_MAX_AGE = float(os.getenv("PGPT_MCP_POOL_MAX_AGE", "1800"))  # 초
+SPAWN_TIMEOUT = float(os.getenv("PGPT_MCP_SPAWN_TIMEOUT", "120"))
+PING_TIMEOUT = float(os.getenv("PGPT_MCP_PING_TIMEOUT", "5"))
+CLOSE_TIMEOUT = 5.0
+
+
+class PooledSession:
+    """하나의 MCP 서브프로세스와 초기화된 ClientSession.
+
+    stdio_client/ClientSession은 anyio 컨텍스트라 진입/종료가 같은 태스크에서
+    일어나야 하므로, 세션마다 전용 소유 태스크가 컨텍스트를 붙잡고 있다가
+    close() 신호를 받으면 정리합니다.
+    """
+
+    def __init__(self, server_params: StdioServerParameters, message_handler=None) -> None:
+        self._params = server_params
+        self._message_handler = message_handler
+        self._closing = asyncio.Event()
+        self._owner: Optional[asyncio.Task] = None
+        self.session: Optional[ClientSession] = None
+        self.init_result: Any = None
+        self.created_at = time.monotonic()
+        self.tasks = 0
+        self.retired = False
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._owner is not None and not self._owner.done()
+
+    @property
+    def server_info(self) -> Any:
+        return getattr(self.init_result, "serverInfo", None)
+
+    async def start(self) -> None:
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._owner = asyncio.create_task(self._hold(ready))
+        try:
+            await asyncio.wait_for(asyncio.shield(ready), timeout=SPAWN_TIMEOUT)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _hold(self, ready: asyncio.Future) -> None:
+        try:
+            started = time.perf_counter()
+            async with stdio_client(self._params) as (read, write):
+                async with ClientSession(read, write, message_handler=self._message_handler) as session:
+                    spawned = time.perf_counter()
+                    observe_phase("mcp_spawn", None, spawned - started)
+                    self.init_result = await session.initialize()
+                    observe_phase("mcp_initialize", None, time.perf_counter() - spawned)
+                    self.session = session
+                    if not ready.done():
+                        ready.set_result(None)
+                    await self._closing.wait()
+        except BaseException as e:
+            if not ready.done():
+                ready.set_exception(e if isinstance(e, Exception) else RuntimeError("MCP 세션 시작 중단"))
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            self.session = None
+
+    def retire(self) -> None:
+        """반납 시 재사용하지 않고 교체하도록 표시합니다(중단된 툴 호출이 남아 있을 수 있을 때)."""
+        self.retired = True
+
+    async def ping(self) -> bool:
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=PING_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    async def close(self) -> None:
+        """세션 컨텍스트를 빠져나오게 해 서브프로세스를 종료합니다."""
+        self._closing.set()
+        owner = self._owner
+        if owner is None or owner.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(owner), timeout=CLOSE_TIMEOUT)
+        except BaseException:
+            owner.cancel()
+
+
+class MCPSessionPool:
+    """초기화된 MCP 세션을 미리 띄워 두고 작업 단위로 임대하는 풀."""
+
+    def __init__(
+        self,
+        server_params: StdioServerParameters,
+        *,
+        size: int = DEFAULT_POOL_SIZE,
+        max_tasks: int = DEFAULT_MAX_TASKS,
+        max_age: float = DEFAULT_MAX_AGE,
+        message_handler=None,
+    ) -> None:
+        self.server_params = server_params
+        self.size = max(1, size)
+        self.max_tasks = max_tasks
+        self.max_age = max_age
+        self.message_handler = message_handler
+        self._idle: Deque[PooledSession] = deque()
+        self._total = 0  # 대기/임대/생성 중인 세션 수 합계
+        self._cond: Optional[asyncio.Condition] = None
+        self._bg: Set[asyncio.Task] = set()  # 보충 생성
+        self._closers: Set[asyncio.Task] = set()  # 폐기된 세션 종료
+        self._closed = False
+        self._stats: Dict[str, float] = {
+            "hits": 0,
+            "misses": 0,
+            "waits": 0,
+            "spawned": 0,
+            "spawn_failed": 0,
+            "recycled": 0,
+            "discarded": 0,
+            "lease_wait_ms_total": 0.0,
+            "lease_wait_ms_max": 0.0,
+            "spawn_ms_total": 0.0,
+        }
+
+    # ---------- lifecycle ----------
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def start(self) -> None:
+        """풀 크기만큼 세션을 미리 띄웁니다(실패는 로그만 남기고 임대 시 재시도)."""
+        self._closed = False
+        await self._fill()
+
+    async def _fill(self) -> None:
+        missing = self.size - self._total
+        if missing <= 0 or self._closed:
+            return
+        self._total += missing
+        spawns = [asyncio.create_task(self._spawn()) for _ in range(missing)]
+        cancelled = False
+        try:
+            await asyncio.wait(spawns)
+        except asyncio.CancelledError:
+            # 풀 종료로 취소됨: 생성 중인 세션도 멈추고, 이미 뜬 세션은 아래에서 닫음
+            cancelled = True
+            for t in spawns:
+                t.cancel()
+            await asyncio.gather(*spawns, return_exceptions=True)
+        late = []
+        async with self._condition():
+            for t in spawns:
+                entry = t.result() if not t.cancelled() and t.exception() is None else None
+                if entry is not None and not (cancelled or self._closed):
+                    self._idle.append(entry)
+                    continue
+                self._total -= 1
+                if entry is not None:
+                    late.append(entry)
+            self._condition().notify_all()
+        for entry in late:
+            await entry.close()
+        if cancelled:
+            raise asyncio.CancelledError()
+        write_log_message(f"[mcp-pool] warm sessions={len(self._idle)}/{self.size}")
+
+    async def close(self) -> None:
+        # 먼저 닫힘 표시: 이후 반납/보충은 새 세션을 만들지 않고 바로 폐기
+        self._closed = True
+        refills = list(self._bg)
+        for t in refills:
+            t.cancel()
+        await asyncio.gather(*refills, return_exceptions=True)
+        while self._idle:
+            entry = self._idle.popleft()
+            self._total -= 1
+            self._track_close(entry)
+        # 세션 종료는 취소하지 않고 끝까지 기다림(중간에 끊으면 서브프로세스가 남음)
+        closers = list(self._closers)
+        if closers:
+            await asyncio.shield(asyncio.gather(*closers, return_exceptions=True))
+
+    # ---------- lease ----------
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[PooledSession]:
+        """세션 하나를 임대합니다. 블록이 예외로 끝나면 세션을 폐기합니다."""
+        started = time.monotonic()
+        entry = await self._acquire()
+        wait_ms = (time.monotonic() - started) * 1000
+        self._stats["lease_wait_ms_total"] += wait_ms
+        self._stats["lease_wait_ms_max"] = max(self._stats["lease_wait_ms_max"], wait_ms)
+        healthy = False
+        try:
+            yield entry
+            healthy = True
+        finally:
+            await self._release(entry, healthy=healthy)
+
+    async def _acquire(self) -> PooledSession:
+        cond = self._condition()
+        waited = False
+        while True:
+            async with cond:
+                while not self._idle and self._total >= self.size:
+                    waited = True
+                    await cond.wait()
+                entry = self._idle.popleft() if self._idle else None
+                if entry is None:
+                    self._total += 1  # 자리를 먼저 예약한 뒤 생성
+
+            if entry is None:
+                try:
+                    entry = await self._spawn()
+                except Exception:
+                    await self._forget()
+                    raise
+                self._stats["misses"] += 1
+                break
+
+            if self._expired(entry) or not await entry.ping():
+                self._stats["recycled"] += 1
+                await self._discard(entry)
+                continue
+            self._stats["hits"] += 1
+            break
+
+        if waited:
+            self._stats["waits"] += 1
+        return entry
+
+    async def _release(self, entry: PooledSession, *, healthy: bool) -> None:
+        entry.tasks += 1
+        if not healthy or not entry.alive or self._closed:
+            self._stats["discarded"] += 1
+            await self._discard(entry)
+            self._schedule_refill()
+            return
+        if self._expired(entry):
+            self._stats["recycled"] += 1
+            await self._discard(entry)
+            self._schedule_refill()
+            return
+        async with self._condition():
+            self._idle.append(entry)
+            self._condition().notify()
+
+    def _expired(self, entry: PooledSession) -> bool:
+        if entry.retired:
+            return True
+        if self.max_tasks and entry.tasks >= self.max_tasks:
+            return True
+        return bool(self.max_age) and (time.monotonic() - entry.created_at) >= self.max_age
+
+    # ---------- internals ----------
+    async def _spawn(self) -> PooledSession:
+        entry = PooledSession(self.server_params, self.message_handler)
+        started = time.monotonic()
+        try:
+            await entry.start()
+        except Exception:
+            self._stats["spawn_failed"] += 1
+            raise
+        self._stats["spawned"] += 1
+        self._stats["spawn_ms_total"] += (time.monotonic() - started) * 1000
+        return entry
+
+    async def _forget(self) -> None:
+        async with self._condition():
+            self._total -= 1
+            self._condition().notify()
+
+    async def _discard(self, entry: PooledSession) -> None:
+        await self._forget()
+        self._track_close(entry)
+
+    def _schedule_refill(self) -> None:
+        """폐기된 자리를 백그라운드에서 다시 채워 N개 웜 상태를 유지합니다."""
+        if not self._closed:
+            self._track(self._fill(), self._bg)
+
+    def _track_close(self, entry: PooledSession) -> None:
+        self._track(entry.close(), self._closers)
+
+    def _track(self, coro, tasks: Set[asyncio.Task]) -> None:
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+
+        def _done(t: asyncio.Task) -> None:
+            tasks.discard(t)
+            if not t.cancelled() and t.exception():
+                handle_application_error("[mcp-pool] 백그라운드 작업 실패", t.exception(), raise_error=False)
+
+        task.add_done_callback(_done)
+
+    def stats(self) -> Dict[str, Any]:
+        leases = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": self.size,
+            "idle": len(self._idle),
+            "in_use": self._total - len(self._idle),
+            "hit_ratio": (self._stats["hits"] / leases) if leases else 0.0,
+            "lease_wait_ms_avg": (self._stats["lease_wait_ms_total"] / leases) if leases else 0.0,
+        }
@@ -0,0 +1,94 @@
+"""
+작업별 실행 한도
+- 최대 단계 수(LLM 턴), 벽시계 마감 시간, 토큰 예산을 작업마다 추적합니다.
+- 한도를 넘으면 LimitExceeded를 던지고, 호출 측은 지금까지의 대화로 최종 JSON을 만들어 마무리합니다.
+- LangGraph recursion_limit은 단계 수 한도의 안전망으로 함께 설정합니다.
+"""
+
+import os
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.messages import AIMessage
+
+from .prompt_builder import count_tokens
+
+
+MAX_STEPS = int(os.getenv("PGPT_AGENT_MAX_STEPS", "25"))
+DEADLINE_SECONDS = float(os.getenv("PGPT_AGENT_DEADLINE_S", "900"))
+TOKEN_BUDGET = int(os.getenv("PGPT_AGENT_TOKEN_BUDGET", "200000"))
+# 한도 도달 후 최종 JSON을 받아내는 마지막 호출에 허용하는 시간(초)
+FINALIZE_TIMEOUT = float(os.getenv("PGPT_AGENT_FINALIZE_TIMEOUT", "60"))
+
+# 단계당 LangGraph 노드 수(pre_model_hook → agent → tools)
+_NODES_PER_STEP = 3
+
+
+class LimitExceeded(Exception):
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class TaskBudget:
+    """한 작업의 단계/시간/토큰 사용량과 한도. 0 이하 값은 해당 한도를 끕니다."""
+
+    def __init__(
+        self,
+        *,
+        max_steps: int = MAX_STEPS,
+        deadline: float = DEADLINE_SECONDS,
+        max_tokens: int = TOKEN_BUDGET,
+    ) -> None:
+        self.max_steps = max_steps
+        self.deadline = deadline
+        self.max_tokens = max_tokens
+        self.started = time.monotonic()
+        self.steps = 0
+        self.tokens = 0
+        self.estimated = False
+        self.reason: Optional[str] = None
+
+    @property
+    def limited(self) -> bool:
+        return self.max_steps > 0 or self.deadline > 0 or self.max_tokens > 0
+
+    def recursion_limit(self) -> Optional[int]:
+        return self.max_steps * _NODES_PER_STEP + _NODES_PER_STEP if self.max_steps > 0 else None
+
+    def remaining(self) -> Optional[float]:
+        """마감까지 남은 시간(초). 마감이 없으면 None."""
+        if self.deadline <= 0:
+            return None
+        return max(0.0, self.deadline - (time.monotonic() - self.started))
+
+    def start_turn(self) -> None:
+        self.steps += 1
+        if self.max_steps > 0 and self.steps > self.max_steps:
+            raise self.exceeded("max_steps")
+
+    def charge(self, message: AIMessage, prompt_tokens: int = 0) -> None:
+        """LLM 응답 하나의 토큰을 누적합니다. usage_metadata가 없으면 추정치를 씁니다."""
+        usage = getattr(message, "usage_metadata", None) or {}
+        if usage.get("total_tokens"):
+            self.tokens += int(usage["total_tokens"])
+        else:
+            self.estimated = True
+            content = message.content if isinstance(message.content, str) else str(message.content)
+            self.tokens += prompt_tokens + count_tokens(content) + count_tokens(str(message.tool_calls or ""))
+        if self.max_tokens > 0 and self.tokens >= self.max_tokens:
+            raise self.exceeded("token_budget")
+
+    def exceeded(self, reason: str) -> LimitExceeded:
+        self.reason = reason
+        return LimitExceeded(reason)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "reason": self.reason,
+            "steps": self.steps,
+            "elapsed_s": round(time.monotonic() - self.started, 1),
+            "tokens": self.tokens,
+            "tokens_estimated": self.estimated,
+            "limits": {"max_steps": self.max_steps, "deadline_s": self.deadline, "token_budget": self.max_tokens},
+        }
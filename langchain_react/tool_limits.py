@@ -0,0 +1,99 @@
+"""
+툴별 동시 실행 제한과 블로킹 툴 전용 스레드 풀
+- 한 턴에 여러 툴 호출이 나오면 LangGraph가 동시에 실행하므로, 외부 자원(이미지 API, 인터프리터)을
+  보호하기 위해 툴 이름별 세마포어로 프로세스 전체 동시 실행 수를 제한합니다.
+  PGPT_TOOL_CONCURRENCY="create_image=4,run_python_code=2,*=8" 형식 (*는 나머지 툴 기본값, 0은 무제한).
+- create_image/create_comic처럼 동기 네트워크 호출을 하는 툴은 전용 스레드 풀에서 실행해
+  이벤트 루프와 asyncio 기본 실행기(워크스페이스 스캔 등)를 막지 않게 합니다.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+
+TOOL_CONCURRENCY_SPEC = os.getenv("PGPT_TOOL_CONCURRENCY", "create_image=4,create_comic=2")
+TOOL_THREADS = int(os.getenv("PGPT_TOOL_THREADS", "8"))
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        name, sep, value = part.partition("=")
+        if not sep:
+            continue
+        try:
+            limits[name.strip()] = int(value)
+        except ValueError:
+            continue
+    return limits
+
+
+class ToolLimiter:
+    """툴 이름별 세마포어와 대기 시간 집계."""
+
+    def __init__(self, limits: Optional[Dict[str, int]] = None) -> None:
+        self.limits = dict(limits if limits is not None else parse_limits(TOOL_CONCURRENCY_SPEC))
+        self._default = self.limits.pop("*", 0)
+        self._semaphores: Dict[str, Optional[asyncio.Semaphore]] = {}
+        self._active: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _semaphore(self, name: str) -> Optional[asyncio.Semaphore]:
+        if name not in self._semaphores:
+            limit = self.limits.get(name, self._default)
+            self._semaphores[name] = asyncio.Semaphore(limit) if limit > 0 else None
+        return self._semaphores[name]
+
+    @asynccontextmanager
+    async def slot(self, name: str) -> AsyncIterator[float]:
+        """툴 실행 슬롯을 확보합니다. 대기 시간(ms)을 돌려줍니다."""
+        sem = self._semaphore(name)
+        stats = self._stats.setdefault(name, {"calls": 0, "waits": 0, "wait_ms_total": 0.0, "peak_active": 0})
+        started = time.monotonic()
+        if sem is not None:
+            await sem.acquire()
+        wait_ms = (time.monotonic() - started) * 1000
+        stats["calls"] += 1
+        if wait_ms >= 1:
+            stats["waits"] += 1
+        stats["wait_ms_total"] += wait_ms
+        self._active[name] = self._active.get(name, 0) + 1
+        stats["peak_active"] = max(stats["peak_active"], self._active[name])
+        try:
+            yield wait_ms
+        finally:
+            self._active[name] -= 1
+            if sem is not None:
+                sem.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: {**s, "active": self._active.get(name, 0)} for name, s in self._stats.items()}
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_limiter: Optional[ToolLimiter] = None
+
+
+def get_tool_limiter() -> ToolLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = ToolLimiter()
+    return _limiter
+
+
+def tool_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max(1, TOOL_THREADS), thread_name_prefix="pgpt-tool")
+    return _executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """동기 함수를 툴 전용 스레드 풀에서 실행합니다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(tool_executor(), partial(fn, *args, **kwargs))
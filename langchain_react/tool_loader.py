@@ -1,30 +1,48 @@
-from typing import List
+import asyncio
+from typing import List, Optional, Tuple
 
 from langchain_mcp_adapters.tools import load_mcp_tools
 from langchain_core.tools import tool
-from .image_generator import ImageGenerator
+from .tool_limits import get_tool_limiter, run_blocking
+from .tool_registry import ToolRegistry
+
+
+_QUALITY_MAP = {
+    "standard": "medium",
+    "medium": "medium",
+    "low": "low",
+    "high": "high",
+    "auto": "auto",
+}
+
+
+def _image_generator():
+    # openai/PIL/supabase는 이미지 툴을 실제로 호출할 때만 불러옴
+    from .image_generator import ImageGenerator
+
+    return ImageGenerator()
+
+
+async def _generate(generator, **kwargs) -> str:
+    """이미지 1장 생성/업로드를 create_image 동시 실행 제한 안에서 스레드 풀로 실행합니다."""
+    async with get_tool_limiter().slot("create_image"):
+        return await run_blocking(generator.generate_and_upload, **kwargs)
 
 
 @tool
-def create_image(prompt: str, filename: str = None, size: str = "1024x1024", quality: str = "standard") -> str:
+async def create_image(prompt: str, filename: str = None, size: str = "1024x1024", quality: str = "standard") -> str:
     """
     Create an image using OpenAI GPT Image based on a text prompt.
     Returns a public URL string or an error message.
     """
     try:
-        quality_map = {
-            "standard": "medium",
-            "medium": "medium",
-            "low": "low",
-            "high": "high",
-            "auto": "auto",
-        }
-        generator = ImageGenerator()
-        return generator.generate_and_upload(
+        generator = await run_blocking(_image_generator)
+        return await _generate(
+            generator,
             prompt=prompt,
             filename=filename,
             size=size,
-            quality=quality_map.get(quality, "medium"),
+            quality=_QUALITY_MAP.get(quality, "medium"),
             resize_to_512=True,
             return_markdown=False,
         )
@@ -33,42 +51,50 @@ def create_image(prompt: str, filename: str = None, size: str = "1024x1024", qua
 
 
 @tool
-def create_comic(topic: str) -> str:
+async def create_comic(topic: str) -> str:
     """
     Create a 4-panel comic (four images) based on a topic using GPT Image.
     Returns a markdown string with four image links.
     """
     try:
-        generator = ImageGenerator()
-        panel_prompts = [
-            f"Four-panel comic, panel 1: A scene about {topic}. Consistent characters, bright colors, minimal text.",
-            f"Four-panel comic, panel 2: Progression of the story about {topic}. Same style and characters.",
-            f"Four-panel comic, panel 3: A twist or development related to {topic}. Maintain consistency.",
-            f"Four-panel comic, panel 4: Punchline or conclusion about {topic}. Cohesive with prior panels.",
-        ]
-
-        safe_topic = "".join(ch if ch.isalnum() else "_" for ch in topic)[:40].strip("_") or "topic"
-        markdown_images = []
-        for idx, p in enumerate(panel_prompts, start=1):
-            filename = f"comic_{safe_topic}_{idx}.png"
-            md = generator.generate_and_upload(
-                prompt=p,
-                filename=filename,
-                size="1024x1024",
-                quality="medium",
-                resize_to_512=True,
-                return_markdown=True,
-            )
-            markdown_images.append(md)
+        async with get_tool_limiter().slot("create_comic"):
+            generator = await run_blocking(_image_generator)
+            panel_prompts = [
+                f"Four-panel comic, panel 1: A scene about {topic}. Consistent characters, bright colors, minimal text.",
+                f"Four-panel comic, panel 2: Progression of the story about {topic}. Same style and characters.",
+                f"Four-panel comic, panel 3: A twist or development related to {topic}. Maintain consistency.",
+                f"Four-panel comic, panel 4: Punchline or conclusion about {topic}. Cohesive with prior panels.",
+            ]
+
+            safe_topic = "".join(ch if ch.isalnum() else "_" for ch in topic)[:40].strip("_") or "topic"
+            # 패널 4장은 서로 독립이므로 동시에 생성 (순서는 gather가 유지)
+            markdown_images = await asyncio.gather(*(
+                _generate(
+                    generator,
+                    prompt=p,
+                    filename=f"comic_{safe_topic}_{idx}.png",
+                    size="1024x1024",
+                    quality="medium",
+                    resize_to_512=True,
+                    return_markdown=True,
+                )
+                for idx, p in enumerate(panel_prompts, start=1)
+            ))
 
         return "\n".join(markdown_images)
     except Exception as e:
         return f"Error generating comic: {str(e)}"
 
 
-async def load_all_tools(session) -> List:
-    """Load both MCP tools and image generation tools."""
-    mcp_tools = await load_mcp_tools(session)
+async def load_all_tools(session, registry: Optional[ToolRegistry] = None, server_key: Optional[Tuple] = None) -> List:
+    """Load both MCP tools and image generation tools.
+
+    registry/server_key가 주어지면 캐시된 툴 정의를 재사용합니다(호출 측에서 registry.bind 필요).
+    """
+    if registry is not None and server_key is not None:
+        mcp_tools = await registry.get_tools(session, server_key)
+    else:
+        mcp_tools = await load_mcp_tools(session)
     image_tools = [create_image, create_comic]
     return mcp_tools + image_tools
 
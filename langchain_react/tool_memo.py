@@ -0,0 +1,99 @@
+"""
+작업 단위 MCP 툴 호출 메모이제이션
+- 한 작업 안에서 같은 인자로 다시 부른 읽기 전용 툴(목록 조회, 같은 파일 읽기 등)은
+  MCP 왕복 없이 직전 결과를 돌려줍니다.
+- 읽기 전용 판정: PGPT_TOOL_MEMO_READONLY 목록 또는 서버가 준 readOnlyHint 어노테이션.
+- 그 밖의 툴(쓰기/실행/설치)이 호출되면 그 작업의 캐시를 모두 비웁니다.
+  쓰기와 동시에 실행된 읽기 결과는 저장하지 않습니다(세대 번호로 판별).
+- 오류 결과(isError)는 캐시하지 않습니다. 작업이 끝나면 캐시는 버려지고 적중 통계만 남습니다.
+"""
+
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+
+TOOL_MEMO = os.getenv("PGPT_TOOL_MEMO", "1") != "0"
+TOOL_MEMO_READONLY = os.getenv(
+    "PGPT_TOOL_MEMO_READONLY",
+    "read_file,list_directory,list_python_environments,list_installed_packages",
+)
+TOOL_MEMO_MAX_ENTRIES = int(os.getenv("PGPT_TOOL_MEMO_MAX_ENTRIES", "256"))
+
+
+def parse_names(spec: str) -> Set[str]:
+    return {name.strip() for name in (spec or "").split(",") if name.strip()}
+
+
+class ToolCallMemo:
+    """한 작업 동안의 읽기 전용 툴 결과 캐시."""
+
+    def __init__(self, read_only: Iterable[str] = (), *, max_entries: int = TOOL_MEMO_MAX_ENTRIES) -> None:
+        self.read_only = parse_names(TOOL_MEMO_READONLY) | set(read_only)
+        self.max_entries = max_entries
+        self._cache: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._generation = 0
+        self._writes_in_flight = 0
+        self._per_tool: Dict[str, int] = {}
+        self._stats: Dict[str, float] = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "saved_ms": 0.0,
+        }
+
+    @staticmethod
+    def _key(name: str, arguments: Optional[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+        try:
+            return name, json.dumps(arguments or {}, sort_keys=True, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return None
+
+    def _invalidate(self) -> None:
+        self._generation += 1
+        if self._cache:
+            self._cache.clear()
+            self._stats["invalidations"] += 1
+
+    async def call(self, name: str, arguments: Optional[Dict[str, Any]], invoke: Callable[[], Awaitable[Any]]) -> Any:
+        """invoke()로 실제 호출하되, 읽기 전용 툴이면 캐시를 먼저 확인합니다."""
+        if name not in self.read_only:
+            # 쓰기/실행 툴: 호출 전후로 캐시를 비워 진행 중이던 읽기 결과도 저장되지 않게 함
+            self._writes_in_flight += 1
+            self._invalidate()
+            try:
+                return await invoke()
+            finally:
+                self._writes_in_flight -= 1
+                self._invalidate()
+
+        key = self._key(name, arguments)
+        cached = self._cache.get(key) if key is not None else None
+        if cached is not None:
+            self._stats["hits"] += 1
+            self._stats["saved_ms"] += cached[1]
+            self._per_tool[name] = self._per_tool.get(name, 0) + 1
+            return cached[0]
+
+        self._stats["misses"] += 1
+        generation = self._generation
+        started = time.perf_counter()
+        result = await invoke()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if (
+            key is not None
+            and not getattr(result, "isError", False)
+            and generation == self._generation
+            and self._writes_in_flight == 0
+            and len(self._cache) < self.max_entries
+        ):
+            self._cache[key] = (result, elapsed_ms)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "saved_ms": round(self._stats["saved_ms"], 1),
+            "hits_by_tool": dict(self._per_tool),
+        }
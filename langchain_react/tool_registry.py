@@ -0,0 +1,145 @@
+"""
+MCP 툴 레지스트리
+- tools/list 결과와 LangChain 툴 변환 결과를 서버 식별자(명령/인자/이름/버전)별로 캐시합니다.
+- 변환된 툴은 특정 세션이 아닌 프록시에 묶여 있어, 작업마다 임대한 세션으로 bind()만 바꿔 재사용합니다.
+- 서버가 notifications/tools/list_changed를 보내면 캐시를 무효화합니다.
+- bind()마다 작업 단위 툴 호출 메모(tool_memo)를 만들어, 읽기 전용 툴의 반복 호출을 캐시에서 응답합니다.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from mcp import ClientSession, types
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from processgpt_agent_sdk.utils.logger import write_log_message
+
+from .tool_limits import get_tool_limiter
+from .tool_memo import TOOL_MEMO, ToolCallMemo
+
+
+# 현재 작업(asyncio 태스크 컨텍스트)에 임대된 MCP 세션과 툴 호출 메모
+_current_session: ContextVar[Optional[ClientSession]] = ContextVar("mcp_leased_session", default=None)
+_current_memo: ContextVar[Optional[ToolCallMemo]] = ContextVar("mcp_tool_memo", default=None)
+
+
+class _LeasedSessionProxy:
+    """툴 호출을 현재 컨텍스트에 바인딩된 세션으로 위임하는 프록시."""
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        session = _current_session.get()
+        if session is None:
+            raise RuntimeError(f"MCP 세션이 바인딩되지 않은 상태에서 툴 호출: {name}")
+
+        async def _invoke():
+            # 한 턴의 여러 툴 호출은 동시에 실행되므로 툴별 동시 실행 수를 제한
+            async with get_tool_limiter().slot(name):
+                return await session.call_tool(name, arguments, *args, **kwargs)
+
+        memo = _current_memo.get()
+        if memo is None:
+            return await _invoke()
+        return await memo.call(name, arguments, _invoke)
+
+
+class ToolRegistry:
+    """서버 식별자별로 변환된 MCP 툴 목록을 캐시합니다."""
+
+    def __init__(self) -> None:
+        self._proxy = _LeasedSessionProxy()
+        self._cache: Dict[Tuple, List[Any]] = {}
+        # 서버가 readOnlyHint로 표시한 툴 이름 (메모이제이션 대상)
+        self.read_only_tools: Set[str] = set()
+        self._stats: Dict[str, float] = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "cold_load_ms_total": 0.0,
+            "warm_load_ms_total": 0.0,
+            "memo_hits": 0,
+            "memo_misses": 0,
+            "memo_saved_ms_total": 0.0,
+        }
+        self.last_load_ms: float = 0.0
+
+    @staticmethod
+    def server_key(server_params: Any, server_info: Any) -> Tuple:
+        """실행 명령/인자와 initialize 응답의 서버 이름/버전으로 캐시 키를 만듭니다."""
+        return (
+            getattr(server_params, "command", None),
+            tuple(getattr(server_params, "args", None) or ()),
+            getattr(server_info, "name", None),
+            getattr(server_info, "version", None),
+        )
+
+    async def get_tools(self, session: ClientSession, key: Tuple) -> List[Any]:
+        """캐시된 툴을 돌려주고, 없으면 tools/list 후 변환해 저장합니다."""
+        started = time.monotonic()
+        tools = self._cache.get(key)
+        if tools is not None:
+            self.last_load_ms = (time.monotonic() - started) * 1000
+            self._stats["hits"] += 1
+            self._stats["warm_load_ms_total"] += self.last_load_ms
+            return list(tools)
+
+        mcp_tools = []
+        cursor: Optional[str] = None
+        while True:
+            page = await session.list_tools(cursor)
+            mcp_tools.extend(page.tools)
+            cursor = page.nextCursor
+            if not cursor:
+                break
+        tools = [convert_mcp_tool_to_langchain_tool(self._proxy, t) for t in mcp_tools]
+        self._cache[key] = tools
+        self.read_only_tools.update(
+            t.name for t in mcp_tools if t.annotations is not None and t.annotations.readOnlyHint
+        )
+
+        self.last_load_ms = (time.monotonic() - started) * 1000
+        self._stats["misses"] += 1
+        self._stats["cold_load_ms_total"] += self.last_load_ms
+        return list(tools)
+
+    @contextmanager
+    def bind(self, session: ClientSession) -> Iterator[Optional[ToolCallMemo]]:
+        """이 컨텍스트 안에서 캐시된 툴이 주어진 세션으로 호출되도록 바인딩합니다.
+
+        PGPT_TOOL_MEMO가 켜져 있으면 이 작업 전용 툴 호출 메모를 만들어 돌려줍니다.
+        """
+        memo = ToolCallMemo(self.read_only_tools) if TOOL_MEMO else None
+        token = _current_session.set(session)
+        memo_token = _current_memo.set(memo)
+        try:
+            yield memo
+        finally:
+            _current_memo.reset(memo_token)
+            _current_session.reset(token)
+            if memo is not None:
+                memo_stats = memo.stats()
+                self._stats["memo_hits"] += memo_stats["hits"]
+                self._stats["memo_misses"] += memo_stats["misses"]
+                self._stats["memo_saved_ms_total"] += memo_stats["saved_ms"]
+
+    def invalidate(self, reason: str = "") -> None:
+        # 다시 연결된 서버의 어노테이션이 바뀌었을 수 있으므로 읽기 전용 표시도 다음 tools/list에서 새로 받음
+        self.read_only_tools.clear()
+        if self._cache:
+            self._cache.clear()
+            self._stats["invalidations"] += 1
+            write_log_message(f"[tool-registry] cache invalidated {reason}".rstrip())
+
+    async def message_handler(self, message: Any) -> None:
+        """ClientSession message_handler: tools/list_changed 알림 시 캐시 무효화."""
+        if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ToolListChangedNotification):
+            self.invalidate("(tools/list_changed)")
+
+    def stats(self) -> Dict[str, Any]:
+        hits, misses = self._stats["hits"], self._stats["misses"]
+        return {
+            **self._stats,
+            "cached_servers": len(self._cache),
+            "cold_load_ms_avg": (self._stats["cold_load_ms_total"] / misses) if misses else 0.0,
+            "warm_load_ms_avg": (self._stats["warm_load_ms_total"] / hits) if hits else 0.0,
+        }
@@ -0,0 +1,149 @@
+"""
+작업 디렉터리 변경 추적기
+- 작업마다 PGPT_WORK_DIR/tasks/<todo_id> 폴더를 두고, 시작/종료 시 그 폴더와 작업 디렉터리 루트를 스냅샷해
+  이번 실행이 만들거나 수정한 이미지 파일 집합을 구합니다. 다른 작업의 tasks/<id> 폴더는 훑지 않습니다.
+- 인터프리터 cwd(작업 디렉터리 루트)에 저장된 파일은 어느 작업 것인지 알 수 없으므로,
+  이번 작업 결과가 그 경로를 언급할 때만 인라인됩니다.
+- 작업이 끝나거나 취소되면 remove_task_dir로 작업 전용 폴더를 지웁니다.
+- 결과 후처리는 문자열마다 파일 시스템을 stat하지 않고 이 집합에서 조회만 합니다.
+- 인라인할 파일은 크기 상한을 두고, 청크 단위로 base64 인코딩합니다.
+"""
+
+import base64
+import mimetypes
+import os
+import re
+import shutil
+from typing import Dict, Optional, Tuple
+
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+SKIP_DIRS = {"__pycache__", "node_modules", "site-packages", ".git", ".venv", "venv"}
+SCAN_MAX_DEPTH = int(os.getenv("PGPT_WORKSPACE_SCAN_DEPTH", "4"))
+INLINE_MAX_BYTES = int(os.getenv("PGPT_INLINE_IMAGE_MAX_BYTES", str(5 * 1024 * 1024)))
+INLINE_TOTAL_MAX_BYTES = int(os.getenv("PGPT_INLINE_TOTAL_MAX_BYTES", str(20 * 1024 * 1024)))
+_CHUNK = 3 * 64 * 1024  # 3의 배수여야 청크별 base64 결과를 그대로 이어 붙일 수 있음
+TASK_DIR_NAME = "tasks"
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _task_dir_path(work_dir: str, key: object) -> str:
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", str(key))[:128].strip(".") or "task"
+    return os.path.join(work_dir, TASK_DIR_NAME, name)
+
+
+def task_dir(work_dir: str, key: object) -> str:
+    """작업 전용 폴더(work_dir/tasks/<key>)를 만들고 경로를 돌려줍니다."""
+    path = _task_dir_path(work_dir, key)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def remove_task_dir(work_dir: str, key: object) -> None:
+    """작업 전용 폴더를 지웁니다(없거나 지우지 못해도 예외 없음)."""
+    shutil.rmtree(_task_dir_path(work_dir, key), ignore_errors=True)
+
+
+class WorkspaceTracker:
+    """작업 디렉터리 스냅샷을 비교해 이번 실행에서 생성/수정된 이미지 파일을 추적합니다."""
+
+    def __init__(
+        self,
+        root: str,
+        extensions: Tuple[str, ...] = IMAGE_EXTENSIONS,
+        max_depth: int = SCAN_MAX_DEPTH,
+        base_dir: Optional[str] = None,
+    ) -> None:
+        self.root = root
+        # 결과의 상대 경로를 해석할 기준(인터프리터 작업 디렉터리). 없으면 root
+        self.base_dir = base_dir or root
+        self.extensions = extensions
+        self.max_depth = max_depth
+        self._before: Dict[str, Tuple[int, int]] = {}
+        self.created: Dict[str, int] = {}  # 정규화 경로 → 크기(bytes)
+        self._inlined_bytes = 0
+
+    def snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """대상 확장자 파일만 (mtime_ns, size)로 기록합니다. 이름으로 먼저 거르고 stat합니다.
+
+        작업 폴더와 작업 디렉터리 루트를 함께 훑되, 루트 아래 tasks/(다른 작업 폴더)는 건너뜁니다.
+        """
+        result: Dict[str, Tuple[int, int]] = {}
+        self._scan(self.root, result)
+        if _norm(self.base_dir) != _norm(self.root):
+            self._scan(self.base_dir, result, skip=_norm(os.path.join(self.base_dir, TASK_DIR_NAME)))
+        return result
+
+    def _scan(self, top: str, result: Dict[str, Tuple[int, int]], skip: Optional[str] = None) -> None:
+        stack = [(top, 0)]
+        while stack:
+            path, depth = stack.pop()
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if (
+                                    depth < self.max_depth
+                                    and not entry.name.startswith(".")
+                                    and entry.name not in SKIP_DIRS
+                                    and (skip is None or _norm(entry.path) != skip)
+                                ):
+                                    stack.append((entry.path, depth + 1))
+                            elif entry.name.lower().endswith(self.extensions):
+                                st = entry.stat()
+                                result[_norm(entry.path)] = (st.st_mtime_ns, st.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    def start(self) -> None:
+        self._before = self.snapshot()
+        self.created = {}
+        self._inlined_bytes = 0
+
+    def finish(self) -> Dict[str, int]:
+        """시작 스냅샷 이후 새로 생기거나 바뀐 파일을 created에 채웁니다."""
+        after = self.snapshot()
+        self.created = {p: sig[1] for p, sig in after.items() if self._before.get(p) != sig}
+        return self.created
+
+    def resolve(self, value: str) -> Optional[str]:
+        """결과 문자열이 이번 실행에서 생성된 이미지 경로면 정규화 경로를 돌려줍니다(stat 없음)."""
+        if not self.created or len(value) > 4096 or not value.lower().endswith(self.extensions):
+            return None
+        path = value if os.path.isabs(value) else os.path.join(self.base_dir, value)
+        path = _norm(path)
+        return path if path in self.created else None
+
+    def inline_image(self, value: str) -> Optional[str]:
+        """생성된 이미지면 크기 상한 안에서 마크다운 Data URI로 변환합니다."""
+        path = self.resolve(value)
+        if path is None:
+            return None
+        size = self.created[path]
+        if size > INLINE_MAX_BYTES or self._inlined_bytes + size > INLINE_TOTAL_MAX_BYTES:
+            return None
+        mime, _ = mimetypes.guess_type(path)
+        try:
+            b64 = encode_base64_file(path)
+        except OSError:
+            return None
+        self._inlined_bytes += size
+        return f"![Generated Image](data:{mime or 'image/png'};base64,{b64})"
+
+
+def encode_base64_file(path: str) -> str:
+    """파일 전체를 한 번에 읽지 않고 청크 단위로 base64 인코딩합니다."""
+    parts = []
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_CHUNK)
+            if not chunk:
+                break
+            parts.append(base64.b64encode(chunk).decode("ascii"))
+    return "".join(parts)
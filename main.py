@@ -1,17 +1,34 @@
 # main.py
 import asyncio
+import importlib
 from contextlib import asynccontextmanager
 from typing import Optional
 
-from fastapi import FastAPI
-from langchain_react.server import run_mcp_action_server
+from dotenv import load_dotenv
+from fastapi import FastAPI, Response
+
+# langchain_react 모듈들은 import 시점에 PGPT_* 설정을 읽으므로 그보다 먼저 .env를 로드
+load_dotenv()
+
+# LangGraph/MCP/SDK 등 무거운 모듈은 기동 후 스레드에서 불러와 /health가 바로 응답하도록 함
+SERVER_MODULE = "langchain_react.server"
+METRICS_MODULE = "langchain_react.metrics"
 
 _mcp_task: Optional[asyncio.Task] = None
+_ready: Optional[asyncio.Event] = None
+
+async def _import_lazily(name: str):
+    return await asyncio.to_thread(importlib.import_module, name)
+
+async def _run_server(ready: asyncio.Event) -> None:
+    server = await _import_lazily(SERVER_MODULE)
+    await server.run_mcp_action_server(ready=ready)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global _mcp_task
-    _mcp_task = asyncio.create_task(run_mcp_action_server())
+    global _mcp_task, _ready
+    _ready = asyncio.Event()
+    _mcp_task = asyncio.create_task(_run_server(_ready))
     try:
         yield
     finally:
@@ -28,6 +45,18 @@ app = FastAPI(lifespan=lifespan)
 async def health():
     return {"ok": True}
 
+@app.get("/ready")
+async def ready():
+    # 서버 모듈 로드 + MCP 세션 풀 웜업이 끝났을 때만 200
+    if _ready is not None and _ready.is_set() and _mcp_task is not None and not _mcp_task.done():
+        return {"ready": True}
+    return Response(content='{"ready": false}', status_code=503, media_type="application/json")
+
+@app.get("/metrics")
+async def metrics():
+    module = await _import_lazily(METRICS_MODULE)
+    return Response(content=module.render_metrics(), media_type=module.CONTENT_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -15,6 +15,16 @@ from PIL import Image, ImageDraw, ImageFont
 import openai
 
 
+def _openai_client(api_key: str) -> openai.OpenAI:
+    """langchain_react의 공용 레이트 리미터를 거치는 클라이언트. 단독 설치면 기본 클라이언트."""
+    try:
+        from langchain_react.rate_limiter import rate_limited_client
+    except ImportError:
+        return openai.OpenAI(api_key=api_key)
+    # 429 재시도는 리미터 트랜스포트가 담당
+    return openai.OpenAI(api_key=api_key, http_client=rate_limited_client(), max_retries=0)
+
+
 class ImageGenerator:
     """이미지 생성 클래스 - OpenAI DALL-E를 사용"""
     
@@ -24,8 +34,8 @@ class ImageGenerator:
         if not self.openai_api_key:
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
             
-        # OpenAI 클라이언트 초기화
-        self.client = openai.OpenAI(api_key=self.openai_api_key)
+        # OpenAI 클라이언트 초기화 (langchain_react가 있으면 채팅 호출과 같은 레이트 리미터를 공유)
+        self.client = _openai_client(self.openai_api_key)
         
         # 출력 디렉토리 생성 (OS/환경 변수 기반, 기본은 프로젝트 루트의 outputs/images)
         output_dir_env = os.getenv("MCP_OUTPUT_DIR") or os.getenv("PGPT_WORK_DIR")
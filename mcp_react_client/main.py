@@ -22,6 +22,24 @@ from langchain_core.tools import tool
 from .image_generator import generate_single_image, generate_comic
 
 
+def _shared_model_kwargs() -> dict:
+    """langchain_react가 함께 설치돼 있으면 서버와 같은 응답 캐시/OpenAI 레이트 리미터를 붙입니다.
+
+    mcp-react-client 단독 설치에는 langchain_react가 없으므로 그때는 기본 클라이언트를 씁니다.
+    두 모듈 모두 import 시점에 PGPT_* 설정을 읽으므로 load_dotenv() 이후에 불러옵니다.
+    """
+    try:
+        from langchain_react.llm_cache import response_cache_from_env
+        from langchain_react.rate_limiter import rate_limited_async_client
+    except ImportError:
+        return {}
+    return {
+        "cache": response_cache_from_env(),  # PGPT_LLM_CACHE 설정 시 동일 프롬프트 재실행을 캐시에서 응답
+        "http_async_client": rate_limited_async_client(),
+        "max_retries": 0,  # 429 재시도는 레이트 리미터 트랜스포트가 담당
+    }
+
+
 @tool
 def create_image(prompt: str, filename: str = None, size: str = "1024x1024", quality: str = "standard") -> str:
     """
@@ -379,7 +397,8 @@ async def run_react_agent(tools: List, query: str, verbose=False):
     model = ChatOpenAI(
         model="gpt-4",
         temperature=0,
-        api_key=openai_api_key
+        api_key=openai_api_key,
+        **_shared_model_kwargs(),
     )
     
     # Create the ReAct agent
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from processgpt_agent_sdk import server as sdk_server
+
+from langchain_react import agent_server
+from langchain_react.agent_server import ConcurrentAgentServer
+
+
+@pytest.fixture
+def make_server(monkeypatch):
+    # Supabase 연결 없이 서버 객체만 만든다
+    monkeypatch.setattr(sdk_server, "initialize_db", lambda: None)
+
+    def _make(**kwargs):
+        return ConcurrentAgentServer(executor=None, **kwargs)
+
+    return _make
+
+
+def test_idle_delay_grows_exponentially_to_the_cap(make_server):
+    server = make_server(min_interval=0.25, max_interval=3, backoff=2, jitter=0)
+    delays = [server.next_idle_delay() for _ in range(8)]
+    assert delays == [0.25, 0.5, 1.0, 2.0, 3.0, 3.0, 3.0, 3.0]
+    # 오래 쉬어도 지수가 넘치지 않고 상한을 유지
+    server._idle_streak = 10_000
+    assert server.next_idle_delay() == 3.0
+
+
+def test_idle_delay_stays_within_jitter_bounds(make_server):
+    server = make_server(min_interval=1, max_interval=1, jitter=0.2)
+    delays = [server.next_idle_delay() for _ in range(500)]
+    assert all(0.8 <= d <= 1.2 for d in delays)
+    assert len(set(delays)) > 1  # 여러 워커가 같은 박자로 폴링하지 않도록 흩어짐
+
+
+def test_fixed_interval_when_not_adaptive(make_server):
+    server = make_server(polling_interval=5, adaptive=False)
+    assert [server.next_idle_delay() for _ in range(3)] == [5.0, 5.0, 5.0]
+
+
+def test_idle_delay_resets_after_claiming_work(make_server, monkeypatch):
+    server = make_server(min_interval=0.001, max_interval=1, backoff=2, jitter=0)
+    records = [None, None, None, {"id": "t1"}, None, None]
+    delays = []
+    processed = []
+
+    async def fake_poll(agent_orch, consumer_id):
+        if len(records) == 1:
+            server.is_running = False  # 마지막 빈 폴링 뒤 루프 종료
+        return records.pop(0)
+
+    async def fake_process(task_record):
+        processed.append(task_record["id"])
+
+    next_delay = server.next_idle_delay
+
+    def recording_delay():
+        delays.append(next_delay())
+        return delays[-1]
+
+    monkeypatch.setattr(agent_server, "polling_pending_todos", fake_poll)
+    monkeypatch.setattr(agent_server, "get_consumer_id", lambda: "worker-1")
+    monkeypatch.setattr(server, "_process_task", fake_process)
+    monkeypatch.setattr(server, "next_idle_delay", recording_delay)
+
+    asyncio.run(asyncio.wait_for(server.run(), 10))
+
+    assert processed == ["t1"]
+    # 빈 폴링 세 번 동안 늘어나다가, 작업을 가져온 뒤에는 최소 간격부터 다시 시작
+    assert delays == [0.001, 0.002, 0.004, 0.001, 0.002]
+    stats = server.stats()
+    assert stats["claimed"] == 1 and stats["empty"] == 5 and stats["polls"] == 6
+    assert stats["idle_sleep_s_total"] == pytest.approx(sum(delays))
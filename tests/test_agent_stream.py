@@ -0,0 +1,105 @@
+import asyncio
+import json
+import time
+from typing import List
+
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+from benchmarks.fakes import ScriptedChatModel
+from langchain_react.agent import _stream_agent
+from langchain_react.prompt_builder import count_tokens
+
+
+class PreambleChatModel(ScriptedChatModel):
+    """툴 호출 턴에도 `{...}`가 든 설명문을 먼저 흘리고, 턴마다 finish_reason 청크로 끝내는 모델."""
+
+    def _reply(self, messages: List[BaseMessage]) -> AIMessage:
+        reply = super()._reply(messages)
+        if reply.tool_calls:
+            reply.content = '계획: {"step": "조회"} 를 먼저 실행합니다.'
+        return reply
+
+    def _chunks(self, message: AIMessage):
+        yield from super()._chunks(message)
+        reason = "tool_calls" if message.tool_calls else "stop"
+        yield AIMessageChunk(content="", response_metadata={"finish_reason": reason})
+
+
+class TrailingUsageChatModel(PreambleChatModel):
+    """OpenAI처럼 finish_reason 뒤에 usage 청크가 늦게 오는 모델. 끝까지 읽으면 tail_s만큼 더 걸림."""
+
+    tail_s: float = 5.0
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            yield chunk
+        await asyncio.sleep(self.tail_s)
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata={
+            "input_tokens": 10, "output_tokens": 5, "total_tokens": 15,
+        }))
+
+
+@tool
+def lookup(code: str) -> str:
+    """값을 조회합니다."""
+    return "42"
+
+
+def _run(model):
+    agent = create_react_agent(model.bind_tools([lookup]), [lookup])
+    return asyncio.run(_stream_agent(agent, {"messages": [("user", "go")]}, {}, stop_on_json=True))
+
+
+def test_preamble_json_before_tool_calls_does_not_end_the_run():
+    model = PreambleChatModel(tool_calls=1, tool_name="lookup", final_json={"answer": 42})
+    result = _run(model)
+    assert result["final_json"] == {"answer": 42}
+    assert any(isinstance(m, ToolMessage) for m in result["messages"])
+    assert json.loads(result["messages"][-1].content) == {"answer": 42}
+
+
+def test_final_json_without_finish_reason_is_taken_at_stream_end():
+    model = ScriptedChatModel(tool_calls=1, tool_name="lookup", final_json={"answer": "done"})
+    result = _run(model)
+    assert result["final_json"] == {"answer": "done"}
+
+
+def test_final_turn_is_written_to_the_response_cache(tmp_path):
+    from langchain_react.llm_cache import SQLiteResponseCache
+
+    cache = SQLiteResponseCache(str(tmp_path / "cache.db"))
+    model = TrailingUsageChatModel(tool_calls=1, tool_name="lookup", final_json={"answer": 42}, cache=cache, tail_s=1.0)
+    started = time.monotonic()
+    result = _run(model)
+    # 최종 턴은 usage 청크를 기다리지 않고 멈춤(툴 호출 턴의 tail_s 한 번만 기다림)
+    assert time.monotonic() - started < model.tail_s * 2
+    assert result["final_json"] == {"answer": 42}
+    # 툴 호출 턴 + 일찍 멈춘 최종 답변 턴 모두 저장돼야 같은 작업 재실행 시 LLM을 다시 부르지 않음
+    assert cache.stats()["writes"] == 2
+
+    again = _run(model)
+    assert again["final_json"] == {"answer": 42}
+    assert cache.stats()["hits"] == 2
+
+
+def test_early_stop_still_reports_the_final_llm_call():
+    from benchmarks.fakes import InMemoryEventQueue
+    from langchain_react.callback_lisnter import QueueCallback
+
+    model = TrailingUsageChatModel(tool_calls=1, tool_name="lookup", final_json={"answer": 42}, tail_s=0.2)
+    callback = QueueCallback(InMemoryEventQueue(), "job-1")
+    agent = create_react_agent(model.bind_tools([lookup]), [lookup])
+    result = asyncio.run(_stream_agent(
+        agent, {"messages": [("user", "go")]}, {"config": {"callbacks": [callback]}}, stop_on_json=True,
+    ))
+    assert result["final_json"] == {"answer": 42}
+    usage = callback.llm_usage()
+    # 툴 호출 턴은 정상 종료, 최종 턴은 스트림을 일찍 닫았어도 추정 토큰으로 종료 기록
+    assert usage["calls"] == 2 and usage["errors"] == 0
+    # 툴 호출 턴은 usage 청크(10/5), 최종 턴은 로컬 추정(출력 토큰만)
+    assert usage["prompt_tokens"] == 10
+    assert usage["completion_tokens"] == 5 + count_tokens(json.dumps({"answer": 42}))
+    assert callback._llm_runs == {}
@@ -0,0 +1,58 @@
+import asyncio
+
+import aiosqlite
+
+from langchain_react.checkpoints import CheckpointStore
+
+
+def test_concurrent_saver_opens_one_connection(tmp_path, monkeypatch):
+    connects = []
+    real_connect = aiosqlite.connect
+
+    def counting_connect(*args, **kwargs):
+        connects.append(args)
+        return real_connect(*args, **kwargs)
+
+    monkeypatch.setattr(aiosqlite, "connect", counting_connect)
+    store = CheckpointStore(str(tmp_path / "ckpt.db"))
+
+    async def run():
+        try:
+            return await asyncio.gather(*(store.saver() for _ in range(4)))
+        finally:
+            await store.aclose()
+
+    savers = asyncio.run(run())
+    assert len(connects) == 1
+    assert all(s is savers[0] for s in savers)
+
+
+def test_failed_setup_closes_connection_and_can_retry(tmp_path, monkeypatch):
+    store = CheckpointStore(str(tmp_path / "ckpt.db"))
+    opened = []
+    real_connect = aiosqlite.connect
+
+    def tracking_connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    async def failing_prune(conn, saver):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(aiosqlite, "connect", tracking_connect)
+
+    async def run():
+        monkeypatch.setattr(store, "_prune", failing_prune)
+        try:
+            await store.saver()
+        except RuntimeError:
+            pass
+        assert store._saver is None and store._conn is None
+        assert opened[0]._connection is None  # 실패한 연결은 닫힘
+        monkeypatch.undo()
+        saver = await store.saver()
+        await store.aclose()
+        return saver
+
+    assert asyncio.run(run()) is not None
@@ -0,0 +1,40 @@
+import sys
+
+from langchain_react import llm_cache
+from mcp_react_client import main as cli
+
+
+def test_cli_uses_response_cache_when_langchain_react_is_installed(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "_cache", None)
+    monkeypatch.setenv("PGPT_LLM_CACHE", str(tmp_path / "cache.db"))
+    kwargs = cli._shared_model_kwargs()
+    assert isinstance(kwargs["cache"], llm_cache.SQLiteResponseCache)
+
+
+def test_cli_runs_without_langchain_react(monkeypatch):
+    # mcp-react-client 단독 설치: langchain_react 모듈을 찾을 수 없음
+    monkeypatch.setitem(sys.modules, "langchain_react.llm_cache", None)
+    assert cli._shared_model_kwargs() == {}
+
+
+def test_cli_chat_and_image_clients_share_the_rate_limiter(monkeypatch):
+    from langchain_react.rate_limiter import RateLimitedAsyncTransport, RateLimitedTransport, get_rate_limiter
+    from mcp_react_client import image_generator
+
+    kwargs = cli._shared_model_kwargs()
+    assert isinstance(kwargs["http_async_client"]._transport, RateLimitedAsyncTransport)
+    assert kwargs["max_retries"] == 0
+
+    client = image_generator._openai_client("sk-test")
+    transport = client._client._transport
+    assert isinstance(transport, RateLimitedTransport)
+    assert transport._limiter is get_rate_limiter() is kwargs["http_async_client"]._transport._limiter
+    assert client.max_retries == 0
+
+
+def test_cli_image_client_without_langchain_react(monkeypatch):
+    from mcp_react_client import image_generator
+
+    monkeypatch.setitem(sys.modules, "langchain_react.rate_limiter", None)
+    client = image_generator._openai_client("sk-test")
+    assert client.max_retries > 0
@@ -0,0 +1,56 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from langchain_react.context_compactor import ContextStats, compact_context, compact_messages
+
+
+def _turn(i, output):
+    call_id = f"call_{i}"
+    return [
+        AIMessage(content="", tool_calls=[{"name": "read_file", "args": {"path": f"{i}.txt"}, "id": call_id}]),
+        ToolMessage(content=output, tool_call_id=call_id),
+    ]
+
+
+def _conversation(turns, output_words=2000):
+    messages = [HumanMessage(content="작업 지시")]
+    for i in range(turns):
+        messages += _turn(i, " ".join(f"line{i}_{n}" for n in range(output_words)))
+    return messages
+
+
+def test_short_conversations_are_untouched():
+    messages = [HumanMessage(content="hi"), AIMessage(content="yo")]
+    result, report = compact_messages(messages)
+    assert result == messages and report["truncated"] == report["elided"] == 0
+
+
+def test_old_tool_outputs_are_truncated_and_recent_turns_kept():
+    messages = _conversation(4)
+    result, report = compact_messages(messages, max_tokens=0, keep_turns=2, tool_output_tokens=50)
+    assert report["truncated"] == 2 and report["elided"] == 0
+    assert report["after"] < report["before"]
+    assert result[-1] is messages[-1] and result[-3] is messages[-3]  # 최근 2턴은 그대로
+    assert len(result[2].content) < len(messages[2].content)
+    # 원본 메시지는 바뀌지 않고, tool_call ↔ ToolMessage 짝도 유지
+    assert len(messages[2].content) > 1000
+    assert [type(m) for m in result] == [type(m) for m in messages]
+    assert [m.tool_call_id for m in result if isinstance(m, ToolMessage)] == ["call_0", "call_1", "call_2", "call_3"]
+
+
+def test_over_budget_elides_oldest_then_shrinks_recent():
+    messages = _conversation(4)
+    result, report = compact_messages(messages, max_tokens=1500, keep_turns=2, tool_output_tokens=200)
+    assert report["elided"] == 2
+    assert result[2].content.startswith("[이전 툴 출력 생략")
+    assert report["after"] <= 1500 + 50
+
+
+def test_hook_records_stats_without_touching_state():
+    messages = _conversation(4)
+    stats = ContextStats()
+    update = compact_context({"messages": messages}, {"configurable": {"context_stats": stats}})
+    assert set(update) == {"llm_input_messages"}
+    summary = stats.stats()
+    assert summary["model_calls"] == 1
+    assert summary["tokens_saved"] == summary["tokens_before"] - summary["tokens_after"] > 0
+    assert stats.last_tokens == summary["tokens_after"]
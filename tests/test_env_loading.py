@@ -0,0 +1,44 @@
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_dotenv_is_loaded_before_module_settings_are_read(tmp_path):
+    # main.py 옆의 .env가 import 시점에 읽는 PGPT_* 상수에 반영되는지 확인
+    shutil.copy(os.path.join(ROOT, "main.py"), tmp_path / "main.py")
+    (tmp_path / ".env").write_text("PGPT_PROMPT_BUDGET_FEEDBACK=321\n")
+    env = {k: v for k, v in os.environ.items() if k != "PGPT_PROMPT_BUDGET_FEEDBACK"}
+    env["PYTHONPATH"] = os.pathsep.join([str(tmp_path), ROOT])
+    code = "import main; from langchain_react.prompt_builder import SECTION_BUDGETS; print(SECTION_BUDGETS['feedback'])"
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "321"
+
+
+def test_server_module_entry_point_loads_dotenv(tmp_path):
+    # python -m langchain_react.server 로 띄울 때도 패키지 옆 .env가 PGPT_* 상수에 반영돼야 함
+    shutil.copytree(
+        os.path.join(ROOT, "langchain_react"),
+        tmp_path / "langchain_react",
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+    (tmp_path / ".env").write_text("PGPT_PROMPT_BUDGET_FEEDBACK=654\n")
+    env = {k: v for k, v in os.environ.items() if k != "PGPT_PROMPT_BUDGET_FEEDBACK"}
+    env["PYTHONPATH"] = str(tmp_path)
+    code = (
+        "import asyncio, runpy\n"
+        "asyncio.run = lambda coro: coro.close()  # 서버 루프는 띄우지 않음\n"
+        "runpy.run_module('langchain_react.server', run_name='__main__', alter_sys=True)\n"
+        "from langchain_react.prompt_builder import SECTION_BUDGETS\n"
+        "print(SECTION_BUDGETS['feedback'])\n"
+    )
+    # 다른 폴더에서 실행해도 패키지 기준으로 .env를 찾음
+    (tmp_path / "run").mkdir()
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=tmp_path / "run", env=env, capture_output=True, text=True, timeout=120
+    )
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "654"
@@ -0,0 +1,93 @@
+import asyncio
+
+from benchmarks.fakes import InMemoryEventQueue
+from langchain_react.event_pipeline import PIPELINE_STATS, EventPipeline, is_low_priority
+
+
+def _event(event_type, n=0):
+    return {"type": "event", "data": {"event_type": event_type, "n": n}}
+
+
+def test_priority_classification():
+    assert is_low_priority(_event("tool_usage_started"))
+    assert is_low_priority(_event("llm_finished"))
+    assert not is_low_priority(_event("task_completed"))
+    assert not is_low_priority({"type": "output", "data": {}})
+    assert not is_low_priority("raw")
+
+
+def test_unstarted_or_closed_pipeline_delivers_immediately():
+    sink = InMemoryEventQueue()
+    pipeline = EventPipeline(sink)
+    pipeline.enqueue_event(_event("task_started"))
+    assert sink.event_types() == ["task_started"]
+    pipeline.close()
+    pipeline.enqueue_event(_event("task_cancelled"))
+    assert sink.event_types() == ["task_started", "task_cancelled"]
+
+
+def test_overflow_drops_oldest_low_priority_but_keeps_high_and_order():
+    sink = InMemoryEventQueue()
+
+    async def run():
+        pipeline = EventPipeline(sink, max_low_priority=2, flush_interval=10).start()
+        pipeline.enqueue_event(_event("task_started"))
+        for i in range(4):
+            pipeline.enqueue_event(_event("tool_usage_started", i))
+        pipeline.enqueue_event(_event("task_completed"))
+        assert sink.events == []  # 아직 버퍼에만 있음
+        pipeline.close()
+        return pipeline
+
+    pipeline = asyncio.run(run())
+    assert pipeline.dropped == 2
+    assert [(e["data"]["event_type"], e["data"]["n"]) for e in sink.events] == [
+        ("task_started", 0),
+        ("tool_usage_started", 2),
+        ("tool_usage_started", 3),
+        ("task_completed", 0),
+    ]
+
+
+def test_background_flush_delivers_at_most_batch_size_per_round():
+    rounds = []
+
+    class RoundRecordingSink(InMemoryEventQueue):
+        def enqueue_event(self, payload):
+            # 전달 시점의 flush 횟수로 어느 묶음에서 나왔는지 기록
+            rounds.append(PIPELINE_STATS["flushes"])
+            super().enqueue_event(payload)
+
+    sink = RoundRecordingSink()
+
+    async def run():
+        pipeline = EventPipeline(sink, batch_size=2, flush_interval=0).start()
+        for i in range(5):
+            pipeline.enqueue_event(_event("llm_started", i))
+        assert sink.events == []  # enqueue는 버퍼에만 쌓고 바로 반환
+        for _ in range(20):
+            await asyncio.sleep(0)
+        delivered = len(sink.events)
+        pipeline.close()
+        return delivered
+
+    start = PIPELINE_STATS["flushes"]
+    assert asyncio.run(run()) == 5
+    assert [e["data"]["n"] for e in sink.events] == [0, 1, 2, 3, 4]
+    # 2개, 2개, 1개씩 세 번에 나뉘어 전달 (이벤트당 싱크 호출 한 번)
+    assert [r - start for r in rounds] == [0, 0, 1, 1, 2]
+    assert PIPELINE_STATS["flushes"] - start == 3
+
+
+def test_delivery_errors_do_not_break_the_pipeline():
+    class FlakySink(InMemoryEventQueue):
+        def enqueue_event(self, payload):
+            if payload["data"]["n"] == 1:
+                raise RuntimeError("sink down")
+            super().enqueue_event(payload)
+
+    sink = FlakySink()
+    pipeline = EventPipeline(sink)
+    for i in range(3):
+        pipeline.enqueue_event(_event("task_started", i))
+    assert [e["data"]["n"] for e in sink.events] == [0, 2]
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import os
+import sys
+
+from mcp import StdioServerParameters
+
+from benchmarks.bench_executor import STUB_SERVER
+from benchmarks.fakes import InMemoryEventQueue, ScriptedChatModel, make_context
+
+
+async def _wait_until(predicate, timeout: float = 30.0) -> None:
+    async def _poll():
+        while not predicate():
+            await asyncio.sleep(0.02)
+
+    await asyncio.wait_for(_poll(), timeout)
+
+
+def test_cancel_frees_slot_and_lease_for_queued_todo(tmp_path, monkeypatch):
+    monkeypatch.setenv("PGPT_WORK_DIR", str(tmp_path))
+    logging.disable(logging.WARNING)
+    from langchain_react.server import MCPActionExecutor
+    from langchain_react.session_pool import MCPSessionPool
+
+    # 첫 작업은 LLM 호출에서 오래 머물고, 두 번째 작업은 툴 한 번 뒤 바로 끝나는 모델을 받음
+    models = iter([
+        ScriptedChatModel(tool_calls=0, latency_ms=60_000),
+        ScriptedChatModel(tool_calls=1, final_json={"summary": "second"}),
+    ])
+    pool = MCPSessionPool(StdioServerParameters(command=sys.executable, args=[STUB_SERVER]), size=1)
+    executor = MCPActionExecutor(session_pool=pool, max_concurrency=1, model_factory=lambda: next(models))
+
+    async def run():
+        await executor.start()
+        try:
+            first_queue, second_queue = InMemoryEventQueue(), InMemoryEventQueue()
+            first_ctx, second_ctx = make_context(0), make_context(1)
+            first = asyncio.create_task(executor.execute(first_ctx, first_queue))
+            await _wait_until(lambda: pool.stats()["in_use"] == 1)
+            second = asyncio.create_task(executor.execute(second_ctx, second_queue))
+            await _wait_until(lambda: executor.stats()["scheduler"]["queue_depth"] == 1)
+
+            await asyncio.wait_for(executor.cancel(first_ctx, first_queue), 30)
+            await asyncio.wait_for(first, 30)
+            await asyncio.wait_for(second, 60)
+
+            cancelled = [
+                e["data"] for e in first_queue.events
+                if isinstance(e, dict) and (e.get("data") or {}).get("event_type") == "task_cancelled"
+            ]
+            assert len(cancelled) == 1
+            # 60초 LLM 호출을 기다리지 않고 곧바로 슬롯/세션이 풀려야 함
+            assert cancelled[0]["data"]["freed"] is True
+            assert cancelled[0]["data"]["freed_ms"] < 5000
+            assert "task_completed" not in first_queue.event_types()
+            assert "task_completed" in second_queue.event_types()
+            completed = next(
+                e["data"] for e in second_queue.events
+                if isinstance(e, dict) and (e.get("data") or {}).get("event_type") == "task_completed"
+            )
+            # LLM 사용량은 완료 이벤트의 data 안에 실림
+            assert "llm_usage" not in completed
+            assert completed["data"]["summary"] == "second"
+            assert completed["data"]["llm_usage"]["calls"] >= 2
+
+            stats = executor.stats()
+            assert stats["scheduler"]["active"] == 0
+            assert stats["scheduler"]["queue_depth"] == 0
+            assert stats["mcp_pool"]["in_use"] == 0
+            # 취소된 작업과 끝난 작업 모두 작업 전용 폴더가 지워져 있어야 함
+            assert os.listdir(tmp_path / "tasks") == []
+        finally:
+            await executor.close()
+            logging.disable(logging.NOTSET)
+
+    asyncio.run(run())
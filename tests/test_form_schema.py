@@ -0,0 +1,48 @@
+from langchain_react.form_schema import FormSchemaCache, compile_form_schema, validate_payload
+
+
+FORM_TYPES = [
+    {"key": "title", "type": "text", "text": "제목", "required": True},
+    {"key": "amount", "type": "number"},
+    {"key": "tags", "type": "checkbox", "is_required": "true"},
+    {"key": "memo", "type": "textarea", "required": False},
+]
+
+
+def test_only_fields_marked_required_are_required():
+    schema = compile_form_schema(FORM_TYPES)
+    assert schema["required"] == ["title", "tags"]
+    assert schema["properties"]["title"] == {"type": "string", "description": "제목"}
+    assert schema["properties"]["tags"] == {"type": "array", "items": {"type": "string"}}
+
+
+def test_missing_optional_field_is_valid():
+    schema = compile_form_schema(FORM_TYPES)
+    assert validate_payload({"title": "a", "tags": []}, schema) == []
+    assert validate_payload({"tags": ["x"]}, schema) == ["$.title: required"]
+
+
+def test_type_errors_are_reported_by_path():
+    schema = compile_form_schema(FORM_TYPES)
+    errors = validate_payload({"title": "a", "tags": ["x", 1], "amount": True}, schema)
+    assert errors == ["$.amount: expected number, got bool", "$.tags[1]: expected string, got int"]
+    assert validate_payload([], schema) == ["$: expected object, got list"]
+
+
+def test_default_only_or_empty_form_has_no_schema():
+    assert compile_form_schema([{"key": "result", "type": "default"}]) is None
+    assert compile_form_schema(None) is None
+    assert compile_form_schema({"score": "integer"})["properties"] == {"score": {"type": "integer"}}
+
+
+def test_cache_recompiles_when_definition_changes():
+    cache = FormSchemaCache()
+    first = cache.get("f1", FORM_TYPES)
+    assert cache.get("f1", FORM_TYPES) is first
+    changed = cache.get("f1", FORM_TYPES[:1])
+    assert changed is not first and list(changed["properties"]) == ["title"]
+    for status in ("valid", "repaired", "failed", "valid"):
+        cache.record(status)
+    stats = cache.stats()
+    assert stats["first_pass_failure_rate"] == 0.5
+    assert stats["final_failure_rate"] == 0.25
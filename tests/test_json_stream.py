@@ -0,0 +1,50 @@
+from langchain_react.json_stream import JsonObjectExtractor, extract_json, loads_lenient, strip_trailing_commas
+
+
+def _feed_chunks(text, size):
+    extractor = JsonObjectExtractor()
+    for i in range(0, len(text), size):
+        if extractor.feed(text[i:i + size]) is not None:
+            return extractor.result, i + size
+    return None, len(text)
+
+
+def test_object_is_returned_as_soon_as_it_closes():
+    text = '설명 {"a": {"b": [1, 2]}, "c": "x"} 뒤에 오는 말'
+    result, consumed = _feed_chunks(text, 3)
+    assert result == {"a": {"b": [1, 2]}, "c": "x"}
+    assert consumed < len(text)
+
+
+def test_braces_and_escapes_inside_strings_are_ignored():
+    text = '{"text": "괄호 } 와 \\" 따옴표 {", "n": 1}'
+    assert _feed_chunks(text, 1)[0] == {"text": '괄호 } 와 " 따옴표 {', "n": 1}
+
+
+def test_non_object_candidates_are_skipped():
+    extractor = JsonObjectExtractor()
+    assert extractor.feed("{not json} 그리고 ") is None
+    assert extractor.feed('{"ok": true}') == {"ok": True}
+    # 완료 후 추가 입력은 무시
+    assert extractor.feed('{"other": 1}') == {"ok": True}
+
+
+def test_reset_starts_a_new_search():
+    extractor = JsonObjectExtractor()
+    extractor.feed('{"a": 1}')
+    extractor.reset()
+    assert extractor.result is None and not extractor.done
+    assert extractor.feed('{"b": 2}') == {"b": 2}
+
+
+def test_trailing_commas_are_tolerated_outside_strings():
+    assert strip_trailing_commas('{"a": [1, 2, ], "s": ",}",\n}') == '{"a": [1, 2 ], "s": ",}"\n}'
+    assert loads_lenient('{"a": 1,}') == {"a": 1}
+    assert loads_lenient("not json") is None
+
+
+def test_extract_json_prefers_code_fence_and_falls_back_to_text():
+    assert extract_json('앞 {"x": 0}\n```json\n{"x": 1}\n```') == {"x": 1}
+    assert extract_json('답: {"x": 2,}') == {"x": 2}
+    assert extract_json("그냥 문장") == {"result": "그냥 문장"}
+    assert extract_json("   ") == {}
@@ -0,0 +1,147 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration
+
+from langchain_react import llm_cache
+from langchain_react.llm_cache import SQLiteResponseCache
+
+LLM = "scripted-fake|temperature=0"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: now[0], monotonic=lambda: now[0]))
+    return now
+
+
+def _prompt(*messages) -> str:
+    return dumps(list(messages))
+
+
+def _gen(text: str):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def _conversation(call_id: str, msg_id: str) -> str:
+    return _prompt(
+        HumanMessage(content="go", id=msg_id),
+        AIMessage(
+            content="",
+            id=f"run-{msg_id}",
+            tool_calls=[{"name": "lookup", "args": {"code": "A"}, "id": call_id}],
+            response_metadata={"model_name": "gpt", "finish_reason": "tool_calls"},
+            usage_metadata={"input_tokens": 3, "output_tokens": 5, "total_tokens": 8},
+        ),
+        ToolMessage(content="42", tool_call_id=call_id),
+    )
+
+
+def test_key_ignores_message_ids_metadata_and_tool_call_ids(tmp_path, clock):
+    cache = SQLiteResponseCache(str(tmp_path / "c.db"))
+    cache.update(_conversation("call_aaa", "m1"), LLM, _gen("answer"))
+
+    hit = cache.lookup(_conversation("call_zzz", "m2"), LLM)
+    assert hit is not None and hit[0].message.content == "answer"
+    # 모델 파라미터가 다르면 다른 키
+    assert cache.lookup(_conversation("call_aaa", "m1"), LLM + "|temperature=1") is None
+
+
+def test_hit_miss_and_saved_ms(tmp_path, clock):
+    cache = SQLiteResponseCache(str(tmp_path / "c.db"))
+    prompt = _prompt(HumanMessage(content="hello"))
+    assert cache.lookup(prompt, LLM) is None
+    clock[0] += 1.5  # 생성에 1.5초 걸린 것으로 간주
+    cache.update(prompt, LLM, _gen("hi"))
+
+    assert cache.lookup(prompt, LLM)[0].message.content == "hi"
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["writes"] == 1
+    assert stats["saved_ms_total"] == pytest.approx(1500.0)
+    assert stats["hit_ratio"] == 0.5
+    assert stats["entries"] == 1 and stats["bytes"] > 0
+
+
+def test_expired_entry_is_a_miss(tmp_path, clock):
+    cache = SQLiteResponseCache(str(tmp_path / "c.db"), ttl=60)
+    prompt = _prompt(HumanMessage(content="hello"))
+    cache.update(prompt, LLM, _gen("hi"))
+    clock[0] += 61
+    assert cache.lookup(prompt, LLM) is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 0
+
+
+def test_max_entries_evicts_least_recently_used(tmp_path, clock):
+    cache = SQLiteResponseCache(str(tmp_path / "c.db"), max_entries=2)
+    prompts = [_prompt(HumanMessage(content=f"q{i}")) for i in range(3)]
+    cache.update(prompts[0], LLM, _gen("a0"))
+    clock[0] += 1
+    cache.update(prompts[1], LLM, _gen("a1"))
+    clock[0] += 1
+    assert cache.lookup(prompts[0], LLM) is not None  # q0을 최근 사용으로 갱신
+    clock[0] += 1
+    cache.update(prompts[2], LLM, _gen("a2"))
+
+    assert cache.lookup(prompts[1], LLM) is None
+    assert cache.lookup(prompts[0], LLM) is not None
+    assert cache.lookup(prompts[2], LLM) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_max_bytes_caps_total_size(tmp_path, clock):
+    cache = SQLiteResponseCache(str(tmp_path / "c.db"), max_bytes=3000)
+    for i in range(5):
+        clock[0] += 1
+        cache.update(_prompt(HumanMessage(content=f"q{i}")), LLM, _gen("x" * 1000))
+    stats = cache.stats()
+    assert 0 < stats["bytes"] <= 3000
+    assert stats["entries"] < 5
+    assert cache.lookup(_prompt(HumanMessage(content="q4")), LLM) is not None
+
+
+def test_unreadable_entry_counts_as_error_not_exception(tmp_path, clock):
+    cache = SQLiteResponseCache(str(tmp_path / "c.db"))
+    prompt = _prompt(HumanMessage(content="hello"))
+    cache.update(prompt, LLM, _gen("hi"))
+    cache._conn.execute("UPDATE llm_cache SET value = 'not json'")
+
+    assert cache.lookup(prompt, LLM) is None
+    assert cache.stats()["errors"] == 1
+
+
+def test_response_cache_from_env_is_off_without_path(monkeypatch):
+    monkeypatch.setattr(llm_cache, "_cache", None)
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", "")
+    monkeypatch.delenv("PGPT_LLM_CACHE", raising=False)
+    assert llm_cache.response_cache_from_env() is None
+
+
+def test_response_cache_from_env_is_a_singleton(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "_cache", None)
+    monkeypatch.setenv("PGPT_LLM_CACHE", str(tmp_path / "env.db"))
+    first = llm_cache.response_cache_from_env()
+    assert first is not None and first.path == str(tmp_path / "env.db")
+    assert llm_cache.response_cache_from_env() is first
+
+
+def test_pending_miss_is_written_only_when_generation_did_not_finish(tmp_path, clock):
+    cache = SQLiteResponseCache(str(tmp_path / "c.db"))
+    done, cut = _prompt(HumanMessage(content="done")), _prompt(HumanMessage(content="cut"))
+
+    async def run():
+        with llm_cache.track_pending() as pending:
+            assert cache.lookup(done, LLM) is None
+            cache.update(done, LLM, _gen("finished"))  # langchain이 직접 저장 → 슬롯 비움
+            assert not await llm_cache.write_pending(pending, AIMessage(content="ignored"))
+            assert cache.lookup(cut, LLM) is None  # 생성 도중 스트림이 닫힌 호출
+            assert await llm_cache.write_pending(pending, AIMessage(content="partial"))
+
+    asyncio.run(run())
+    assert cache.lookup(done, LLM)[0].message.content == "finished"
+    assert cache.lookup(cut, LLM)[0].message.content == "partial"
+    assert cache.stats()["writes"] == 2
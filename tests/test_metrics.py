@@ -0,0 +1,39 @@
+from prometheus_client import CollectorRegistry, generate_latest
+
+from langchain_react import metrics
+
+
+def _render(source):
+    metrics.register_stats_source(*source)
+    registry = CollectorRegistry()
+    registry.register(metrics._StatsCollector())
+    try:
+        return generate_latest(registry).decode()
+    finally:
+        metrics._stats_sources.clear()
+
+
+def test_per_model_and_tool_stats_become_labels_not_metric_names():
+    stats = {
+        "scheduler": {"active": 2, "limit": 4},
+        "openai_rate_limits": {"gpt-4": {"throttled": 1, "rpm_current": 3}, "gpt_4": {"throttled": 2, "rpm_current": 5}},
+        "tool_limits": {"read_file": {"active": 1}, "run_python_code": {"active": 0}},
+        "flag": True,
+    }
+    text = _render(("executor", lambda: stats, {"openai_rate_limits": "model", "tool_limits": "tool"}))
+
+    assert "react_executor_scheduler_active 2.0" in text
+    assert 'react_executor_openai_rate_limits_throttled{model="gpt-4"} 1.0' in text
+    assert 'react_executor_openai_rate_limits_throttled{model="gpt_4"} 2.0' in text
+    assert 'react_executor_tool_limits_active{tool="read_file"} 1.0' in text
+    # 모델 이름이 지표 이름에 들어가지 않고, 지표 종류는 한 번씩만 정의됨
+    assert "gpt_4_throttled" not in text
+    assert text.count("# TYPE react_executor_openai_rate_limits_throttled gauge") == 1
+    assert "flag" not in text
+
+
+def test_failing_source_is_skipped():
+    def broken():
+        raise RuntimeError("down")
+
+    assert "react_poller" not in _render(("poller", broken))
@@ -0,0 +1,42 @@
+from langchain_core.messages import ToolMessage
+
+from langchain_react.callback_lisnter import _PreviewRepr, bounded_preview
+
+
+def test_short_values_are_rendered_whole():
+    assert bounded_preview(None, 10) == ""
+    assert bounded_preview("abc", 10) == "abc"
+    assert bounded_preview(42, 10) == "42"
+    assert bounded_preview({"a": 1}, 20) == "{'a': 1}"
+
+
+def test_long_string_is_cut_at_limit():
+    assert bounded_preview("x" * 100, 10) == "x" * 10 + "…"
+
+
+def test_message_objects_preview_their_content():
+    message = ToolMessage(content="hello " * 100, tool_call_id="call_0")
+    assert bounded_preview(message, 11) == "hello hello…"
+
+
+def test_large_containers_stay_within_budget():
+    rows = [{"id": i, "name": f"row-{i}"} for i in range(100_000)]
+    preview = bounded_preview(rows, 120)
+    assert len(preview) == 121 and preview.endswith("…")
+    assert preview.startswith("[{'id': 0, 'name': 'row-0'}")
+
+    columns = {col: list(range(100_000)) for col in ("id", "value")}
+    assert len(bounded_preview(columns, 80)) <= 81
+
+
+def test_budget_exhaustion_uses_ellipsis_for_remaining_items():
+    preview = _PreviewRepr(20).repr({"a": "x" * 50, "b": 1, "c": 2})
+    assert preview == "{'a': '" + "x" * 18 + "'..., ...}"
+    assert _PreviewRepr(20).repr([["deep"]] * 3) == "[['deep'], ['deep'], ['deep']]"
+
+
+def test_bytes_and_sets_are_previewed():
+    assert bounded_preview(b"\x89PNG" * 1000, 20).startswith("b'\\x89PNG")
+    assert len(bounded_preview(b"\x89PNG" * 1000, 20)) == 21
+    assert bounded_preview({1, 2, 3}, 50) == "{1, 2, 3}"
+    assert bounded_preview(frozenset(), 50) == "frozenset()"
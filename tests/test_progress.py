@@ -0,0 +1,97 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.tools import tool
+
+from benchmarks.fakes import InMemoryEventQueue, ScriptedChatModel
+from langchain_react import progress as progress_module
+from langchain_react.agent import run_react_agent
+from langchain_react.progress import ProgressStreamer
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(progress_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def _progress(queue: InMemoryEventQueue):
+    return [e["data"]["data"] for e in queue.events if e["data"]["event_type"] == "agent_progress"]
+
+
+def test_emits_only_after_min_chars_and_interval(clock):
+    queue = InMemoryEventQueue()
+    streamer = ProgressStreamer(queue, "job-1", interval=0.25, min_chars=5, max_chars=100)
+
+    streamer.feed("abc", "m1")
+    assert _progress(queue) == []  # min_chars 미만
+    streamer.feed("de", "m1")
+    assert [d["delta"] for d in _progress(queue)] == ["abcde"]  # 첫 발행은 간격 제한 없음
+
+    clock[0] += 0.1
+    streamer.feed("fghijk", "m1")
+    assert len(_progress(queue)) == 1  # 간격(0.25초) 안이면 글자 수가 차도 보류
+    clock[0] += 0.2
+    streamer.feed("l", "m1")
+    assert [d["delta"] for d in _progress(queue)] == ["abcde", "fghijkl"]
+    assert [d["seq"] for d in _progress(queue)] == [1, 2]
+
+
+def test_max_chars_flushes_regardless_of_interval(clock):
+    queue = InMemoryEventQueue()
+    streamer = ProgressStreamer(queue, "job-1", interval=10, min_chars=5, max_chars=6)
+
+    streamer.feed("12345", "m1")
+    streamer.feed("678", "m1")  # 간격 안 + max 미만 → 보류
+    streamer.feed("9ab", "m1")  # 버퍼가 max_chars 이상 → 즉시 발행
+    assert [d["delta"] for d in _progress(queue)] == ["12345", "6789ab"]
+
+
+def test_turn_end_flushes_remainder_and_marks_kind(clock):
+    queue = InMemoryEventQueue()
+    streamer = ProgressStreamer(queue, "job-1", todo_id="t1", interval=10, min_chars=100)
+
+    streamer.feed("도구를 호출합니다", "m1")
+    streamer.end_turn(reasoning=True)
+    streamer.feed('{"answer"', "m2")
+    streamer.feed(": 42}", "m3")  # 메시지가 바뀌면 이전 턴을 answer로 마감
+    streamer.end_turn(reasoning=False)
+    streamer.end_turn(reasoning=False)  # 열린 턴이 없으면 아무것도 보내지 않음
+
+    assert _progress(queue) == [
+        {"message_id": "m1", "delta": "도구를 호출합니다", "final": False, "seq": 1},
+        {"message_id": "m1", "final": True, "kind": "reasoning", "seq": 2},
+        {"message_id": "m2", "delta": '{"answer"', "final": False, "seq": 3},
+        {"message_id": "m2", "final": True, "kind": "answer", "seq": 4},
+        {"message_id": "m3", "delta": ": 42}", "final": False, "seq": 5},
+        {"message_id": "m3", "final": True, "kind": "answer", "seq": 6},
+    ]
+    assert all(e["data"]["todo_id"] == "t1" for e in queue.events)
+    assert streamer.stats() == {"events": 6, "chars": len("도구를 호출합니다") + len('{"answer": 42}'), "first_output_ms": 0.0}
+
+
+@tool
+def lookup(code: str) -> str:
+    """값을 조회합니다."""
+    return "42"
+
+
+def test_streamed_answer_is_delivered_in_full_when_the_run_completes():
+    queue = InMemoryEventQueue()
+    final = {"summary": "보고서 " * 40}
+    model = ScriptedChatModel(tool_calls=1, tool_name="lookup", final_json=final, chunk_size=4)
+
+    response = asyncio.run(run_react_agent([lookup], "go", event_queue=queue, model=model, stop_on_json=True))
+
+    events = _progress(queue)
+    answer_id = events[-1]["message_id"]
+    assert events[-1]["final"] is True and events[-1]["kind"] == "answer"
+    assert [e["kind"] for e in events if e["final"]] == ["reasoning", "answer"]  # 툴 호출 턴, 최종 답변 턴
+    deltas = "".join(e["delta"] for e in events if e["message_id"] == answer_id and not e["final"])
+    # 간격/글자 수 제한에 보류된 마지막 조각까지 완료 시점에 모두 전달
+    assert json.loads(deltas) == final
+    assert response["progress"]["chars"] >= len(deltas)
+    assert response["progress"]["events"] == len(events)
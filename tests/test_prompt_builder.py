@@ -0,0 +1,89 @@
+import json
+
+from langchain_react.prompt_builder import (
+    TRUNCATION_MARK,
+    build_composite_query,
+    compress_form_html,
+    compress_form_types,
+    count_tokens,
+    truncate_to_tokens,
+)
+
+
+def _form_types(n: int = 40):
+    return [
+        {
+            "key": f"field_{i}",
+            "type": "select",
+            "text": f"항목 {i}",
+            "required": i % 2 == 0,
+            "description": "선택지 중 하나를 고르세요. " * 5,
+            "options": [f"옵션 {j}" for j in range(10)],
+        }
+        for i in range(n)
+    ]
+
+
+def _section(query: str, title: str) -> str:
+    return query.split(f"[{title}]\n", 1)[1].split("\n\n", 1)[0]
+
+
+def test_truncate_keeps_head_within_budget():
+    text = "가나다라 " * 500
+    assert truncate_to_tokens(text, 0) == text
+    assert truncate_to_tokens("짧은 글", 100) == "짧은 글"
+    cut = truncate_to_tokens(text, 50)
+    assert cut.endswith(TRUNCATION_MARK)
+    assert text.startswith(cut[: -len(TRUNCATION_MARK)])
+    assert count_tokens(cut[: -len(TRUNCATION_MARK)]) <= 50
+
+
+def test_sections_are_budgeted_and_reported():
+    query, report = build_composite_query(
+        activity_name="보고서 작성",
+        description="지시 " * 2000,
+        budgets={"description": 40},
+    )
+    assert "[이전결과물]" not in query and "[피드백 내용]" not in query
+    assert _section(query, "지시사항").endswith(TRUNCATION_MARK.strip())
+    assert report["description"] <= 40 + count_tokens("[지시사항]\n" + TRUNCATION_MARK + "\n\n")
+    assert report["total"] == sum(v for k, v in report.items() if k != "total")
+    assert set(report) == {"activity", "description", "instructions", "total"}
+
+
+def test_form_types_within_budget_are_kept_verbatim():
+    form_types = _form_types(2)
+    assert json.loads(compress_form_types(form_types, 0)) == form_types
+    assert json.loads(compress_form_types(form_types, 10_000)) == form_types
+
+
+def test_form_types_over_budget_drop_attributes_not_keys():
+    form_types = _form_types()
+    budget = count_tokens(json.dumps(form_types, ensure_ascii=False, separators=(",", ":"))) // 3
+    query, _ = build_composite_query(form_types=form_types, budgets={"form_types": budget})
+    fields = json.loads(_section(query, "form_type"))
+    assert [f["key"] for f in fields] == [f["key"] for f in form_types]
+    assert all("description" not in f and "options" not in f for f in fields)
+    # 키/타입/라벨/필수 표시는 유지
+    assert fields[0] == {"key": "field_0", "type": "select", "text": "항목 0", "required": True}
+
+
+def test_form_types_are_never_cut_even_when_minimal_form_is_over_budget():
+    form_types = {f"field_{i}": {"type": "text", "text": "라벨", "placeholder": "..."} for i in range(30)}
+    text = compress_form_types(form_types, 5)
+    assert json.loads(text) == {key: {"type": "text"} for key in form_types}
+    query, _ = build_composite_query(form_types=form_types, budgets={"form_types": 5})
+    assert TRUNCATION_MARK not in query
+    assert json.loads(_section(query, "form_type")) == json.loads(text)
+
+
+def test_form_html_is_compressed_to_field_structure():
+    html = '<div class="x"><input name="title" alias="제목" type="text"/><select name="kind" items="a,b"></select></div>'
+    assert compress_form_html(html) == "- input name=title alias=제목 type=text\n- select name=kind items=a,b"
+    assert compress_form_html("<p>설명만 있음</p>") == "설명만 있음"
+
+
+def test_work_dir_section():
+    query, report = build_composite_query(work_dir="/tmp/work/tasks/t1")
+    assert "/tmp/work/tasks/t1" in _section(query, "작업 폴더")
+    assert "work_dir" in report
@@ -0,0 +1,131 @@
+import asyncio
+from uuid import uuid4
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from benchmarks.fakes import InMemoryEventQueue
+from langchain_react.callback_lisnter import QueueCallback
+
+
+def _data(queue: InMemoryEventQueue, event_type: str):
+    return [e["data"]["data"] for e in queue.events if e["data"]["event_type"] == event_type]
+
+
+def test_concurrent_tool_runs_are_matched_by_run_id():
+    queue = InMemoryEventQueue()
+    callback = QueueCallback(queue, "job-1", todo_id="t1")
+    slow, fast = uuid4(), uuid4()
+
+    async def run():
+        # 한 턴에서 두 툴이 겹쳐 실행되고, 늦게 시작한 쪽이 먼저 끝남
+        await callback.on_tool_start({"name": "create_image"}, "cat", run_id=slow)
+        await callback.on_tool_start({"name": "read_file"}, "a.txt", run_id=fast)
+        await asyncio.sleep(0.01)
+        await callback.on_tool_end("a-contents", run_id=fast)
+        await asyncio.sleep(0.06)
+        await callback.on_tool_end("https://img", run_id=slow)
+
+    asyncio.run(run())
+    started = _data(queue, "tool_usage_started")
+    finished = _data(queue, "tool_usage_finished")
+    assert [d["tool_name"] for d in started] == ["create_image", "read_file"]
+    assert [(d["tool_name"], d["result"]) for d in finished] == [("read_file", "a-contents"), ("create_image", "https://img")]
+    assert finished[0]["duration_ms"] < finished[1]["duration_ms"]
+    assert finished[1]["duration_ms"] >= 60
+    assert callback._tool_runs == {}
+    latency = callback.tool_latency()
+    assert latency["read_file"]["calls"] == 1 and latency["create_image"]["calls"] == 1
+    assert sum(latency["create_image"]["histogram"].values()) == 1
+    # 이벤트 공통 필드
+    assert all(e["data"]["job_id"] == "job-1" and e["data"]["todo_id"] == "t1" for e in queue.events)
+
+
+def test_tool_error_emits_error_event_and_clears_the_run():
+    queue = InMemoryEventQueue()
+    callback = QueueCallback(queue, "job-1")
+    ok, failing = uuid4(), uuid4()
+
+    async def run():
+        await callback.on_tool_start({"name": "run_python_code"}, "1/0", run_id=failing)
+        await callback.on_tool_start({"name": "run_python_code"}, "print(1)", run_id=ok)
+        await callback.on_tool_error(ZeroDivisionError("division by zero"), run_id=failing)
+        await callback.on_tool_end("1", run_id=ok)
+        # 시작 기록이 없는 run_id의 종료는 unknown으로 집계하고 예외 없이 넘어감
+        await callback.on_tool_end("late", run_id=uuid4())
+
+    asyncio.run(run())
+    errors = _data(queue, "tool_usage_error")
+    assert len(errors) == 1
+    assert errors[0]["tool_name"] == "run_python_code"
+    assert errors[0]["error"] == "ZeroDivisionError: division by zero"
+    assert errors[0]["duration_ms"] >= 0
+    assert [d["result"] for d in _data(queue, "tool_usage_finished")] == ["1", "late"]
+    assert callback._tool_runs == {}
+    latency = callback.tool_latency()
+    assert latency["run_python_code"]["calls"] == 2 and latency["run_python_code"]["errors"] == 1
+    assert latency["unknown"]["calls"] == 1
+
+
+def _result(prompt_tokens: int, completion_tokens: int, **usage_extra):
+    message = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            **usage_extra,
+        },
+    )
+    return LLMResult(generations=[[ChatGeneration(message=message)]])
+
+
+def test_llm_usage_and_cost_aggregate_per_model():
+    queue = InMemoryEventQueue()
+    callback = QueueCallback(queue, "job-1")
+    runs = [uuid4() for _ in range(5)]
+
+    async def call(run_id, model, result=None, error=None):
+        await callback.on_chat_model_start({}, [[("user", "hi")]], run_id=run_id, invocation_params={"model": model})
+        await callback.on_llm_new_token("o", run_id=run_id)
+        await callback.on_llm_new_token("k", run_id=run_id)
+        if error is not None:
+            await callback.on_llm_error(error, run_id=run_id)
+        else:
+            await callback.on_llm_end(result, run_id=run_id)
+
+    async def run():
+        await asyncio.gather(
+            call(runs[0], "gpt-4o", _result(1000, 500)),
+            call(runs[1], "gpt-4o-mini", _result(2000, 1000)),
+        )
+        await call(runs[2], "gpt-4o", _result(300, 20, total_cost=0))  # 응답 캐시 적중
+        await call(runs[3], "gpt-4o", error=TimeoutError("read timeout"))
+        # usage_metadata가 없으면 llm_output.token_usage 사용, 단가 모르는 모델은 비용 None
+        await call(runs[4], "local-llama", LLMResult(
+            generations=[[ChatGeneration(message=AIMessage(content="ok"))]],
+            llm_output={"token_usage": {"prompt_tokens": 7, "completion_tokens": 3}},
+        ))
+
+    asyncio.run(run())
+    finished = {d["model"]: d for d in _data(queue, "llm_finished") if not d["cached"]}
+    assert finished["gpt-4o"]["cost_usd"] == round((1000 * 2.5 + 500 * 10) / 1e6, 6)
+    # 가장 긴 접두어(gpt-4o-mini) 단가 사용
+    assert finished["gpt-4o-mini"]["cost_usd"] == round((2000 * 0.15 + 1000 * 0.6) / 1e6, 6)
+    assert finished["local-llama"]["cost_usd"] is None
+    assert all(d["ttft_ms"] is not None and d["ttft_ms"] <= d["latency_ms"] for d in finished.values())
+    [error] = _data(queue, "llm_error")
+    assert error["model"] == "gpt-4o" and error["error"] == "TimeoutError: read timeout"
+    assert callback._llm_runs == {}
+
+    usage = callback.llm_usage()
+    assert usage["job_id"] == "job-1"
+    assert usage["calls"] == 4 and usage["cached"] == 1 and usage["errors"] == 1
+    assert usage["prompt_tokens"] == 1000 + 2000 + 300 + 7
+    assert usage["completion_tokens"] == 500 + 1000 + 20 + 3
+    gpt4o = usage["by_model"]["gpt-4o"]
+    assert gpt4o["calls"] == 2 and gpt4o["cached"] == 1 and gpt4o["errors"] == 1
+    assert gpt4o["cost_usd"] == finished["gpt-4o"]["cost_usd"]  # 캐시 응답은 0원
+    assert gpt4o["ttft_ms_avg"] is not None
+    assert usage["by_model"]["local-llama"]["cost_usd"] is None
+    assert usage["cost_usd"] == round(finished["gpt-4o"]["cost_usd"] + finished["gpt-4o-mini"]["cost_usd"], 6)
@@ -0,0 +1,122 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from langchain_react import rate_limiter
+from langchain_react.rate_limiter import (
+    OpenAIRateLimiter,
+    RateLimitedAsyncTransport,
+    RateLimitedTransport,
+    _request_cost,
+    _retry_after,
+    parse_model_limits,
+)
+
+URL = "https://api.openai.com/v1/chat/completions"
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "OPENAI_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(rate_limiter, "OPENAI_BACKOFF_JITTER", 0.0)
+    monkeypatch.setattr(rate_limiter, "OPENAI_MAX_RETRIES", 3)
+
+
+def _body(model: str = "gpt-4o", **extra) -> bytes:
+    return json.dumps({"model": model, "messages": [{"role": "user", "content": "hi"}], **extra}).encode()
+
+
+def test_parse_model_limits():
+    assert parse_model_limits("*=3500/300000,gpt-image-1=50, bad ,x=abc") == {
+        "*": (3500, 300000),
+        "gpt-image-1": (50, 0),
+    }
+    assert parse_model_limits("") == {}
+
+
+def test_request_cost_uses_body_size_and_max_tokens():
+    body = _body(max_tokens=100)
+    model, tokens = _request_cost(httpx.Request("POST", URL, content=body))
+    assert model == "gpt-4o"
+    assert tokens == len(body) // 4 + 100
+    # 이미지 요청은 토큰 과금 없이 RPM만
+    image = httpx.Request("POST", URL, content=json.dumps({"model": "gpt-image-1", "prompt": "cat"}).encode())
+    assert _request_cost(image) == ("gpt-image-1", 0)
+    assert _request_cost(httpx.Request("POST", URL, content=b"not json")) == ("*", 0)
+
+
+def test_retry_after_headers():
+    assert _retry_after(httpx.Response(429, headers={"retry-after-ms": "250"})) == 0.25
+    assert _retry_after(httpx.Response(429, headers={"retry-after": "3"})) == 3.0
+    assert _retry_after(httpx.Response(429)) is None
+
+
+def test_reserve_waits_once_burst_is_spent():
+    # 60 RPM, 버스트 10초 → 10건까지 즉시, 그 다음은 약 1초 대기
+    limiter = OpenAIRateLimiter({"gpt-4o": (60, 0)})
+    assert all(limiter.reserve("gpt-4o", 0) == 0 for _ in range(10))
+    wait = limiter.reserve("gpt-4o", 0)
+    assert 0.9 < wait <= 1.0
+    # 한도가 없는 모델은 기본값(*)을 따름
+    assert OpenAIRateLimiter({"*": (0, 0)}).reserve("other", 10**9) == 0
+
+
+def test_observe_lowers_remaining_from_headers():
+    limiter = OpenAIRateLimiter({"gpt-4o": (600, 0)})
+    limiter.observe("gpt-4o", httpx.Response(200, headers={
+        "x-ratelimit-limit-requests": "600",
+        "x-ratelimit-remaining-requests": "0",
+    }))
+    assert limiter.reserve("gpt-4o", 0) > 0
+
+
+def test_429_pauses_the_whole_model():
+    limiter = OpenAIRateLimiter({"*": (0, 0)})
+    delay = limiter.backoff("gpt-4o", 0, httpx.Response(429, headers={"retry-after": "2"}))
+    assert delay >= 2.0
+    assert limiter.reserve("gpt-4o", 0) > 1.5
+    assert limiter.reserve("gpt-4o-mini", 0) == 0
+    stats = limiter.stats()["gpt-4o"]
+    assert stats["throttled"] == 1 and stats["retries"] == 1
+
+
+def test_async_transport_retries_429_and_connect_errors():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("boom", request=request)
+        if len(calls) == 2:
+            return httpx.Response(429, headers={"retry-after-ms": "10"})
+        return httpx.Response(200, json={"ok": True})
+
+    limiter = OpenAIRateLimiter({"*": (0, 0)})
+
+    async def run():
+        transport = RateLimitedAsyncTransport(httpx.MockTransport(handler), limiter)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.post(URL, content=_body())
+
+    response = asyncio.run(run())
+    assert response.status_code == 200 and len(calls) == 3
+    stats = limiter.stats()["gpt-4o"]
+    assert stats["retries"] == 2 and stats["throttled"] == 1 and stats["requests"] == 3
+
+
+def test_sync_transport_gives_up_after_max_retries():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    limiter = OpenAIRateLimiter({"*": (0, 0)})
+    with httpx.Client(transport=RateLimitedTransport(httpx.MockTransport(handler), limiter)) as client:
+        response = client.post(URL, content=_body())
+    assert response.status_code == 503
+    assert len(calls) == rate_limiter.OPENAI_MAX_RETRIES + 1
+    # 5xx는 다른 요청을 멈추지 않음
+    assert limiter.stats()["gpt-4o"]["throttled"] == 0
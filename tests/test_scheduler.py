@@ -0,0 +1,83 @@
+import asyncio
+
+from langchain_react.scheduler import FairScheduler
+
+
+def test_limit_caps_active_slots():
+    scheduler = FairScheduler(2)
+    peak = 0
+
+    async def worker():
+        nonlocal peak
+        async with scheduler.slot("p"):
+            peak = max(peak, scheduler.active)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(worker() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+    stats = scheduler.stats()
+    assert stats["active"] == 0 and stats["queue_depth"] == 0
+    assert stats["granted"] == 6 and stats["queued"] == 4
+
+
+def test_waiters_are_served_round_robin_by_key():
+    scheduler = FairScheduler(1)
+    order = []
+
+    async def worker(key, name):
+        async with scheduler.slot(key):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async def run():
+        async with scheduler.slot("a"):
+            tasks = [asyncio.create_task(worker("a", f"a{i}")) for i in range(3)]
+            tasks.append(asyncio.create_task(worker("b", "b0")))
+            await asyncio.sleep(0)
+            assert scheduler.queue_depth == 4
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order == ["a0", "b0", "a1", "a2"]
+
+
+def test_cancelled_waiter_is_dropped_without_leaking_a_slot():
+    scheduler = FairScheduler(1)
+
+    async def run():
+        async with scheduler.slot("a"):
+            waiter = asyncio.create_task(scheduler.slot("b").__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            assert scheduler.queue_depth == 0
+        assert scheduler.active == 0
+        async with scheduler.slot("c"):
+            assert scheduler.active == 1
+
+    asyncio.run(run())
+
+
+def test_cancel_right_after_grant_hands_slot_to_next_waiter():
+    scheduler = FairScheduler(1)
+    finished = []
+
+    async def worker(name):
+        async with scheduler.slot(name):
+            finished.append(name)
+
+    async def run():
+        async with scheduler.slot("holder"):
+            first = asyncio.create_task(worker("first"))
+            second = asyncio.create_task(worker("second"))
+            await asyncio.sleep(0)
+        # 슬롯이 first에게 넘어갔지만 first가 깨어나기 전에 취소
+        first.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+
+    asyncio.run(run())
+    assert finished == ["second"]
+    assert scheduler.active == 0
@@ -0,0 +1,74 @@
+import asyncio
+import sys
+
+from mcp import StdioServerParameters
+
+from benchmarks.bench_executor import STUB_SERVER
+from langchain_react import session_pool
+from langchain_react.session_pool import MCPSessionPool
+
+
+def _pool(monkeypatch, size: int = 1):
+    created = []
+
+    class RecordingSession(session_pool.PooledSession):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    monkeypatch.setattr(session_pool, "PooledSession", RecordingSession)
+    params = StdioServerParameters(command=sys.executable, args=[STUB_SERVER])
+    return MCPSessionPool(params, size=size), created
+
+
+def test_lease_reuses_warm_session(monkeypatch):
+    pool, created = _pool(monkeypatch)
+
+    async def run():
+        await pool.start()
+        try:
+            async with pool.lease() as first:
+                pass
+            async with pool.lease() as second:
+                assert second is first
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+    assert len(created) == 1
+    stats = pool.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 0
+
+
+def test_close_waits_for_pending_session_shutdown(monkeypatch):
+    pool, created = _pool(monkeypatch)
+
+    async def run():
+        await pool.start()
+        async with pool.lease() as entry:
+            entry.retire()
+        # 반납 직후: 폐기된 세션 종료와 자리 보충이 백그라운드에서 진행 중
+        assert pool._closers and pool._bg
+        await pool.close()
+
+    asyncio.run(run())
+    # 폐기/보충/대기 중이던 세션 모두 서브프로세스 소유 태스크가 끝나 있어야 함
+    assert created and all(entry._owner is None or entry._owner.done() for entry in created)
+    assert all(entry.session is None for entry in created)
+    assert pool.stats()["idle"] == 0 and pool._total == 0
+    assert not pool._closers and not pool._bg
+
+
+def test_release_after_close_discards_instead_of_refilling(monkeypatch):
+    pool, created = _pool(monkeypatch)
+
+    async def run():
+        await pool.start()
+        async with pool.lease():
+            await pool.close()
+        await asyncio.gather(*pool._closers, *pool._bg, return_exceptions=True)
+
+    asyncio.run(run())
+    assert len(created) == 1
+    assert created[0]._owner.done()
+    assert pool._closed and pool._total == 0
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+from benchmarks.fakes import ScriptedChatModel
+from langchain_react.agent import _stream_agent
+from langchain_react.task_budget import LimitExceeded, TaskBudget
+
+
+def test_step_limit_raises_after_max_steps():
+    budget = TaskBudget(max_steps=2, deadline=0, max_tokens=0)
+    budget.start_turn()
+    budget.start_turn()
+    with pytest.raises(LimitExceeded) as exc:
+        budget.start_turn()
+    assert exc.value.reason == "max_steps" and budget.reason == "max_steps"
+    assert budget.recursion_limit() == 9
+
+
+def test_token_budget_uses_usage_metadata_or_estimate():
+    budget = TaskBudget(max_steps=0, deadline=0, max_tokens=100)
+    budget.charge(AIMessage(content="x", usage_metadata={"input_tokens": 30, "output_tokens": 10, "total_tokens": 40}))
+    assert budget.tokens == 40 and not budget.estimated
+    budget.charge(AIMessage(content="짧은 답"), prompt_tokens=20)
+    assert budget.estimated and 60 < budget.tokens < 100
+    with pytest.raises(LimitExceeded):
+        budget.charge(AIMessage(content="x", usage_metadata={"input_tokens": 50, "output_tokens": 0, "total_tokens": 50}))
+    assert budget.report()["reason"] == "token_budget"
+
+
+def test_disabled_limits():
+    budget = TaskBudget(max_steps=0, deadline=0, max_tokens=0)
+    assert not budget.limited
+    assert budget.remaining() is None and budget.recursion_limit() is None
+    for _ in range(100):
+        budget.start_turn()
+
+
+@tool
+def lookup(code: str) -> str:
+    """값을 조회합니다."""
+    return "42"
+
+
+def test_deadline_stops_the_run_and_keeps_state():
+    model = ScriptedChatModel(tool_calls=5, tool_name="lookup", latency_ms=200)
+    agent = create_react_agent(model, [lookup])
+    budget = TaskBudget(max_steps=0, deadline=0.5, max_tokens=0)
+    result = asyncio.run(_stream_agent(agent, {"messages": [("user", "go")]}, {}, budget=budget))
+    assert result["limit"]["reason"] == "deadline"
+    assert 1 <= result["limit"]["steps"] < 5
+    assert result["messages"]  # 중단 시점까지의 state 유지
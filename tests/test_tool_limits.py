@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+from langchain_core.tools import tool
+
+from benchmarks.fakes import ScriptedChatModel
+from langchain_react import tool_limits, tool_loader
+from langchain_react.agent import run_react_agent
+from langchain_react.tool_limits import ToolLimiter, parse_limits
+
+
+def test_parse_limits_skips_malformed_parts():
+    assert parse_limits("create_image=4, run_python_code=2,*=8,bad,x=y") == {
+        "create_image": 4,
+        "run_python_code": 2,
+        "*": 8,
+    }
+
+
+def test_semaphore_caps_concurrency_per_tool():
+    limiter = ToolLimiter({"create_image": 2, "*": 0})
+    active = {"create_image": 0, "read_file": 0}
+    peak = {"create_image": 0, "read_file": 0}
+
+    async def call(name):
+        async with limiter.slot(name):
+            active[name] += 1
+            peak[name] = max(peak[name], active[name])
+            await asyncio.sleep(0.02)
+            active[name] -= 1
+
+    async def run():
+        await asyncio.gather(*(call("create_image") for _ in range(5)), *(call("read_file") for _ in range(5)))
+
+    asyncio.run(run())
+    assert peak == {"create_image": 2, "read_file": 5}  # *=0은 무제한
+    stats = limiter.stats()
+    assert stats["create_image"]["calls"] == 5 and stats["create_image"]["peak_active"] == 2
+    assert stats["create_image"]["waits"] >= 3 and stats["create_image"]["wait_ms_total"] > 0
+    assert stats["create_image"]["active"] == 0
+    assert stats["read_file"]["waits"] == 0
+
+
+class _SlowGenerator:
+    """동기 네트워크 호출을 흉내 내는 이미지 생성기(호출마다 스레드를 sleep_s 동안 점유)."""
+
+    sleep_s = 0.2
+
+    def generate_and_upload(self, prompt, filename=None, return_markdown=False, **kwargs):
+        time.sleep(self.sleep_s)
+        url = f"https://example.test/{filename or 'image.png'}"
+        return f"![image]({url})" if return_markdown else url
+
+
+def test_image_tools_run_off_the_event_loop_within_their_limit(monkeypatch):
+    monkeypatch.setattr(tool_loader, "_image_generator", _SlowGenerator)
+    monkeypatch.setattr(tool_limits, "_limiter", ToolLimiter({"create_image": 2, "create_comic": 1}))
+
+    async def run():
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        started = time.monotonic()
+        image, comic = await asyncio.gather(
+            tool_loader.create_image.ainvoke({"prompt": "cat", "filename": "cat.png"}),
+            tool_loader.create_comic.ainvoke({"topic": "dog"}),
+        )
+        elapsed = time.monotonic() - started
+        stop.set()
+        await ticking
+        return image, comic, elapsed, ticks
+
+    image, comic, elapsed, ticks = asyncio.run(run())
+    assert image == "https://example.test/cat.png"
+    assert comic.count("![image](") == 4
+    stats = tool_limits.get_tool_limiter().stats()
+    # 이미지 5장이 create_image 한도 2 안에서 병렬로 생성됨 (직렬이면 1.0초)
+    assert stats["create_image"]["calls"] == 5 and stats["create_image"]["peak_active"] == 2
+    assert elapsed < 5 * _SlowGenerator.sleep_s
+    # 생성기가 스레드를 막는 동안에도 이벤트 루프는 계속 돌아야 함
+    assert ticks >= elapsed / 0.01 / 2
+
+
+@tool
+async def slow_lookup(code: str) -> str:
+    """값을 조회합니다(느린 외부 호출)."""
+    await asyncio.sleep(0.1)
+    return "42"
+
+
+def test_parallel_tool_step_timing_is_reported():
+    model = ScriptedChatModel(tool_calls=1, calls_per_turn=3, tool_name="slow_lookup", final_json={"answer": 42})
+
+    response = asyncio.run(run_react_agent([slow_lookup], "go", model=model, stop_on_json=True))
+
+    assert response["final_json"] == {"answer": 42}
+    steps = response["tool_steps"]
+    assert steps["steps"] == 1 and steps["parallel_steps"] == 1 and steps["tool_calls"] == 3
+    # 세 호출이 겹쳐 실행되므로 단계 벽시계 시간은 개별 시간 합보다 짧음
+    assert steps["tool_ms_total"] >= 300
+    assert steps["step_wall_ms_total"] < 250
+    assert steps["saved_ms"] > 0
@@ -0,0 +1,134 @@
+import asyncio
+from types import SimpleNamespace
+
+from langchain_react.tool_memo import ToolCallMemo, parse_names
+
+
+class _Server:
+    """호출 횟수를 세는 가짜 MCP 툴 호출."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def invoke(self, name, arguments, result="ok", *, delay: float = 0.0, error: bool = False):
+        async def _invoke():
+            self.calls.append((name, arguments))
+            if delay:
+                await asyncio.sleep(delay)
+            return SimpleNamespace(content=f"{result}#{len(self.calls)}", isError=error)
+
+        return _invoke
+
+
+def test_parse_names():
+    assert parse_names(" read_file, ,list_directory ") == {"read_file", "list_directory"}
+    assert parse_names("") == set()
+
+
+def test_read_only_repeat_is_served_from_memo():
+    memo = ToolCallMemo({"read_file"})
+    server = _Server()
+
+    async def run():
+        first = await memo.call("read_file", {"path": "a"}, server.invoke("read_file", {"path": "a"}))
+        again = await memo.call("read_file", {"path": "a"}, server.invoke("read_file", {"path": "a"}))
+        other = await memo.call("read_file", {"path": "b"}, server.invoke("read_file", {"path": "b"}))
+        return first, again, other
+
+    first, again, other = asyncio.run(run())
+    assert again is first and other is not first
+    assert len(server.calls) == 2
+    stats = memo.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["hits_by_tool"] == {"read_file": 1}
+
+
+def test_write_tool_invalidates_and_is_never_memoized():
+    memo = ToolCallMemo({"read_file"})
+    server = _Server()
+
+    async def run():
+        await memo.call("read_file", {"path": "a"}, server.invoke("read_file", {"path": "a"}))
+        await memo.call("write_file", {"path": "a"}, server.invoke("write_file", {"path": "a"}))
+        await memo.call("write_file", {"path": "a"}, server.invoke("write_file", {"path": "a"}))
+        await memo.call("read_file", {"path": "a"}, server.invoke("read_file", {"path": "a"}))
+
+    asyncio.run(run())
+    assert [name for name, _ in server.calls] == ["read_file", "write_file", "write_file", "read_file"]
+    assert memo.stats()["hits"] == 0
+    assert memo.stats()["invalidations"] >= 1
+
+
+def test_read_overlapping_a_write_is_not_stored():
+    memo = ToolCallMemo({"read_file"})
+    server = _Server()
+
+    async def run():
+        # 읽기가 진행되는 동안 쓰기가 시작·종료됨 → 읽기 결과는 낡았을 수 있음
+        read = asyncio.create_task(
+            memo.call("read_file", {"path": "a"}, server.invoke("read_file", {"path": "a"}, delay=0.05))
+        )
+        await asyncio.sleep(0)
+        await memo.call("write_file", {"path": "a"}, server.invoke("write_file", {"path": "a"}))
+        await read
+        await memo.call("read_file", {"path": "a"}, server.invoke("read_file", {"path": "a"}))
+
+    asyncio.run(run())
+    assert [name for name, _ in server.calls].count("read_file") == 2
+    assert memo.stats()["hits"] == 0
+
+
+def test_read_started_during_a_write_is_not_stored():
+    memo = ToolCallMemo({"read_file"})
+    server = _Server()
+
+    async def run():
+        write = asyncio.create_task(
+            memo.call("write_file", {"path": "a"}, server.invoke("write_file", {"path": "a"}, delay=0.05))
+        )
+        await asyncio.sleep(0)
+        await memo.call("read_file", {"path": "a"}, server.invoke("read_file", {"path": "a"}))
+        await write
+        await memo.call("read_file", {"path": "a"}, server.invoke("read_file", {"path": "a"}))
+
+    asyncio.run(run())
+    assert [name for name, _ in server.calls].count("read_file") == 2
+
+
+def test_error_results_are_not_memoized():
+    memo = ToolCallMemo({"read_file"})
+    server = _Server()
+
+    async def run():
+        for _ in range(2):
+            await memo.call("read_file", {"path": "x"}, server.invoke("read_file", {"path": "x"}, error=True))
+
+    asyncio.run(run())
+    assert len(server.calls) == 2
+
+
+def test_max_entries_caps_the_memo():
+    memo = ToolCallMemo({"read_file"}, max_entries=1)
+    server = _Server()
+
+    async def run():
+        for path in ("a", "b", "a", "b"):
+            await memo.call("read_file", {"path": path}, server.invoke("read_file", {"path": path}))
+
+    asyncio.run(run())
+    # a만 저장되고 b는 자리가 없어 매번 호출
+    assert [args["path"] for _, args in server.calls] == ["a", "b", "b"]
+    assert memo.stats()["hits"] == 1
+
+
+def test_unserializable_arguments_bypass_the_memo():
+    memo = ToolCallMemo({"read_file"})
+    server = _Server()
+    args = {"path": object()}
+
+    async def run():
+        for _ in range(2):
+            await memo.call("read_file", args, server.invoke("read_file", args))
+
+    asyncio.run(run())
+    assert len(server.calls) == 2
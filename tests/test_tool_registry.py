@@ -0,0 +1,92 @@
+import asyncio
+from types import SimpleNamespace
+
+from mcp import types
+
+from langchain_react.tool_registry import ToolRegistry
+
+
+def _tool(name: str, read_only: bool = False) -> types.Tool:
+    annotations = types.ToolAnnotations(readOnlyHint=True) if read_only else None
+    return types.Tool(name=name, inputSchema={"type": "object", "properties": {}}, annotations=annotations)
+
+
+class _Session:
+    """tools/list를 두 페이지로 나눠 주고 call_tool 호출을 기록하는 가짜 세션."""
+
+    def __init__(self, tools) -> None:
+        self.tools = tools
+        self.list_calls = 0
+        self.tool_calls = []
+
+    async def list_tools(self, cursor=None):
+        self.list_calls += 1
+        if cursor is None:
+            return types.ListToolsResult(tools=self.tools[:1], nextCursor="p2")
+        return types.ListToolsResult(tools=self.tools[1:], nextCursor=None)
+
+    async def call_tool(self, name, arguments=None, *args, **kwargs):
+        self.tool_calls.append(name)
+        return types.CallToolResult(content=[types.TextContent(type="text", text=f"{name}-result")])
+
+
+def _key(registry: ToolRegistry, name: str):
+    return registry.server_key(SimpleNamespace(command="python", args=["server.py"]), SimpleNamespace(name=name, version="1"))
+
+
+def test_tools_are_cached_per_server_key():
+    registry = ToolRegistry()
+    session = _Session([_tool("read_file", read_only=True), _tool("run_python_code")])
+
+    async def run():
+        first = await registry.get_tools(session, _key(registry, "a"))
+        again = await registry.get_tools(session, _key(registry, "a"))
+        other = await registry.get_tools(session, _key(registry, "b"))
+        return first, again, other
+
+    first, again, other = asyncio.run(run())
+    assert [t.name for t in first] == ["read_file", "run_python_code"]
+    assert [t.name for t in again] == [t.name for t in first]
+    assert other[0] is not first[0]
+    assert session.list_calls == 4  # 서버 a, b 각각 두 페이지
+    stats = registry.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["cached_servers"] == 2
+    assert registry.read_only_tools == {"read_file"}
+
+
+def test_list_changed_invalidates_tools_and_read_only_marks():
+    registry = ToolRegistry()
+    key = _key(registry, "a")
+
+    async def run():
+        await registry.get_tools(_Session([_tool("read_file", read_only=True), _tool("x")]), key)
+        await registry.message_handler(
+            types.ServerNotification(types.ToolListChangedNotification(method="notifications/tools/list_changed"))
+        )
+        assert registry.read_only_tools == set()
+        # 다시 연결된 서버는 read_file을 더 이상 읽기 전용으로 표시하지 않음
+        reconnected = _Session([_tool("read_file"), _tool("x")])
+        await registry.get_tools(reconnected, key)
+        return reconnected
+
+    reconnected = asyncio.run(run())
+    assert reconnected.list_calls == 2
+    assert registry.read_only_tools == set()
+    assert registry.stats()["invalidations"] == 1
+
+
+def test_bound_tools_call_the_leased_session_through_the_memo():
+    registry = ToolRegistry()
+    leased = _Session([_tool("read_file", read_only=True), _tool("x")])
+
+    async def run():
+        tools = {t.name: t for t in await registry.get_tools(leased, _key(registry, "a"))}
+        with registry.bind(leased) as memo:
+            await tools["read_file"].ainvoke({})
+            await tools["read_file"].ainvoke({})
+        return memo
+
+    memo = asyncio.run(run())
+    assert leased.tool_calls == ["read_file"]
+    assert memo is not None and memo.stats()["hits"] == 1
+    assert registry.stats()["memo_hits"] == 1
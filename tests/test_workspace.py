@@ -0,0 +1,62 @@
+import os
+
+from langchain_react.workspace import WorkspaceTracker, remove_task_dir, task_dir
+
+
+def _write(path: str, data: bytes = b"\x89PNG") -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_overlapping_tasks_only_see_their_own_files(tmp_path):
+    work = str(tmp_path)
+    first = WorkspaceTracker(task_dir(work, "todo-1"), base_dir=work)
+    second = WorkspaceTracker(task_dir(work, "todo-2"), base_dir=work)
+    first.start()
+    second.start()
+
+    _write(os.path.join(first.root, "chart.png"), b"\x89PNG1")
+
+    assert list(first.finish()) == [os.path.normcase(os.path.abspath(os.path.join(first.root, "chart.png")))]
+    # 다른 작업의 tasks/<id> 폴더는 훑지 않음
+    assert second.finish() == {}
+    # 인터프리터 작업 디렉터리 기준 상대 경로도 해석
+    assert first.resolve(os.path.join("tasks", "todo-1", "chart.png")) is not None
+    assert second.resolve(os.path.join("tasks", "todo-1", "chart.png")) is None
+    assert first.inline_image(os.path.join(first.root, "chart.png")).startswith("![Generated Image](data:image/png;base64,")
+
+
+def test_images_saved_in_work_dir_root_are_found(tmp_path):
+    work = str(tmp_path)
+    _write(os.path.join(work, "old.png"))
+    tracker = WorkspaceTracker(task_dir(work, "todo-1"), base_dir=work)
+    tracker.start()
+
+    # plt.savefig("chart.png")처럼 인터프리터 cwd(작업 디렉터리 루트)에 저장된 파일
+    os.makedirs(os.path.join(work, "out"))
+    _write(os.path.join(work, "chart.png"))
+    _write(os.path.join(work, "out", "plot.png"))
+
+    assert len(tracker.finish()) == 2
+    assert tracker.inline_image("chart.png").startswith("![Generated Image](data:image/png;base64,")
+    assert tracker.resolve(os.path.join("out", "plot.png")) is not None
+    assert tracker.resolve("old.png") is None
+
+
+def test_task_dir_sanitizes_key(tmp_path):
+    path = task_dir(str(tmp_path), "../a b/c")
+    assert os.path.dirname(path) == os.path.join(str(tmp_path), "tasks")
+    assert os.path.isdir(path)
+
+
+def test_remove_task_dir_deletes_only_that_task(tmp_path):
+    work = str(tmp_path)
+    mine, other = task_dir(work, "../a b/c"), task_dir(work, "todo-2")
+    _write(os.path.join(mine, "chart.png"))
+    os.makedirs(os.path.join(mine, "sub"))
+
+    remove_task_dir(work, "../a b/c")
+    remove_task_dir(work, "missing")  # 없는 폴더는 조용히 무시
+
+    assert not os.path.exists(mine)
+    assert os.path.isdir(other)